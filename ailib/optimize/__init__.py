@@ -45,6 +45,10 @@ Local Optimization
 .. toctree::
 
     optimize.minimizers.gd
+    optimize.minimizers.sgd
+    optimize.minimizers.lbfgs
+    optimize.minimizers.nelder_mead
+    optimize.minimizers.newton
 
 
 Global Optimization
@@ -52,7 +56,38 @@ Global Optimization
 
 .. toctree::
 
+    optimize.minimizers.aco
+    optimize.minimizers.bayesian
+    optimize.minimizers.cem
+    optimize.minimizers.de
+    optimize.minimizers.ga
+    optimize.minimizers.pso
+    optimize.minimizers.random
+    optimize.minimizers.sa
     optimize.minimizers.saes
+    optimize.minimizers.tabu
+
+Multi-objective Optimization
+----------------------------
+
+.. toctree::
+
+    optimize.minimizers.nsga2
+
+Linear Programming
+------------------
+
+.. toctree::
+
+    optimize.minimizers.simplex
+
+
+Algorithm portfolio
+-------------------
+
+.. toctree::
+
+    optimize.portfolio
 
 
 Test functions
@@ -67,6 +102,7 @@ Test functions
 # The following lines are inspired by https://github.com/scipy/scipy/blob/master/scipy/optimize/__init__.py
 
 from .minimizers import *
+from .portfolio import *
 
 __all__ = [s for s in dir() if not s.startswith('_')]
 
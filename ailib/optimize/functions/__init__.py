@@ -37,12 +37,20 @@ Test functions
 .. toctree::
 
     optimize.functions.sphere
+    optimize.functions.multiobjective
+    optimize.functions.combinatorial
+    optimize.functions.tsp
+    optimize.functions.finite_sum
 
 """
 
 # The following lines are inspired by https://github.com/scipy/scipy/blob/master/scipy/optimize/__init__.py
 
 from .unconstrained import *
+from .multiobjective import *
+from .combinatorial import *
+from .tsp import *
+from .finite_sum import *
 from .noise import *
 
 __all__ = [s for s in dir() if not s.startswith('_')]
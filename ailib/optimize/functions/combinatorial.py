@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+This module contains some test functions for binary (combinatorial)
+optimization.
+
+Genomes are boolean arrays: a `(ndim,)` array for a single genome or a
+`(ndim, n)` array for `n` genomes.
+"""
+
+__all__ = ['onemax', 'OneMax',
+           'FeatureSelection', 'digits_feature_selection']
+
+import numpy as np
+
+from .unconstrained import _ObjectiveFunction
+
+# ONEMAX FUNCTION #############################################################
+
+def onemax(x):
+    r"""The OneMax function (number of zero bits, to minimize).
+
+    .. math::
+
+        f(\boldsymbol{x}) = \sum_{i=1}^{n} (1 - x_i)
+
+    Example
+    -------
+
+    >>> onemax( np.array([[1, 0], [1, 0], [0, 0]], dtype=bool) )
+    array([1, 3])
+
+    Parameters
+    ----------
+    x : array_like
+        One dimension boolean array (one genome) or two dimension boolean
+        array (one genome per column).
+
+    Returns
+    -------
+    int or array_like
+        The number of zero bits of each genome.
+    """
+    x = np.asarray(x, dtype=bool)
+    return x.shape[0] - np.count_nonzero(x, axis=0)
+
+
+class OneMax(_ObjectiveFunction):
+    """
+    The OneMax function (see `onemax`).
+    """
+    def __init__(self, ndim):
+        super().__init__()
+
+        self._objective_function = onemax
+
+        self.ndim = ndim
+
+        self.bounds = np.ones((2, self.ndim))
+        self.bounds[0,:] = 0.
+
+        self.continuous = False
+
+        self.arg_min = np.ones(self.ndim, dtype=bool)
+
+    @property
+    def unimodal(self):
+        return True
+
+# FEATURE SELECTION ###########################################################
+
+class FeatureSelection(_ObjectiveFunction):
+    r"""Feature selection for a nearest centroid classifier.
+
+    Each genome is a mask of selected features. Its value is the
+    classification error of a nearest centroid classifier using only the
+    selected features, measured on a validation set, plus `penalty` times
+    the fraction of selected features:
+
+    .. math::
+
+        f(\boldsymbol{x}) = \text{error}(\boldsymbol{x}) + \text{penalty} \frac{\sum_i x_i}{n}
+
+    The centroids are computed once (on the training set, with all
+    features) and the squared differences between validation samples and
+    centroids are cached: a batch of masks is evaluated with a single
+    matrix product.
+
+    Parameters
+    ----------
+    data : array_like
+        The `(num_samples, num_features)` array of samples.
+    target : array_like
+        The class of each sample.
+    penalty : float
+        The weight of the number of selected features.
+    validation_fraction : float
+        The fraction of the samples used for validation.
+    seed : int
+        The seed of the (fixed) training/validation split.
+    """
+    def __init__(self, data, target, penalty=0.01, validation_fraction=0.3, seed=0):
+        super().__init__()
+
+        data = np.asarray(data, dtype=np.float64)
+        target = np.asarray(target)
+
+        permutation = np.random.RandomState(seed).permutation(data.shape[0])
+        num_validation = int(round(validation_fraction * data.shape[0]))
+        validation, training = permutation[:num_validation], permutation[num_validation:]
+
+        self.classes = np.unique(target)
+        centroids = np.array([data[training][target[training] == c].mean(axis=0) for c in self.classes])
+
+        # (num_validation, num_classes, num_features)
+        self._squared_differences = (data[validation][:, np.newaxis, :] - centroids[np.newaxis, :, :])**2
+        self._validation_classes = np.searchsorted(self.classes, target[validation])
+
+        self.penalty = penalty
+
+        self._objective_function = self._evaluate
+
+        self.ndim = data.shape[1]
+
+        self.bounds = np.ones((2, self.ndim))
+        self.bounds[0,:] = 0.
+
+        self.continuous = False
+
+        self.function_name = "feature selection"
+
+    def _evaluate(self, x):
+        masks = np.asarray(x, dtype=np.float64)
+        single = masks.ndim == 1
+        masks = masks.reshape([self.ndim, -1])
+
+        distances = self._squared_differences @ masks          # (num_validation, num_classes, n)
+        predictions = np.argmin(distances, axis=1)
+        error = np.mean(predictions != self._validation_classes[:, np.newaxis], axis=0)
+
+        y = error + self.penalty * masks.mean(axis=0)
+
+        return y[0] if single else y
+
+    @property
+    def unimodal(self):
+        return False
+
+
+def digits_feature_selection(penalty=0.01, validation_fraction=0.3, seed=0):
+    """Feature selection over the 64 pixels of the digits dataset (see `FeatureSelection`)."""
+    from ...ml.datasets import load_digits
+
+    digits = load_digits()
+    return FeatureSelection(digits['data'], digits['target'], penalty=penalty, validation_fraction=validation_fraction, seed=seed)
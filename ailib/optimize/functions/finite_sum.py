@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+r"""
+This module contains some finite-sum objective functions (empirical risks
+over a dataset):
+
+.. math::
+
+    f(\boldsymbol{x}) = \frac{1}{N} \sum_{i=1}^{N} f_i(\boldsymbol{x}) + \frac{\lambda}{2} \|\boldsymbol{x}\|^2
+
+Besides the full value and gradient, these functions compute the gradient
+of the mean over a mini-batch of samples given by their indices
+(`batch_gradient`): only the rows of the mini-batch are read, so stochastic
+minimizers (see `ailib.optimize.minimizers.sgd`) need a memory proportional
+to the mini-batch size per step.
+"""
+
+__all__ = ['FiniteSumObjective',
+           'LeastSquares',
+           'LogisticRegression',
+           'digits_logistic_regression']
+
+import numpy as np
+
+from .unconstrained import _ObjectiveFunction
+
+
+class FiniteSumObjective(_ObjectiveFunction):
+    """Generic finite-sum objective function over a dataset.
+
+    Subclasses implement `_batch_value` and `_batch_gradient` (the mean
+    value and mean gradient of the samples `indices`, without
+    regularization; `indices=None` means all the samples).
+
+    The number of sample gradients computed (by `gradient` and
+    `batch_gradient`) is counted in `num_sample_gradient_eval`.
+
+    Parameters
+    ----------
+    data : array_like
+        The `(num_samples, num_features)` array of samples.
+    target : array_like
+        The target of each sample.
+    l2 : float
+        The L2 regularization coefficient :math:`\\lambda`.
+    """
+    def __init__(self, data, target, l2=0.):
+        super().__init__()
+
+        self.data = np.asarray(data, dtype=np.float64)
+        self.target = np.asarray(target, dtype=np.float64)
+
+        if self.data.ndim != 2 or self.target.shape != (self.data.shape[0],):
+            raise ValueError("data must be a (num_samples, num_features) array and target a vector of num_samples elements.")
+
+        self.l2 = l2
+
+        self._objective_function = self._value
+        self._gradient_function = self._gradient
+
+        self.ndim = self.data.shape[1]
+
+        self.bounds = np.ones((2, self.ndim))
+        self.bounds[0,:] = -1.
+
+        self.continuous = True
+
+    @property
+    def num_samples(self):
+        return self.data.shape[0]
+
+    def reset_eval_counters(self):
+        super().reset_eval_counters()
+        self.num_sample_gradient_eval = 0
+
+    def _value(self, x):
+        value = self._batch_value(x, None)
+        return value + 0.5 * self.l2 * np.sum(x**2, axis=0)
+
+    def _gradient(self, x):
+        self.num_sample_gradient_eval += self.num_samples * (1 if x.ndim == 1 else x.shape[1])
+        return self._batch_gradient(x, None) + self.l2 * x
+
+    def batch_gradient(self, x, indices):
+        """The gradient of the mean over the samples `indices` (plus the regularization).
+
+        Parameters
+        ----------
+        x : ndarray
+            The point (a 1D array).
+        indices : ndarray
+            The indices of the samples of the mini-batch.
+
+        Returns
+        -------
+        ndarray
+            The mini-batch gradient at `x`.
+        """
+        x = x - self.translation_vector
+        self.num_sample_gradient_eval += len(indices)
+        return self._batch_gradient(x, indices) + self.l2 * x
+
+    def _batch_value(self, x, indices):
+        raise NotImplementedError
+
+    def _batch_gradient(self, x, indices):
+        raise NotImplementedError
+
+    def _rows(self, indices):
+        if indices is None:
+            return self.data, self.target
+        return self.data[indices], self.target[indices]
+
+    @property
+    def unimodal(self):
+        return True
+
+
+class LeastSquares(FiniteSumObjective):
+    r"""Linear least squares.
+
+    .. math::
+
+        f_i(\boldsymbol{x}) = \frac{1}{2} (\boldsymbol{a}_i^\top \boldsymbol{x} - b_i)^2
+
+    Example
+    -------
+
+    >>> f = LeastSquares([[1., 0.], [0., 2.]], [1., 2.])
+    >>> f(np.array([1., 1.]))
+    0.0
+    >>> f.batch_gradient(np.array([0., 0.]), np.array([1]))
+    array([ 0., -4.])
+    """
+    def __init__(self, data, target, l2=0.):
+        super().__init__(data, target, l2=l2)
+        self.function_name = "least squares"
+
+    def _batch_value(self, x, indices):
+        data, target = self._rows(indices)
+        residuals = data @ x - (target if x.ndim == 1 else target[:, np.newaxis])
+        return 0.5 * np.mean(residuals**2, axis=0)
+
+    def _batch_gradient(self, x, indices):
+        data, target = self._rows(indices)
+        residuals = data @ x - (target if x.ndim == 1 else target[:, np.newaxis])
+        return data.T @ residuals / data.shape[0]
+
+
+class LogisticRegression(FiniteSumObjective):
+    r"""Binary logistic regression (log loss).
+
+    .. math::
+
+        f_i(\boldsymbol{x}) = \log\left(1 + e^{-y_i \boldsymbol{a}_i^\top \boldsymbol{x}}\right)
+
+    where the labels :math:`y_i` are in :math:`\{-1, 1\}` (targets in
+    `{0, 1}` are mapped to `{-1, 1}`).
+
+    Example
+    -------
+
+    >>> f = LogisticRegression([[1.], [-1.]], [1, 0])
+    >>> round(float(f(np.array([0.]))), 6)
+    0.693147
+    """
+    def __init__(self, data, target, l2=0.):
+        target = np.asarray(target)
+        if np.all(np.isin(target, (0, 1))):
+            target = 2. * target - 1.
+
+        if not np.all(np.isin(target, (-1, 1))):
+            raise ValueError("The targets must be in {0, 1} or in {-1, 1}.")
+
+        super().__init__(data, target, l2=l2)
+        self.function_name = "logistic regression"
+
+    def _margins(self, x, indices):
+        data, target = self._rows(indices)
+        return data, target, (data @ x) * (target if x.ndim == 1 else target[:, np.newaxis])
+
+    def _batch_value(self, x, indices):
+        _, _, margins = self._margins(x, indices)
+        return np.mean(np.logaddexp(0., -margins), axis=0)
+
+    def _batch_gradient(self, x, indices):
+        data, target, margins = self._margins(x, indices)
+        # d/dm log(1 + exp(-m)) = -1 / (1 + exp(m))
+        weights = -0.5 * (1. - np.tanh(0.5 * margins))
+        weights *= target if x.ndim == 1 else target[:, np.newaxis]
+        return data.T @ weights / data.shape[0]
+
+
+def digits_logistic_regression(digit=0, l2=1e-3):
+    """Logistic regression of "`digit` vs the others" on the digits dataset.
+
+    The pixels are scaled to `[0, 1]` and a constant feature (the
+    intercept) is added.
+    """
+    from ...ml.datasets import load_digits
+
+    digits = load_digits()
+    data = np.asarray(digits['data'], dtype=np.float64) / 16.
+    data = np.concatenate([data, np.ones([data.shape[0], 1])], axis=1)
+    target = (np.asarray(digits['target']) == digit).astype(np.float64)
+
+    return LogisticRegression(data, target, l2=l2)
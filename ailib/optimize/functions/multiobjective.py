@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+This module contains some classical test functions for unconstrained continuous
+multi-objective optimization.
+
+Multi-objective functions return one row per objective: an array of shape
+`(nobj,)` for a single point or `(nobj, n)` for `n` points.
+"""
+
+__all__ = ['zdt1', 'ZDT1',
+           'zdt2', 'ZDT2',
+           'zdt3', 'ZDT3']
+
+import numpy as np
+
+from .unconstrained import _ObjectiveFunction
+
+# ZDT FUNCTIONS ###############################################################
+
+def _zdt_g(x):
+    return 1. + 9. * np.mean(x[1:], axis=0)
+
+
+def zdt1(x):
+    r"""The ZDT1 function (Zitzler, Deb and Thiele).
+
+    .. math::
+
+        f_1(\boldsymbol{x}) = x_1, \quad
+        f_2(\boldsymbol{x}) = g(\boldsymbol{x}) \left(1 - \sqrt{x_1 / g(\boldsymbol{x})}\right), \quad
+        g(\boldsymbol{x}) = 1 + \frac{9}{n-1} \sum_{i=2}^{n} x_i
+
+    The Pareto front is convex: :math:`f_2 = 1 - \sqrt{f_1}` (reached when
+    :math:`x_2 = \dots = x_n = 0`).
+
+    Search domain:
+
+    .. math::
+
+        \boldsymbol{x} \in [0, 1]^n, \quad n \geq 2
+
+    Example
+    -------
+
+    >>> zdt1( np.array([0.25, 0.]) )
+    array([0.25, 0.5 ])
+
+    >>> zdt1( np.array([[0., 1.], [0., 0.]]) )
+    array([[0., 1.],
+           [1., 0.]])
+
+    Parameters
+    ----------
+    x : array_like
+        One dimension Numpy array of the point at which the function is to be computed
+        or a two dimension Numpy array of points at which the function is to be computed.
+
+    Returns
+    -------
+    ndarray
+        The values of the two objectives for the given point(s) `x`.
+    """
+    g = _zdt_g(x)
+    f1 = x[0]
+    return np.array([f1, g * (1. - np.sqrt(f1 / g))])
+
+
+def zdt2(x):
+    r"""The ZDT2 function (Zitzler, Deb and Thiele).
+
+    .. math::
+
+        f_1(\boldsymbol{x}) = x_1, \quad
+        f_2(\boldsymbol{x}) = g(\boldsymbol{x}) \left(1 - (x_1 / g(\boldsymbol{x}))^2\right)
+
+    with the same :math:`g` as `zdt1`. The Pareto front is concave:
+    :math:`f_2 = 1 - f_1^2`.
+
+    Example
+    -------
+
+    >>> zdt2( np.array([0.5, 0.]) )
+    array([0.5 , 0.75])
+
+    Parameters
+    ----------
+    x : array_like
+        One dimension Numpy array of the point at which the function is to be computed
+        or a two dimension Numpy array of points at which the function is to be computed.
+
+    Returns
+    -------
+    ndarray
+        The values of the two objectives for the given point(s) `x`.
+    """
+    g = _zdt_g(x)
+    f1 = x[0]
+    return np.array([f1, g * (1. - (f1 / g)**2)])
+
+
+def zdt3(x):
+    r"""The ZDT3 function (Zitzler, Deb and Thiele).
+
+    .. math::
+
+        f_1(\boldsymbol{x}) = x_1, \quad
+        f_2(\boldsymbol{x}) = g(\boldsymbol{x}) \left(1 - \sqrt{x_1 / g(\boldsymbol{x})} - \frac{x_1}{g(\boldsymbol{x})} \sin(10 \pi x_1)\right)
+
+    with the same :math:`g` as `zdt1`. The Pareto front is made of five
+    disconnected parts.
+
+    Example
+    -------
+
+    >>> zdt3( np.array([0., 0.]) )
+    array([0., 1.])
+
+    Parameters
+    ----------
+    x : array_like
+        One dimension Numpy array of the point at which the function is to be computed
+        or a two dimension Numpy array of points at which the function is to be computed.
+
+    Returns
+    -------
+    ndarray
+        The values of the two objectives for the given point(s) `x`.
+    """
+    g = _zdt_g(x)
+    f1 = x[0]
+    return np.array([f1, g * (1. - np.sqrt(f1 / g) - f1 / g * np.sin(10. * np.pi * f1))])
+
+
+class _ZDT(_ObjectiveFunction):
+    """Generic ZDT function."""
+
+    def __init__(self, ndim=30):
+        super().__init__()
+
+        if ndim < 2:
+            raise ValueError("ZDT functions require at least 2 dimensions.")
+
+        self.ndim = ndim
+        self.nobj = 2
+
+        self.bounds = np.ones((2, self.ndim))
+        self.bounds[0,:] = 0.
+        self.bounds[1,:] = 1.
+
+        self.continuous = True
+
+    @property
+    def unimodal(self):
+        return True
+
+
+class ZDT1(_ZDT):
+    """
+    The ZDT1 bi-objective function (see `zdt1`).
+    """
+    def __init__(self, ndim=30):
+        super().__init__(ndim)
+        self._objective_function = zdt1
+
+
+class ZDT2(_ZDT):
+    """
+    The ZDT2 bi-objective function (see `zdt2`).
+    """
+    def __init__(self, ndim=30):
+        super().__init__(ndim)
+        self._objective_function = zdt2
+
+
+class ZDT3(_ZDT):
+    """
+    The ZDT3 bi-objective function (see `zdt3`).
+    """
+    def __init__(self, ndim=30):
+        super().__init__(ndim)
+        self._objective_function = zdt3
+
+    @property
+    def unimodal(self):
+        return False
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+r"""
+This module contains some test instances of the travelling salesman problem
+(TSP).
+
+A tour is a permutation of the cities: a `(ndim,)` integer array for a
+single tour or a `(ndim, n)` array for `n` tours (one tour per column). Its
+value is the length of the closed tour.
+
+The instances are made of points in the plane (with Euclidean distances);
+the optimal tour length of `circle_tsp` and `grid_tsp` is known.
+"""
+
+__all__ = ['tour_length', 'TSP',
+           'random_tsp', 'clustered_tsp', 'circle_tsp', 'grid_tsp']
+
+import numpy as np
+
+from .unconstrained import _ObjectiveFunction
+
+# TOUR LENGTH #################################################################
+
+def tour_length(distances, x):
+    r"""The length of closed tours.
+
+    .. math::
+
+        f(\boldsymbol{x}) = \sum_{i=1}^{n} d_{x_i, x_{i+1}}, \quad x_{n+1} = x_1
+
+    Example
+    -------
+
+    >>> distances = np.array([[0., 1., 2.], [1., 0., 3.], [2., 3., 0.]])
+    >>> tour_length(distances, np.array([0, 1, 2]))
+    6.0
+
+    Parameters
+    ----------
+    distances : array_like
+        The `(n, n)` matrix of distances between cities.
+    x : array_like
+        One dimension integer array (one tour) or two dimension integer
+        array (one tour per column).
+
+    Returns
+    -------
+    float or array_like
+        The length of each tour.
+    """
+    x = np.asarray(x)
+    return distances[x, np.roll(x, -1, axis=0)].sum(axis=0)
+
+
+class TSP(_ObjectiveFunction):
+    """A travelling salesman problem (see `tour_length`).
+
+    Parameters
+    ----------
+    distances : array_like
+        The `(n, n)` matrix of distances between cities.
+    coordinates : array_like
+        The `(n, 2)` coordinates of the cities (if any, for plots).
+    optimal_length : float
+        The length of an optimal tour (if known).
+    """
+    def __init__(self, distances, coordinates=None, optimal_length=None):
+        super().__init__()
+
+        self.distances = np.asarray(distances, dtype=np.float64)
+
+        if self.distances.ndim != 2 or self.distances.shape[0] != self.distances.shape[1]:
+            raise ValueError("distances must be a square matrix.")
+
+        self.coordinates = None if coordinates is None else np.asarray(coordinates, dtype=np.float64)
+        self.optimal_length = optimal_length
+
+        self._objective_function = self._evaluate
+
+        self.ndim = self.distances.shape[0]
+
+        self.bounds = np.zeros((2, self.ndim))
+        self.bounds[1,:] = self.ndim - 1
+
+        # Tours are permutations: an integer translation keeps them integers
+        self.translation_vector = np.zeros(self.ndim, dtype=np.int64)
+
+        self.continuous = False
+
+        self.function_name = "TSP ({} cities)".format(self.ndim)
+
+    def _evaluate(self, x):
+        return tour_length(self.distances, x)
+
+    @classmethod
+    def from_coordinates(cls, coordinates, optimal_length=None):
+        """Make a TSP with the Euclidean distances between `(n, 2)` coordinates."""
+        coordinates = np.asarray(coordinates, dtype=np.float64)
+        differences = coordinates[:, np.newaxis, :] - coordinates[np.newaxis, :, :]
+        distances = np.sqrt(np.sum(differences**2, axis=2))
+        return cls(distances, coordinates=coordinates, optimal_length=optimal_length)
+
+    @property
+    def unimodal(self):
+        return False
+
+# INSTANCES ###################################################################
+
+def random_tsp(num_cities, seed=0):
+    """Cities drawn uniformly in the unit square."""
+    coordinates = np.random.RandomState(seed).uniform(size=[num_cities, 2])
+    return TSP.from_coordinates(coordinates)
+
+
+def clustered_tsp(num_cities, num_clusters=None, spread=0.05, seed=0):
+    """Cities drawn around `num_clusters` centers (default: `num_cities // 20`) in the unit square."""
+    random_state = np.random.RandomState(seed)
+
+    if num_clusters is None:
+        num_clusters = max(1, num_cities // 20)
+
+    centers = random_state.uniform(size=[num_clusters, 2])
+    clusters = random_state.randint(num_clusters, size=num_cities)
+    coordinates = centers[clusters] + spread * random_state.normal(size=[num_cities, 2])
+
+    return TSP.from_coordinates(coordinates)
+
+
+def circle_tsp(num_cities, seed=0):
+    """Cities evenly spaced on the unit circle, in a random order.
+
+    The optimal tour follows the circle: its length is
+    :math:`2 n \\sin(\\pi / n)`.
+
+    >>> tsp = circle_tsp(6)
+    >>> round(tsp.optimal_length, 6)
+    6.0
+    """
+    angles = 2. * np.pi * np.random.RandomState(seed).permutation(num_cities) / num_cities
+    coordinates = np.stack([np.cos(angles), np.sin(angles)], axis=1)
+    return TSP.from_coordinates(coordinates, optimal_length=2. * num_cities * np.sin(np.pi / num_cities))
+
+
+def grid_tsp(num_rows, num_columns=None, seed=0):
+    """Cities on a regular grid (unit spacing), in a random order.
+
+    The optimal tour length is the number of cities if it is even and the
+    number of cities minus one plus :math:`\\sqrt{2}` otherwise.
+
+    >>> grid_tsp(4).optimal_length
+    16.0
+    """
+    if num_columns is None:
+        num_columns = num_rows
+
+    if num_rows < 2 or num_columns < 2:
+        raise ValueError("The grid must have at least two rows and two columns.")
+
+    rows, columns = np.divmod(np.random.RandomState(seed).permutation(num_rows * num_columns), num_columns)
+    coordinates = np.stack([columns, rows], axis=1)
+
+    num_cities = num_rows * num_columns
+    optimal_length = float(num_cities) if num_cities % 2 == 0 else num_cities - 1. + np.sqrt(2.)
+
+    return TSP.from_coordinates(coordinates, optimal_length=optimal_length)
@@ -366,21 +366,37 @@ def sphere_hessian(x):
     """
     The Hessian matrix of the Sphere function.
     
+    Example
+    -------
+
+    >>> sphere_hessian( np.array([1, 1]) )
+    ... # doctest: +NORMALIZE_WHITESPACE
+    array([[2., 0.],
+           [0., 2.]])
+
     Parameters
     ----------
     x : array_like
-        1-D array of points at which the Hessian matrix is to be computed.
+        1-D array of points at which the Hessian matrix is to be computed
+        or a two dimension Numpy array of points at which the Hessian matrices
+        are to be computed.
 
     Returns
     -------
     rosen_hess : ndarray
-        The Hessian matrix of the Sphere function at `x`.
+        The Hessian matrix of the Sphere function at `x` (a `(ndim, ndim)`
+        array or a `(ndim, ndim, num_points)` array if `x` is a 2D array).
 
     See Also
     --------
     sphere, sphere_gradient
     """
-    return 2.0 * np.ones(x.shape)
+    hess = 2.0 * np.eye(x.shape[0])
+
+    if x.ndim > 1:
+        hess = np.repeat(hess[:, :, np.newaxis], x.shape[1], axis=2)
+
+    return hess
 
 
 class Sphere(_ObjectiveFunction):
@@ -518,6 +534,92 @@ def rosen(x):
     return np.sum(100.0*(x[1:] - x[:-1]**2.0)**2.0 + (1 - x[:-1])**2.0, axis=0)
 
 
+def rosen_gradient(x):
+    r"""
+    The derivative (i.e. gradient) of the (extended) Rosenbrock function.
+
+    Example
+    -------
+
+    >>> rosen_gradient( np.array([1, 1]) )
+    ... # doctest: +NORMALIZE_WHITESPACE
+    array([0., 0.])
+
+    >>> rosen_gradient( np.array([[0, 1, 2], [0, 1, 2]]) )
+    ... # doctest: +NORMALIZE_WHITESPACE
+    array([[  -2.,    0., 1602.],
+           [   0.,    0., -400.]])
+
+    Parameters
+    ----------
+    x : array_like
+        One dimension Numpy array of the point at which the derivative is to be computed
+        or a two dimension Numpy array of points at which the derivatives are to be computed.
+
+    Returns
+    -------
+    float or array_like
+         gradient of the Rosenbrock function at `x`.
+
+    See Also
+    --------
+    rosen
+    """
+    x = np.asarray(x, dtype=np.float64)
+    grad = np.zeros(x.shape)
+
+    grad[:-1] = 2.0 * (x[:-1] - 1.0) - 400.0 * x[:-1] * (x[1:] - x[:-1]**2.0)
+    grad[1:] += 200.0 * (x[1:] - x[:-1]**2.0)
+
+    return grad
+
+
+def rosen_hessian(x):
+    r"""
+    The Hessian matrix of the (extended) Rosenbrock function.
+
+    Example
+    -------
+
+    >>> rosen_hessian( np.array([1, 1]) )
+    ... # doctest: +NORMALIZE_WHITESPACE
+    array([[ 802., -400.],
+           [-400.,  200.]])
+
+    Parameters
+    ----------
+    x : array_like
+        1-D array of points at which the Hessian matrix is to be computed
+        or a two dimension Numpy array of points at which the Hessian matrices
+        are to be computed.
+
+    Returns
+    -------
+    ndarray
+        The Hessian matrix of the Rosenbrock function at `x` (a `(ndim, ndim)`
+        array or a `(ndim, ndim, num_points)` array if `x` is a 2D array).
+
+    See Also
+    --------
+    rosen, rosen_gradient
+    """
+    x = np.asarray(x, dtype=np.float64)
+    ndim = x.shape[0]
+    indices = np.arange(ndim)
+
+    diagonal = np.zeros(x.shape)
+    diagonal[:-1] = 1200.0 * x[:-1]**2.0 - 400.0 * x[1:] + 2.0
+    diagonal[1:] += 200.0
+    off_diagonal = -400.0 * x[:-1]
+
+    hess = np.zeros((ndim, ndim) + x.shape[1:])
+    hess[indices, indices] = diagonal
+    hess[indices[:-1], indices[1:]] = off_diagonal
+    hess[indices[1:], indices[:-1]] = off_diagonal
+
+    return hess
+
+
 class Rosenbrock(_ObjectiveFunction):
     """
     TODO
@@ -526,6 +628,8 @@ class Rosenbrock(_ObjectiveFunction):
         super().__init__()
 
         self._objective_function = rosen
+        self._gradient_function = rosen_gradient
+        self._hessian_function = rosen_hessian
 
         self.ndim = ndim
         if self.ndim < 2: # TODO
@@ -627,6 +731,47 @@ def himmelblau(x):
     return (x[0]**2.0 + x[1] - 11.0)**2.0 + (x[0] + x[1]**2.0 - 7.0)**2.0
 
 
+def himmelblau_gradient(x):
+    r"""
+    The derivative (i.e. gradient) of the Himmelblau's function.
+
+    Example
+    -------
+
+    >>> himmelblau_gradient( np.array([3, 2]) )
+    ... # doctest: +NORMALIZE_WHITESPACE
+    array([0., 0.])
+
+    >>> himmelblau_gradient( np.array([[0, 1, 2], [0, 1, 2]]) )
+    ... # doctest: +NORMALIZE_WHITESPACE
+    array([[-14., -46., -42.],
+           [-22., -38., -18.]])
+
+    Parameters
+    ----------
+    x : array_like
+        One dimension Numpy array of the point at which the derivative is to be computed
+        or a two dimension Numpy array of points at which the derivatives are to be computed.
+
+    Returns
+    -------
+    float or array_like
+         gradient of the Himmelblau's function at `x`.
+
+    See Also
+    --------
+    himmelblau
+    """
+    x = np.asarray(x, dtype=np.float64)
+    assert x.shape[0] == 2, x.shape
+
+    u = x[0]**2.0 + x[1] - 11.0
+    v = x[0] + x[1]**2.0 - 7.0
+
+    return np.array([4.0 * x[0] * u + 2.0 * v,
+                     2.0 * u + 4.0 * x[1] * v])
+
+
 class Himmelblau(_ObjectiveFunction):
     """
     TODO
@@ -635,6 +780,7 @@ class Himmelblau(_ObjectiveFunction):
         super().__init__()
 
         self._objective_function = himmelblau
+        self._gradient_function = himmelblau_gradient
 
         self.ndim = ndim
         if self.ndim != 2:
@@ -727,9 +873,9 @@ def rastrigin(x):
 
     >>> rastrigin( np.array([[0, 1, 2], [0, 1, 2]]) )
     ... # doctest: +NORMALIZE_WHITESPACE
-    array([ 1., 0., 401.])
+    array([0., 2., 8.])
 
-    The result should be :math:`f(x_1) = 1`, :math:`f(x_2) = 0` and :math:`f(x_3) = 401`.
+    The result should be :math:`f(x_1) = 0`, :math:`f(x_2) = 2` and :math:`f(x_3) = 8`.
 
     Parameters
     ----------
@@ -747,6 +893,42 @@ def rastrigin(x):
     return A * n + np.sum(x**2.0 - A * np.cos(2.0 * np.pi * x), axis=0)
 
 
+def rastrigin_gradient(x):
+    r"""
+    The derivative (i.e. gradient) of the Rastrigin function.
+
+    Example
+    -------
+
+    >>> rastrigin_gradient( np.array([0, 0]) )
+    ... # doctest: +NORMALIZE_WHITESPACE
+    array([0., 0.])
+
+    >>> np.round(rastrigin_gradient( np.array([[0, 0.25], [0, 0.75]]) ), 4)
+    ... # doctest: +NORMALIZE_WHITESPACE
+    array([[  0.    ,  63.3319],
+           [  0.    , -61.3319]])
+
+    Parameters
+    ----------
+    x : array_like
+        One dimension Numpy array of the point at which the derivative is to be computed
+        or a two dimension Numpy array of points at which the derivatives are to be computed.
+
+    Returns
+    -------
+    float or array_like
+         gradient of the Rastrigin function at `x`.
+
+    See Also
+    --------
+    rastrigin
+    """
+    A = 10.
+    x = np.asarray(x, dtype=np.float64)
+    return 2.0 * x + 2.0 * np.pi * A * np.sin(2.0 * np.pi * x)
+
+
 class Rastrigin(_ObjectiveFunction):
     """
     TODO
@@ -755,6 +937,7 @@ class Rastrigin(_ObjectiveFunction):
         super().__init__()
 
         self._objective_function = rastrigin
+        self._gradient_function = rastrigin_gradient
 
         self.ndim = ndim
         if self.ndim < 2: # TODO
@@ -824,7 +1007,7 @@ def easom(x):
 
     >>> easom( np.array([[np.pi, 0, 1], [np.pi, 0, 1]]) )
     ... # doctest: +NORMALIZE_WHITESPACE
-    array([-1., -2.67528799e-09, -3.03082341e-05])
+    array([-1.00000000e+00, -2.67528799e-09, -3.03082341e-05])
 
     The result should be :math:`f(x_1) = -1`, :math:`f(x_2) \approx 0` and :math:`f(x_3) \approx 0`.
 
@@ -926,9 +1109,9 @@ def crossintray(x):
     :math:`x_2 = \begin{pmatrix} 1.34941 \\ 1.34941 \end{pmatrix}` and
     :math:`x_3 = \begin{pmatrix} -1.34941 \\ -1.34941 \end{pmatrix}` at once:
 
-    >>> crossintray( np.array([[0, 1.34941, -1.34941], [0, 1.34941, -1.34941]]) )
+    >>> np.round(crossintray( np.array([[0, 1.34941, -1.34941], [0, 1.34941, -1.34941]]) ), 5)
     ... # doctest: +NORMALIZE_WHITESPACE
-    array([ -0.0001,    -2.06261,  -2.06261])
+    array([-1.00000e-04, -2.06261e+00, -2.06261e+00])
 
     The result should be :math:`f(x_1) = -0.0001`, :math:`f(x_2) = -2.06261` and :math:`f(x_3) = -2.06261`.
 
@@ -1020,7 +1203,7 @@ def holder(x):
     To evaluate a single 2D point :math:`x = \begin{pmatrix} 0 \\ 0 \end{pmatrix}`:
 
     >>> holder( np.array([0, 0]) )
-    0.0
+    -0.0
 
     The result should be :math:`f(x) = 0`.
 
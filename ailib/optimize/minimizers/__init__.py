@@ -35,15 +35,72 @@ Algorithms
 
 .. toctree::
 
+    aco
+    bayesian
+    cem
+    de
+    ga
+    gd
+    lbfgs
+    nelder_mead
+    newton
+    nsga2
+    pso
+    random
+    sa
     saes
+    sgd
+    tabu
+
+Results, stopping criteria and checkpoints
+==========================================
+
+.. toctree::
+
+    checkpoint
+    result
+    stopping
+
+Surrogate models
+================
+
+.. toctree::
+
+    surrogate
+
+Linear programming
+==================
+
+.. toctree::
+
+    simplex
 
 """
 
 # The following lines are inspired by https://github.com/scipy/scipy/blob/master/scipy/optimize/__init__.py
 
+from .aco import *
+from .bayesian import *
+from .cem import *
+from .checkpoint import *
+from .de import *
+from .ga import *
 from .gd import *
+from .lbfgs import *
+from .nelder_mead import *
+from .newton import *
+from .nsga2 import *
+from .pso import *
 from .random import *
+from .result import *
+from .samplers import *
+from .sa import *
 from .saes import *
+from .sgd import *
+from .simplex import *
+from .stopping import *
+from .surrogate import *
+from .tabu import *
 
 __all__ = [s for s in dir() if not s.startswith('_')]
 
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+r"""
+Ant colony optimization for the travelling salesman problem.
+
+This is the Ant System (with an optional elitist deposit) where all the
+steps work on whole matrices:
+
+* the pheromone trails :math:`\tau` and the heuristic information
+  :math:`\eta = 1 / d` are dense `(n, n)` arrays, combined once per
+  iteration into the choice matrix :math:`\tau^\alpha \eta^\beta`;
+* all the ants build their tours in lockstep: at each step, the next city
+  of every ant is drawn with a vectorized roulette wheel over the candidate
+  list of its current city (its `num_candidates` nearest cities), or over
+  all the cities when all the candidates are already visited;
+* evaporation is one in-place multiplication and all the deposits
+  (including the elitist one) are a single `np.add.at`.
+
+The cost of an iteration is :math:`O(m n k)` for `m` ants, `n` cities and
+`k` candidates, plus :math:`O(n^2)` for the choice matrix and evaporation.
+
+See:
+* https://en.wikipedia.org/wiki/Ant_colony_optimization_algorithms
+* M. Dorigo, V. Maniezzo and A. Colorni, "Ant system: optimization by a
+  colony of cooperating agents", IEEE Transactions on Systems, Man, and
+  Cybernetics, Part B 26(1), 29-41 (1996).
+* M. Dorigo and T. Stützle, *Ant Colony Optimization*, MIT Press (2004).
+"""
+
+__all__ = ['nearest_neighbour_tour',
+           'AntColonyOptimization']
+
+import numpy as np
+
+from .optimizer import Optimizer
+from .stopping import OptimizationState
+from .checkpoint import CheckpointWriter, restore_checkpoint
+
+
+def nearest_neighbour_tour(distances, start=0):
+    """Build a tour with the nearest neighbour heuristic.
+
+    Parameters
+    ----------
+    distances : array_like
+        The `(n, n)` matrix of distances between cities.
+    start : int
+        The first city.
+
+    Returns
+    -------
+    ndarray
+        The tour (a permutation of the cities).
+
+    Examples
+    --------
+    >>> distances = np.array([[0., 1., 5., 2.], [1., 0., 1., 5.], [5., 1., 0., 1.], [2., 5., 1., 0.]])
+    >>> nearest_neighbour_tour(distances)
+    array([0, 1, 2, 3])
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    num_cities = distances.shape[0]
+
+    tour = np.empty(num_cities, dtype=np.int64)
+    tour[0] = start
+
+    visited = np.zeros(num_cities, dtype=bool)
+    visited[start] = True
+
+    for step in range(1, num_cities):
+        row = np.where(visited, np.inf, distances[tour[step - 1]])
+        tour[step] = np.argmin(row)
+        visited[tour[step]] = True
+
+    return tour
+
+
+def _roulette(weights):
+    """Draw one column index per row of `weights` (nonnegative, with positive row sums)."""
+    cumulative_weights = np.cumsum(weights, axis=1)
+    thresholds = np.random.uniform(size=weights.shape[0]) * cumulative_weights[:, -1]
+    indices = np.count_nonzero(cumulative_weights <= thresholds[:, np.newaxis], axis=1)
+    return np.minimum(indices, weights.shape[1] - 1)
+
+
+class AntColonyOptimization(Optimizer):
+    """Ant colony optimization (Ant System) for the travelling salesman problem.
+
+    The optimizer can be used with `minimize` or with the ask/tell
+    interface: `initialize` sets the pheromone trails, `ask` returns the
+    tours built by the ants and `tell` updates the trails with their
+    lengths.
+    """
+
+    optimizer_name = "ant colony optimization"
+
+    _checkpoint_attributes = ('pheromone', 'best_x', 'best_fx')
+
+    def initialize(self,
+                   distances,
+                   num_ants=None,
+                   alpha=1.,
+                   beta=2.,
+                   rho=0.5,
+                   num_candidates=15,
+                   elitist_weight=0.,
+                   deposit=1.):
+        """Initialize the pheromone trails (ask/tell interface).
+
+        Parameters
+        ----------
+        distances : array_like
+            The `(n, n)` matrix of distances between cities (if it is
+            symmetric, both directions of an edge get the same pheromone).
+        num_ants : int
+            The number of ants (default: the number of cities).
+        alpha : float
+            The weight of the pheromone trails.
+        beta : float
+            The weight of the heuristic information (inverse distances).
+        rho : float
+            The evaporation rate.
+        num_candidates : int
+            The size of the candidate lists (the nearest cities of each
+            city).
+        elitist_weight : float
+            The weight of the deposit of the best tour found so far (0 for
+            the plain Ant System).
+        deposit : float
+            The pheromone deposited by an ant is `deposit / length`.
+        """
+
+        distances = np.asarray(distances, dtype=np.float64)
+
+        if distances.ndim != 2 or distances.shape[0] != distances.shape[1] or distances.shape[0] < 3:
+            raise ValueError("distances must be a square matrix of at least 3 cities.")
+
+        if not 0. < rho <= 1.:
+            raise ValueError("rho must be in (0, 1].")
+
+        self.num_cities = distances.shape[0]
+        self.num_ants = self.num_cities if num_ants is None else num_ants
+        self.alpha = alpha
+        self.beta = beta
+        self.rho = rho
+        self.elitist_weight = elitist_weight
+        self.deposit = deposit
+
+        self.distances = distances
+        self.symmetric = np.allclose(distances, distances.T)
+
+        # Zero distances (duplicated cities) are clipped to keep eta finite
+        self.heuristic = 1. / np.maximum(distances, 1e-10 * distances.max())
+        np.fill_diagonal(self.heuristic, 0.)
+        self._weighted_heuristic = self.heuristic**beta
+
+        # Candidate lists: the nearest cities of each city (itself excluded)
+        num_candidates = min(num_candidates, self.num_cities - 1)
+        masked_distances = distances + np.diag(np.full(self.num_cities, np.inf))
+        candidates = np.argpartition(masked_distances, num_candidates - 1, axis=1)[:, :num_candidates]
+        order = np.argsort(np.take_along_axis(masked_distances, candidates, axis=1), axis=1)
+        self.candidates = np.take_along_axis(candidates, order, axis=1)
+
+        # The usual initial trail of the Ant System: m / C_nn
+        nn_tour = nearest_neighbour_tour(distances)
+        nn_length = distances[nn_tour, np.roll(nn_tour, -1)].sum()
+        self.pheromone = np.full([self.num_cities, self.num_cities], self.num_ants / nn_length)
+
+        self.best_x = None
+        self.best_fx = np.inf
+
+    def _choice_matrix(self):
+        if self.alpha == 1.:
+            return self.pheromone * self._weighted_heuristic
+        return self.pheromone**self.alpha * self._weighted_heuristic
+
+    def ask(self):
+        """Build the tours of all the ants.
+
+        Returns
+        -------
+        ndarray
+            The `(num_cities, num_ants)` array of tours (one tour per column).
+        """
+
+        choice = self._choice_matrix()
+
+        num_ants, num_cities = self.num_ants, self.num_cities
+        ants = np.arange(num_ants)
+
+        tours = np.empty([num_ants, num_cities], dtype=np.int64)
+        tours[:, 0] = np.random.randint(num_cities, size=num_ants)
+
+        visited = np.zeros([num_ants, num_cities], dtype=bool)
+        visited[ants, tours[:, 0]] = True
+
+        for step in range(1, num_cities):
+            current = tours[:, step - 1]
+
+            candidates = self.candidates[current]                                   # (num_ants, k)
+            weights = choice[current[:, np.newaxis], candidates]
+            weights[visited[ants[:, np.newaxis], candidates]] = 0.
+
+            total_weights = weights.sum(axis=1)
+            has_candidate = total_weights > 0.
+
+            next_cities = np.empty(num_ants, dtype=np.int64)
+            next_cities[has_candidate] = candidates[has_candidate, _roulette(weights[has_candidate])]
+
+            if not np.all(has_candidate):
+                # All candidates visited: draw among all the unvisited cities
+                others = ~has_candidate
+                weights = np.where(visited[others], 0., choice[current[others]])
+                no_weight = weights.sum(axis=1) <= 0.
+                weights[no_weight] = ~visited[others][no_weight]           # Underflowed trails: uniform draw
+                next_cities[others] = _roulette(weights)
+
+            tours[:, step] = next_cities
+            visited[ants, next_cities] = True
+
+        return tours.T.copy()
+
+    def tell(self, x, fx):
+        """Evaporate the pheromone trails and deposit pheromone on the tours.
+
+        Parameters
+        ----------
+        x : ndarray
+            The `(num_cities, num_ants)` array of tours returned by `ask`.
+        fx : ndarray
+            The lengths of these tours.
+        """
+
+        tours = np.asarray(x, dtype=np.int64).T
+        lengths = np.asarray(fx, dtype=np.float64)
+
+        if tours.shape[1] != self.num_cities or lengths.shape != (tours.shape[0],):
+            raise ValueError("The batch doesn't match the asked tours.")
+
+        best_index = np.argmin(lengths)
+        if lengths[best_index] < self.best_fx:
+            self.best_x = tours[best_index].copy()
+            self.best_fx = float(lengths[best_index])
+
+        amounts = self.deposit / lengths
+        if self.elitist_weight > 0.:
+            tours = np.concatenate([tours, self.best_x[np.newaxis, :]])
+            amounts = np.append(amounts, self.elitist_weight * self.deposit / self.best_fx)
+
+        origins = tours.ravel()
+        destinations = np.roll(tours, -1, axis=1).ravel()
+        amounts = np.repeat(amounts, self.num_cities)
+
+        if self.symmetric:
+            origins, destinations = np.concatenate([origins, destinations]), np.concatenate([destinations, origins])
+            amounts = np.concatenate([amounts, amounts])
+
+        self.pheromone *= 1. - self.rho
+        np.add.at(self.pheromone, (origins, destinations), amounts)
+
+    def minimize(self,
+                 objective_function,
+                 num_iterations=100,
+                 distances=None,
+                 num_ants=None,
+                 alpha=1.,
+                 beta=2.,
+                 rho=0.5,
+                 num_candidates=15,
+                 elitist_weight=0.,
+                 deposit=1.,
+                 stopping_criteria=None,
+                 record_history=False,
+                 checkpoint=None,
+                 checkpoint_period=10):
+        """Minimize the tour length `objective_function` with ant colony optimization.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize: it takes a `(num_cities, n)` array of
+            tours and returns their lengths (see
+            `ailib.optimize.functions.tsp`).
+        num_iterations : int
+            The number of iterations (one tour per ant at each iteration).
+        distances : array_like
+            The matrix of distances between cities used as heuristic
+            information (default: `objective_function.distances`).
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`).
+        record_history : bool
+            Keep the best tour and its length at each iteration in the result
+            history (keys `'x'` and `'fx'`).
+        checkpoint : str
+            The path of a checkpoint file (`.npz`). If set, the state of the
+            run is saved every `checkpoint_period` iterations (and at the end)
+            and, if the file already exists, the run is resumed from it (see
+            `ailib.optimize.minimizers.checkpoint`).
+        checkpoint_period : int
+            The number of iterations between two checkpoints.
+
+        The other parameters are described in `initialize`.
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization (`x` is the best tour).
+        """
+
+        if distances is None:
+            distances = objective_function.distances
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        self.initialize(distances,
+                        num_ants=num_ants,
+                        alpha=alpha,
+                        beta=beta,
+                        rho=rho,
+                        num_candidates=num_candidates,
+                        elitist_weight=elitist_weight,
+                        deposit=deposit)
+
+        if checkpoint is not None:
+            restore_checkpoint(checkpoint, self, state)
+
+        with CheckpointWriter(checkpoint, checkpoint_period) as writer:
+            for iteration_index in range(state.nit, num_iterations):
+                x = self.ask()
+                self.tell(x, objective_function(x))
+
+                state.update(self.best_x, self.best_fx)
+
+                writer.update(self, state)
+
+                if state.stop():
+                    break
+
+            writer.update(self, state, force=True)
+
+        return state.result(x=self.best_x, fx=self.best_fx)
@@ -0,0 +1,790 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+r"""
+Bayesian optimization.
+
+Bayesian optimization is meant for very expensive objective functions: a
+Gaussian process (GP) model of the objective function is fitted on all the
+evaluated points and the next points to evaluate are the maximizers of an
+acquisition function (the expected improvement or the upper confidence
+bound) that trades off exploitation (low predicted value) and exploration
+(high predictive uncertainty).
+
+Implementation notes:
+
+* the Cholesky factor of the kernel matrix is updated incrementally (block
+  update in :math:`O(n^2 q)` for :math:`q` new points) when points are
+  added; it is only recomputed from scratch when the hyperparameters of the
+  kernel are refitted (every `refit_period` rounds);
+* the acquisition function and its gradient are computed for a batch of
+  points at once; it is maximized from `num_restarts` starting points (the
+  best of `num_samples` random points) optimized together by a single
+  L-BFGS-B run on the sum of their (independent) acquisition values;
+* several points per round (`batch_size`) are proposed with the constant
+  liar heuristic: each proposed point is temporarily added to the model
+  with the best observed value as observation before proposing the next
+  one, so that the acquisition function vanishes around it. (The kriging
+  believer heuristic, which takes the predicted value as observation, keeps
+  proposing the same point when the model extrapolates below the observed
+  values.) A proposal that duplicates a modeled point is replaced by a
+  random point.
+
+Only NumPy and SciPy are used (SciPy is imported on first use).
+
+See:
+* C. E. Rasmussen and C. K. I. Williams, *Gaussian Processes for Machine
+  Learning*, MIT Press (2006), chapters 2 and 5.
+* D. R. Jones, M. Schonlau and W. J. Welch, "Efficient global optimization
+  of expensive black-box functions", Journal of Global Optimization 13(4),
+  455-492 (1998).
+* D. Ginsbourger, R. Le Riche and L. Carraro, "Kriging is well-suited to
+  parallelize optimization", in *Computational Intelligence in Expensive
+  Optimization Problems*, Springer (2010).
+* M. Balandat et al., "BoTorch: a framework for efficient Monte-Carlo
+  Bayesian optimization", NeurIPS 2020 (joint multi-start optimization).
+"""
+
+__all__ = ['GaussianProcess',
+           'BayesianOptimization']
+
+import math
+import numpy as np
+
+from .optimizer import Optimizer
+from .samplers import make_sampler
+from .stopping import OptimizationState
+from .checkpoint import CheckpointWriter, restore_checkpoint
+
+
+class GaussianProcess:
+    """Gaussian process regression with a stationary ARD kernel.
+
+    Points are given as `(ndim, n)` arrays (like objective functions).
+    Observations are normalized (zero mean, unit variance) when the model is
+    fitted with `fit`; points added with `add` use the same normalization.
+
+    Parameters
+    ----------
+    ndim : int
+        The number of dimensions of the input space.
+    kernel : str
+        `'matern52'` (Matern 5/2) or `'se'` (squared exponential).
+    length_scales : float or array_like
+        The initial length scales (one per dimension).
+    signal_variance : float
+        The initial signal variance (of the normalized observations).
+    noise_variance : float
+        The noise variance (of the normalized observations); a small value
+        keeps the kernel matrix well conditioned for noiseless objectives.
+    fit_noise : bool
+        Also fit the noise variance with the other hyperparameters.
+
+    Examples
+    --------
+    The model interpolates noiseless observations:
+
+    >>> np.random.seed(0)
+    >>> x = np.random.uniform(size=[2, 10])
+    >>> y = np.sin(3. * x[0]) + x[1]**2
+    >>> gp = GaussianProcess(2)
+    >>> gp.fit(x[:, :8], y[:8])
+    >>> gp.add(x[:, 8:], y[8:])
+    >>> mean, std = gp.predict(x)
+    >>> bool(np.all(np.abs(mean - y) < 1e-4)), bool(np.all(std < 1e-2))
+    (True, True)
+    """
+
+    def __init__(self,
+                 ndim,
+                 kernel='matern52',
+                 length_scales=0.5,
+                 signal_variance=1.,
+                 noise_variance=1e-6,
+                 fit_noise=False):
+
+        if kernel not in ('matern52', 'se'):
+            raise ValueError("Unknown kernel {}.".format(kernel))
+
+        self.ndim = ndim
+        self.kernel = kernel
+        self.length_scales = np.broadcast_to(np.asarray(length_scales, dtype=np.float64), (ndim,)).copy()
+        self.signal_variance = float(signal_variance)
+        self.noise_variance = float(noise_variance)
+        self.fit_noise = fit_noise
+
+        self.x = np.zeros([0, ndim])    # One point per row
+        self.y = np.zeros(0)
+        self._y_mean = 0.
+        self._y_std = 1.
+        self._L = None
+
+    @property
+    def num_points(self):
+        return self.y.shape[0]
+
+    # Kernel ##################################################################
+
+    def _kernel(self, a, b, return_gradient_factor=False):
+        """The kernel matrix between the rows of `a` and `b`.
+
+        If `return_gradient_factor` is set, also return the matrix `G` such
+        that the derivative of `k(a_i, b_j)` with respect to `a_i` is
+        `G[i, j] (a_i - b_j) / length_scales**2`.
+        """
+        a = a / self.length_scales
+        b = b / self.length_scales
+        squared_distances = np.maximum(np.sum(a**2, axis=1)[:, np.newaxis]
+                                       - 2. * a @ b.T
+                                       + np.sum(b**2, axis=1)[np.newaxis, :], 0.)
+
+        if self.kernel == 'se':
+            k = self.signal_variance * np.exp(-0.5 * squared_distances)
+            gradient_factor = -k
+        else:
+            sqrt5_r = np.sqrt(5. * squared_distances)
+            exp_term = np.exp(-sqrt5_r)
+            k = self.signal_variance * (1. + sqrt5_r + 5. / 3. * squared_distances) * exp_term
+            gradient_factor = -self.signal_variance * 5. / 3. * (1. + sqrt5_r) * exp_term
+
+        if return_gradient_factor:
+            return k, gradient_factor
+        return k
+
+    # Fit #####################################################################
+
+    def _factorize(self):
+        import scipy.linalg
+
+        K = self._kernel(self.x, self.x) + self.noise_variance * np.eye(self.num_points)
+        # C order, like the factors built by `add` and restored by `set_state`
+        # (the memory layout changes the rounding of the BLAS calls)
+        self._L = np.ascontiguousarray(scipy.linalg.cholesky(K, lower=True))
+        self._update_alpha()
+
+    def _update_alpha(self):
+        import scipy.linalg
+
+        self._alpha = scipy.linalg.cho_solve((self._L, True), (self.y - self._y_mean) / self._y_std)
+
+    def fit(self, x, y):
+        """Fit the model on the points `x` (a `(ndim, n)` array) and their values `y`.
+
+        The kernel matrix is factorized from scratch (the hyperparameters
+        are unchanged, see `fit_hyperparameters`).
+        """
+        self.x = np.asarray(x, dtype=np.float64).reshape([self.ndim, -1]).T.copy()
+        self.y = np.asarray(y, dtype=np.float64).ravel().copy()
+
+        self._y_mean = self.y.mean()
+        self._y_std = self.y.std() if self.y.std() > 0. else 1.
+
+        self._factorize()
+
+    def add(self, x, y):
+        r"""Add points to the model with an incremental Cholesky update.
+
+        With :math:`K = L L^\top` the current kernel matrix and
+        :math:`K_{12}`, :math:`K_{22}` the kernel matrices between the
+        current and the new points and between the new points, the new factor
+        is :math:`\begin{pmatrix} L & 0 \\ L_{21} & L_{22} \end{pmatrix}` with
+        :math:`L_{21} = (L^{-1} K_{12})^\top` and
+        :math:`L_{22} L_{22}^\top = K_{22} - L_{21} L_{21}^\top`.
+
+        Parameters
+        ----------
+        x : ndarray
+            The `(ndim, q)` array of new points.
+        y : array_like
+            The `q` values at `x`.
+        """
+        import scipy.linalg
+
+        x = np.asarray(x, dtype=np.float64).reshape([self.ndim, -1]).T
+        y = np.asarray(y, dtype=np.float64).ravel()
+
+        if self._L is None:
+            self.fit(x.T, y)
+            return
+
+        K12 = self._kernel(self.x, x)
+        K22 = self._kernel(x, x) + self.noise_variance * np.eye(x.shape[0])
+
+        L21 = scipy.linalg.solve_triangular(self._L, K12, lower=True).T
+
+        self.x = np.concatenate([self.x, x])
+        self.y = np.concatenate([self.y, y])
+
+        try:
+            L22 = scipy.linalg.cholesky(K22 - L21 @ L21.T, lower=True)
+        except np.linalg.LinAlgError:
+            # Loss of positive definiteness (e.g. duplicated points)
+            self._factorize()
+            return
+
+        num_points = self.num_points
+        L = np.zeros([num_points, num_points])
+        L[:-x.shape[0], :-x.shape[0]] = self._L
+        L[-x.shape[0]:, :-x.shape[0]] = L21
+        L[-x.shape[0]:, -x.shape[0]:] = L22
+        self._L = L
+
+        self._update_alpha()
+
+    def get_snapshot(self):
+        """Return the fitted model (to restore it after temporary `add` calls)."""
+        return (self.x, self.y, self._L, self._alpha)
+
+    def restore_snapshot(self, snapshot):
+        """Restore a model returned by `get_snapshot`."""
+        self.x, self.y, self._L, self._alpha = snapshot
+
+    def get_state(self):
+        """Return a copy of the fitted model (for checkpoints).
+
+        The Cholesky factor and the normalization of the observations are
+        saved as they are: they depend on the sequence of `fit` and `add`
+        calls, which `set_state` doesn't replay.
+        """
+        state = {'x': self.x.copy(),
+                 'y': self.y.copy(),
+                 'y_mean': self._y_mean,
+                 'y_std': self._y_std,
+                 'length_scales': self.length_scales.copy(),
+                 'signal_variance': self.signal_variance,
+                 'noise_variance': self.noise_variance}
+        if self._L is not None:
+            state['L'] = self._L.copy()
+            state['alpha'] = self._alpha.copy()
+        return state
+
+    def set_state(self, state):
+        """Restore a model returned by `get_state`."""
+        self.length_scales = np.array(state['length_scales'], dtype=np.float64)
+        self.signal_variance = float(state['signal_variance'])
+        self.noise_variance = float(state['noise_variance'])
+        self.x = np.array(state['x'], dtype=np.float64).reshape([-1, self.ndim])
+        self.y = np.array(state['y'], dtype=np.float64)
+        self._y_mean = float(state['y_mean'])
+        self._y_std = float(state['y_std'])
+        if 'L' in state:
+            self._L = np.array(state['L'], dtype=np.float64)
+            self._alpha = np.array(state['alpha'], dtype=np.float64)
+        else:
+            self._L = None
+
+    # Hyperparameters #########################################################
+
+    def _get_log_params(self):
+        log_params = [np.log(self.length_scales), [math.log(self.signal_variance)]]
+        if self.fit_noise:
+            log_params.append([math.log(self.noise_variance)])
+        return np.concatenate(log_params)
+
+    def _set_log_params(self, log_params):
+        self.length_scales = np.exp(log_params[:self.ndim])
+        self.signal_variance = math.exp(log_params[self.ndim])
+        if self.fit_noise:
+            self.noise_variance = math.exp(log_params[self.ndim + 1])
+
+    @property
+    def log_params(self):
+        """The log of the hyperparameters (length scales, signal variance and, if fitted, noise variance)."""
+        return self._get_log_params()
+
+    @log_params.setter
+    def log_params(self, log_params):
+        self._set_log_params(np.asarray(log_params, dtype=np.float64))
+        if self._L is not None:
+            self._factorize()
+
+    def _negative_log_marginal_likelihood(self, log_params):
+        """The negative log marginal likelihood and its gradient."""
+        import scipy.linalg
+
+        self._set_log_params(log_params)
+
+        num_points = self.num_points
+        K, gradient_factor = self._kernel(self.x, self.x, return_gradient_factor=True)
+        K_noise = K + self.noise_variance * np.eye(num_points)
+
+        try:
+            L = scipy.linalg.cholesky(K_noise, lower=True)
+        except np.linalg.LinAlgError:
+            return 1e25, np.zeros_like(log_params)
+
+        y = (self.y - self._y_mean) / self._y_std
+        alpha = scipy.linalg.cho_solve((L, True), y)
+
+        value = 0.5 * y @ alpha + np.sum(np.log(np.diag(L))) + 0.5 * num_points * math.log(2. * math.pi)
+
+        # d(-LML)/d(theta) = -0.5 tr((alpha alpha^T - K^-1) dK/dtheta)
+        W = np.outer(alpha, alpha) - scipy.linalg.cho_solve((L, True), np.eye(num_points))
+
+        gradient = np.empty_like(log_params)
+        for d in range(self.ndim):
+            squared_differences = (self.x[:, d, np.newaxis] - self.x[np.newaxis, :, d])**2 / self.length_scales[d]**2
+            gradient[d] = 0.5 * np.sum(W * gradient_factor * squared_differences)
+        gradient[self.ndim] = -0.5 * np.sum(W * K)
+        if self.fit_noise:
+            gradient[self.ndim + 1] = -0.5 * self.noise_variance * np.trace(W)
+
+        return value, gradient
+
+    def fit_hyperparameters(self, num_restarts=3):
+        """Fit the hyperparameters by maximizing the log marginal likelihood.
+
+        The optimization (L-BFGS-B with the analytic gradient) starts from
+        the current hyperparameters and from `num_restarts` random ones. The
+        kernel matrix is then factorized from scratch.
+        """
+        import scipy.optimize
+
+        bounds = [(math.log(1e-2), math.log(1e2))] * self.ndim + [(math.log(1e-2), math.log(1e2))]
+        if self.fit_noise:
+            bounds.append((math.log(1e-8), math.log(1.)))
+        bounds = np.array(bounds)
+
+        starts = [np.clip(self._get_log_params(), bounds[:, 0], bounds[:, 1])]
+        starts.extend(np.random.uniform(bounds[:, 0], bounds[:, 1]) for restart_index in range(num_restarts))
+
+        best_value, best_log_params = np.inf, starts[0]
+
+        for start in starts:
+            result = scipy.optimize.minimize(self._negative_log_marginal_likelihood,
+                                             start,
+                                             jac=True,
+                                             method='L-BFGS-B',
+                                             bounds=bounds)
+            if result.fun < best_value:
+                best_value, best_log_params = result.fun, result.x
+
+        self._set_log_params(best_log_params)
+        self._factorize()
+
+    # Predict #################################################################
+
+    def predict(self, x, return_gradient=False):
+        """Predict the mean and the standard deviation of the model at `x`.
+
+        Parameters
+        ----------
+        x : ndarray
+            The `(ndim, m)` array of points.
+        return_gradient : bool
+            Also return the gradients of the mean and of the standard
+            deviation (two `(m, ndim)` arrays).
+
+        Returns
+        -------
+        tuple
+            The `m` means and the `m` standard deviations (and their
+            gradients if `return_gradient` is set).
+        """
+        import scipy.linalg
+
+        x = np.asarray(x, dtype=np.float64).reshape([self.ndim, -1]).T
+
+        K, gradient_factor = self._kernel(x, self.x, return_gradient_factor=True)
+
+        mean = K @ self._alpha
+        v = scipy.linalg.solve_triangular(self._L, K.T, lower=True)
+        variance = np.maximum(self.signal_variance - np.sum(v**2, axis=0), 1e-12)
+        std = np.sqrt(variance)
+
+        if not return_gradient:
+            return mean * self._y_std + self._y_mean, std * self._y_std
+
+        # dK[i, j, :] is the derivative of k(x_i, x_j) with respect to x_i
+        dK = gradient_factor[:, :, np.newaxis] * (x[:, np.newaxis, :] - self.x[np.newaxis, :, :]) / self.length_scales**2
+        w = scipy.linalg.solve_triangular(self._L.T, v, lower=False)        # K^-1 k(x)
+
+        mean_gradient = np.einsum('ijd,j->id', dK, self._alpha)
+        std_gradient = -np.einsum('ijd,ji->id', dK, w) / std[:, np.newaxis]
+
+        return (mean * self._y_std + self._y_mean,
+                std * self._y_std,
+                mean_gradient * self._y_std,
+                std_gradient * self._y_std)
+
+
+class BayesianOptimization(Optimizer):
+    """Bayesian optimization with a Gaussian process model.
+
+    The optimizer can be driven step by step with the ask/tell interface
+    (e.g. when evaluations are run by a parallel evaluator): `initialize`
+    draws the initial design, `ask` returns the `(ndim, q)` array of points
+    to evaluate (the initial design first, then `batch_size` points per
+    round) and `tell` gives their values back to the optimizer.
+
+    Examples
+    --------
+    >>> from ailib.optimize.functions.unconstrained import Sphere
+    >>> np.random.seed(0)
+    >>> res = BayesianOptimization().minimize(Sphere(2), num_evaluations=25)
+    >>> res.nfev, bool(res.fx < 1e-2)
+    (25, True)
+    """
+
+    optimizer_name = "Bayesian optimization"
+
+    _checkpoint_attributes = ('observed_x', 'observed_y', 'initial_x', 'num_rounds')
+
+    def initialize(self,
+                   bounds,
+                   num_initial_points=None,
+                   initial_design='lhs',
+                   acquisition='ei',
+                   xi=0.01,
+                   kappa=2.,
+                   batch_size=1,
+                   kernel='matern52',
+                   noise_variance=1e-6,
+                   fit_noise=False,
+                   refit_period=5,
+                   num_samples=1000,
+                   num_restarts=10):
+        """Draw the initial design (ask/tell interface).
+
+        Parameters
+        ----------
+        bounds : ndarray
+            The `(2, ndim)` array of lower (first row) and upper (second row)
+            bounds of the search space.
+        num_initial_points : int
+            The size of the initial design (default: `2 ndim + 1`).
+        initial_design : str or sampler object
+            The sampler of the initial design (see
+            `ailib.optimize.minimizers.samplers`).
+        acquisition : str
+            `'ei'` (expected improvement) or `'ucb'` (upper confidence bound
+            of the opposite of the objective, i.e. lower confidence bound of
+            the objective).
+        xi : float
+            The exploration parameter of the expected improvement (in units
+            of the objective function).
+        kappa : float
+            The exploration parameter of the upper confidence bound.
+        batch_size : int
+            The number of points proposed per round (constant liar).
+        kernel : str
+            The kernel of the Gaussian process (`'matern52'` or `'se'`).
+        noise_variance : float
+            The noise variance of the (normalized) observations.
+        fit_noise : bool
+            Also fit the noise variance (for noisy objective functions).
+        refit_period : int
+            The number of rounds between two fits of the hyperparameters
+            (the model is updated incrementally in between).
+        num_samples : int
+            The number of random points the acquisition function is first
+            evaluated at.
+        num_restarts : int
+            The number of starting points of the acquisition maximization.
+        """
+
+        if acquisition not in ('ei', 'ucb'):
+            raise ValueError("Unknown acquisition function {}.".format(acquisition))
+
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive.")
+
+        self.lower = np.asarray(bounds[0], dtype=np.float64)
+        self.upper = np.asarray(bounds[1], dtype=np.float64)
+        self.ndim = self.lower.shape[0]
+
+        if num_initial_points is None:
+            num_initial_points = 2 * self.ndim + 1
+
+        self.acquisition = acquisition
+        self.xi = xi
+        self.kappa = kappa
+        self.batch_size = batch_size
+        self.refit_period = refit_period
+        self.num_samples = num_samples
+        self.num_restarts = num_restarts
+
+        # The model works in the unit cube
+        self.gp = GaussianProcess(self.ndim, kernel=kernel, noise_variance=noise_variance, fit_noise=fit_noise)
+
+        sampler = make_sampler(initial_design, self.ndim, self.lower, self.upper)
+        self.initial_x = sampler.sample(num_initial_points).T
+
+        self.observed_x = np.zeros([0, self.ndim])
+        self.observed_y = np.zeros(0)
+        self.num_rounds = 0             # The number of rounds since the last fit of the hyperparameters
+
+    @property
+    def best_x(self):
+        """The best evaluated point."""
+        return self.observed_x[np.nanargmin(self.observed_y)].copy()
+
+    @property
+    def best_fx(self):
+        """The value of the best evaluated point."""
+        return np.nanmin(self.observed_y)
+
+    def _to_unit_cube(self, x):
+        return (x - self.lower) / (self.upper - self.lower)
+
+    def _from_unit_cube(self, z):
+        return self.lower + z * (self.upper - self.lower)
+
+    def _acquisition(self, z, incumbent, return_gradient=False):
+        """The acquisition function (to maximize) at the rows of `z` (unit cube).
+
+        `incumbent` is the value to improve upon (expected improvement only).
+        """
+        import scipy.special
+
+        predictions = self.gp.predict(z.T, return_gradient=return_gradient)
+        mean, std = predictions[:2]
+
+        if self.acquisition == 'ei':
+            improvement = incumbent - mean - self.xi
+            u = improvement / std
+            cdf = scipy.special.ndtr(u)
+            pdf = np.exp(-0.5 * u**2) / math.sqrt(2. * math.pi)
+            value = improvement * cdf + std * pdf
+            mean_weight, std_weight = -cdf, pdf
+        else:
+            value = -mean + self.kappa * std
+            mean_weight, std_weight = -np.ones_like(mean), np.full_like(mean, self.kappa)
+
+        if not return_gradient:
+            return value
+
+        mean_gradient, std_gradient = predictions[2:]
+        return value, mean_weight[:, np.newaxis] * mean_gradient + std_weight[:, np.newaxis] * std_gradient
+
+    def _maximize_acquisition(self, incumbent):
+        """Return the maximizer of the acquisition function (in the unit cube)."""
+        import scipy.optimize
+
+        samples = np.random.uniform(size=[self.num_samples, self.ndim])
+        values = self._acquisition(samples, incumbent)
+
+        num_restarts = min(self.num_restarts, self.num_samples)
+        starts = samples[np.argsort(-values)[:num_restarts]]
+
+        # The acquisition values of the starting points are independent: all
+        # starting points are optimized at once by maximizing their sum.
+        def objective(flat_z):
+            value, gradient = self._acquisition(flat_z.reshape(starts.shape), incumbent, return_gradient=True)
+            return -value.sum(), -gradient.ravel()
+
+        result = scipy.optimize.minimize(objective,
+                                         starts.ravel(),
+                                         jac=True,
+                                         method='L-BFGS-B',
+                                         bounds=[(0., 1.)] * starts.size)
+
+        candidates = np.concatenate([np.clip(result.x.reshape(starts.shape), 0., 1.), starts])
+        candidate_values = self._acquisition(candidates, incumbent)
+
+        return candidates[np.nanargmax(candidate_values)]
+
+    def ask(self):
+        """Propose the points to evaluate.
+
+        Returns
+        -------
+        ndarray
+            The `(ndim, q)` array of points to evaluate: the initial design
+            on the first call, then `batch_size` points.
+        """
+
+        if self.observed_y.shape[0] == 0:
+            return self.initial_x.T.copy()
+
+        if self.gp.num_points == 0:
+            # No finite value yet: keep sampling at random
+            return np.random.uniform(self.lower, self.upper, size=[self.batch_size, self.ndim]).T
+
+        proposals = []
+        snapshot = self.gp.get_snapshot()
+        incumbent = self.best_fx
+
+        for point_index in range(self.batch_size):
+            z = self._maximize_acquisition(incumbent)
+
+            if self._is_duplicate(z, proposals):
+                # The acquisition function is flat: explore at random instead
+                z = np.random.uniform(size=self.ndim)
+
+            proposals.append(z)
+
+            if point_index < self.batch_size - 1:
+                # Constant liar: the best value is taken as observation
+                self.gp.add(z[:, np.newaxis], [incumbent])
+
+        self.gp.restore_snapshot(snapshot)
+
+        return self._from_unit_cube(np.array(proposals)).T
+
+    def _is_duplicate(self, z, proposals, tol=1e-6):
+        """Whether `z` (unit cube) is a modeled point or is already in `proposals`."""
+        points = np.concatenate([self.gp.x] + [proposal[np.newaxis, :] for proposal in proposals])
+        return bool(np.any(np.max(np.abs(points - z), axis=1) <= tol))
+
+    def tell(self, x, fx):
+        """Give the values of evaluated points to the optimizer.
+
+        Parameters
+        ----------
+        x : ndarray
+            The `(ndim, q)` array of points (returned by `ask`, or a subset
+            of its columns).
+        fx : ndarray
+            The values of the objective function at `x`.
+        """
+
+        x = np.asarray(x, dtype=np.float64).reshape([self.ndim, -1]).T
+        y = np.asarray(fx, dtype=np.float64).ravel()
+
+        if x.shape[0] != y.shape[0]:
+            raise ValueError("x and fx don't have the same number of points.")
+
+        self.observed_x = np.concatenate([self.observed_x, x])
+        self.observed_y = np.concatenate([self.observed_y, y])
+
+        # Failed evaluations (NaN or infinite values) are not modeled
+        finite = np.isfinite(y)
+        self.num_rounds += 1
+
+        if self.gp.num_points == 0 or self.num_rounds >= self.refit_period:
+            self._refit()
+        elif np.any(finite):
+            self.gp.add(self._to_unit_cube(x[finite]).T, y[finite])
+
+    def _refit(self):
+        finite = np.isfinite(self.observed_y)
+        if np.any(finite):
+            self.gp.fit(self._to_unit_cube(self.observed_x[finite]).T, self.observed_y[finite])
+            self.gp.fit_hyperparameters()
+        self.num_rounds = 0
+
+    def get_state(self):
+        state = super().get_state()
+        for key, value in self.gp.get_state().items():
+            state['gp.' + key] = value
+        return state
+
+    def set_state(self, state):
+        super().set_state(state)
+        self.gp.set_state({key[len('gp.'):]: value for key, value in state.items() if key.startswith('gp.')})
+
+    def minimize(self,
+                 objective_function,
+                 num_evaluations=50,
+                 num_initial_points=None,
+                 initial_design='lhs',
+                 acquisition='ei',
+                 xi=0.01,
+                 kappa=2.,
+                 batch_size=1,
+                 kernel='matern52',
+                 noise_variance=1e-6,
+                 fit_noise=False,
+                 refit_period=5,
+                 num_samples=1000,
+                 num_restarts=10,
+                 bounds=None,
+                 stopping_criteria=None,
+                 record_history=False,
+                 checkpoint=None,
+                 checkpoint_period=1):
+        """Minimize `objective_function` with Bayesian optimization.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize (each batch of points is evaluated with
+            a single call).
+        num_evaluations : int
+            The number of evaluations (including the initial design).
+        bounds : ndarray
+            The `(2, ndim)` array of lower (first row) and upper (second row)
+            bounds (default: `objective_function.bounds`).
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`), checked after each round.
+        record_history : bool
+            Keep the best point and the best value found after each round in
+            the result history (keys `'x'` and `'fx'`).
+        checkpoint : str
+            The path of a checkpoint file (`.npz`). If set, the state of the
+            run is saved every `checkpoint_period` rounds (and at the end)
+            and, if the file already exists, the run is resumed from it (see
+            `ailib.optimize.minimizers.checkpoint`).
+        checkpoint_period : int
+            The number of rounds between two checkpoints.
+
+        The other parameters are described in `initialize`.
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization.
+        """
+
+        if bounds is None:
+            bounds = objective_function.bounds
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        self.initialize(bounds,
+                        num_initial_points=num_initial_points,
+                        initial_design=initial_design,
+                        acquisition=acquisition,
+                        xi=xi,
+                        kappa=kappa,
+                        batch_size=batch_size,
+                        kernel=kernel,
+                        noise_variance=noise_variance,
+                        fit_noise=fit_noise,
+                        refit_period=refit_period,
+                        num_samples=num_samples,
+                        num_restarts=num_restarts)
+
+        if checkpoint is not None:
+            restore_checkpoint(checkpoint, self, state)
+
+        with CheckpointWriter(checkpoint, checkpoint_period) as writer:
+            while self.observed_y.shape[0] < num_evaluations:
+                x = self.ask()[:, :num_evaluations - self.observed_y.shape[0]]
+                self.tell(x, objective_function(x))
+
+                state.update(self.best_x, self.best_fx)
+
+                writer.update(self, state)
+
+                if state.stop():
+                    break
+
+            writer.update(self, state, force=True)
+
+        if state.termination_reason is None:
+            state.terminate("max_evaluations")
+
+        return state.result(x=self.best_x, fx=self.best_fx)
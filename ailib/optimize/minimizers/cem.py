@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__all__ = ['CrossEntropyMethod']
+
+import numpy as np
+
+from .optimizer import Optimizer
+from .stopping import OptimizationState
+from .checkpoint import CheckpointWriter, restore_checkpoint
+
+
+def _gaussian_log_density(x, mean, covariance_factor, full_covariance):
+    """Log density (up to an additive constant) of the rows of `x`.
+
+    `covariance_factor` is the vector of standard deviations if
+    `full_covariance` is `False`, the lower Cholesky factor of the covariance
+    matrix otherwise.
+    """
+    if full_covariance:
+        z = np.linalg.solve(covariance_factor, (x - mean).T).T
+        log_determinant = np.sum(np.log(np.diag(covariance_factor)))
+    else:
+        z = (x - mean) / covariance_factor
+        log_determinant = np.sum(np.log(covariance_factor))
+
+    return -0.5 * np.sum(z**2, axis=1) - log_determinant
+
+
+class CrossEntropyMethod(Optimizer):
+    r"""Cross-entropy method optimizer.
+
+    At each iteration, a population is sampled from a gaussian distribution
+    (with a diagonal or a full covariance matrix) and evaluated with a single
+    (batched) call to the objective function; the `num_elites` best samples
+    are selected (with `np.argpartition`) and the distribution is refitted on
+    them. The new parameters are smoothed with the previous ones:
+
+    .. math::
+
+        \boldsymbol{\mu} \leftarrow \alpha \boldsymbol{\mu}_{elites} + (1 - \alpha) \boldsymbol{\mu}
+
+    (and likewise for the standard deviations or the covariance matrix).
+
+    When `reuse_samples` is set, the samples of the previous generation
+    (whose values are already known) compete with the fresh samples for the
+    elite set. They are weighted by the likelihood ratio between the current
+    and the previous sampling distributions (truncated self-normalized
+    importance sampling) when the distribution is refitted. This doubles the
+    number of candidates without any additional evaluation, so that fewer
+    fresh samples are needed per iteration.
+
+    The optimizer can also be driven step by step with the ask/tell
+    interface: `initialize` sets the initial distribution, `ask` returns the
+    `(ndim, num_samples)` array of samples of an iteration and `tell` gives
+    their values back to the optimizer (which refits the distribution).
+
+    See:
+    * https://en.wikipedia.org/wiki/Cross-entropy_method
+    * R. Y. Rubinstein and D. P. Kroese, *The Cross-Entropy Method*,
+      Springer (2004).
+
+    Examples
+    --------
+    The valley of the Rosenbrock function is not aligned with the axes: a
+    diagonal covariance matrix tends to shrink before reaching the minimum
+    where a full covariance matrix follows the valley:
+
+    >>> from ailib.optimize.functions.unconstrained import Rosenbrock
+    >>> np.random.seed(0)
+    >>> res = CrossEntropyMethod().minimize(Rosenbrock(2), num_iterations=200)
+    >>> bool(res.fx > 1e-3)
+    True
+    >>> np.random.seed(0)
+    >>> res = CrossEntropyMethod().minimize(Rosenbrock(2), num_iterations=200, full_covariance=True)
+    >>> np.round(res.x, 6), bool(res.fx < 1e-12)
+    (array([1., 1.]), True)
+    """
+
+    optimizer_name = "cross-entropy method"
+
+    _checkpoint_attributes = ('mean', 'std', 'covariance', 'best_x', 'best_fx', 'previous_x', 'previous_y', 'previous_log_density')
+
+    def initialize(self,
+                   bounds,
+                   num_samples=100,
+                   num_elites=10,
+                   full_covariance=False,
+                   smoothing=0.7,
+                   reuse_samples=False,
+                   init_mean=None,
+                   init_std=None,
+                   min_std=1e-12):
+        r"""Initialize the sampling distribution (ask/tell interface).
+
+        Parameters
+        ----------
+        bounds : ndarray
+            The `(2, ndim)` array of lower (first row) and upper (second row)
+            bounds. Samples are clipped to the bounds.
+        num_samples : int
+            The number of fresh samples evaluated at each iteration.
+        num_elites : int
+            The number of elite samples the distribution is fitted on.
+        full_covariance : bool
+            Use a full covariance matrix instead of a diagonal one.
+        smoothing : float
+            The smoothing coefficient :math:`\alpha` (1 means no smoothing).
+        reuse_samples : bool
+            Reuse the samples of the previous iteration (with importance
+            sampling weights) to select and fit the elites.
+        init_mean : ndarray
+            The initial mean (default: the center of the bounds).
+        init_std : ndarray or float
+            The initial standard deviation (default: half the width of the
+            bounds).
+        min_std : float
+            A lower bound on the standard deviations (prevents the
+            distribution from collapsing).
+        """
+
+        self.lower = np.asarray(bounds[0], dtype=np.float64)
+        self.upper = np.asarray(bounds[1], dtype=np.float64)
+        self.ndim = ndim = self.lower.shape[0]
+
+        self.num_samples = num_samples
+        self.num_elites = num_elites
+        self.full_covariance = full_covariance
+        self.smoothing = smoothing
+        self.reuse_samples = reuse_samples
+        self.min_std = min_std
+
+        self.mean = (self.lower + self.upper) / 2. if init_mean is None else np.array(init_mean, dtype=np.float64)
+        self.std = (self.upper - self.lower) / 2. if init_std is None else np.broadcast_to(np.asarray(init_std, dtype=np.float64), (ndim,)).copy()
+        self.covariance = np.diag(self.std**2)
+
+        self.best_x = None
+        self.best_fx = np.inf
+
+        self.previous_x = None
+        self.previous_y = None
+        self.previous_log_density = None
+
+    @property
+    def sigma(self):
+        """The largest standard deviation of the sampling distribution."""
+        if self.full_covariance:
+            return np.sqrt(np.max(np.diag(self.covariance)))
+        return np.max(self.std)
+
+    def ask(self):
+        """Sample the distribution.
+
+        Returns
+        -------
+        ndarray
+            The `(ndim, num_samples)` array of samples to evaluate.
+        """
+
+        if self.full_covariance:
+            self.covariance_factor = np.linalg.cholesky(self.covariance + self.min_std**2 * np.eye(self.ndim))
+        else:
+            self.covariance_factor = np.maximum(self.std, self.min_std)
+
+        noise = np.random.normal(size=[self.num_samples, self.ndim])
+        if self.full_covariance:
+            x = self.mean + noise.dot(self.covariance_factor.T)
+        else:
+            x = self.mean + noise * self.covariance_factor
+        np.clip(x, self.lower, self.upper, out=x)
+
+        return x.T
+
+    def tell(self, x, fx):
+        """Select the elites and refit the distribution.
+
+        Parameters
+        ----------
+        x : ndarray
+            The `(ndim, num_samples)` array returned by `ask`.
+        fx : ndarray
+            The values of the objective function at `x`.
+        """
+
+        x = np.asarray(x, dtype=np.float64).T
+        y = np.asarray(fx, dtype=np.float64)
+
+        if x.shape != (self.num_samples, self.ndim) or y.shape != (self.num_samples,):
+            raise ValueError("The batch doesn't match the last asked samples.")
+
+        num_samples, num_elites = self.num_samples, self.num_elites
+        mean, covariance_factor, full_covariance = self.mean, self.covariance_factor, self.full_covariance
+
+        best_index = y.argmin()
+        if y[best_index] < self.best_fx:
+            self.best_x = x[best_index].copy()
+            self.best_fx = y[best_index]
+
+        log_density = _gaussian_log_density(x, mean, covariance_factor, full_covariance)
+
+        # Candidates (and their importance weights) ####
+
+        if self.reuse_samples and self.previous_x is not None:
+            current_log_density_of_previous = _gaussian_log_density(self.previous_x, mean, covariance_factor, full_covariance)
+            candidates_x = np.concatenate([x, self.previous_x])
+            candidates_y = np.concatenate([y, self.previous_y])
+            log_weights = np.concatenate([np.zeros(num_samples),
+                                          np.minimum(current_log_density_of_previous - self.previous_log_density, 0.)])
+        else:
+            candidates_x = x
+            candidates_y = y
+            log_weights = np.zeros(num_samples)
+
+        # Select elites ################################
+
+        elite_indices = np.argpartition(candidates_y, num_elites - 1)[:num_elites]
+        elites = candidates_x[elite_indices]
+        weights = np.exp(log_weights[elite_indices] - log_weights[elite_indices].max())
+        weights /= weights.sum()
+
+        # Refit the distribution #######################
+
+        elite_mean = weights.dot(elites)
+        centered_elites = elites - elite_mean
+
+        self.mean = self.smoothing * elite_mean + (1. - self.smoothing) * mean
+
+        if full_covariance:
+            elite_covariance = (weights[:, np.newaxis] * centered_elites).T.dot(centered_elites)
+            self.covariance = self.smoothing * elite_covariance + (1. - self.smoothing) * self.covariance
+        else:
+            elite_std = np.sqrt(weights.dot(centered_elites**2))
+            self.std = self.smoothing * elite_std + (1. - self.smoothing) * self.std
+
+        self.previous_x = x
+        self.previous_y = y
+        self.previous_log_density = log_density
+
+    def minimize(self,
+                 objective_function,
+                 num_iterations=100,
+                 num_samples=100,
+                 num_elites=10,
+                 full_covariance=False,
+                 smoothing=0.7,
+                 reuse_samples=False,
+                 init_mean=None,
+                 init_std=None,
+                 min_std=1e-12,
+                 bounds=None,
+                 stopping_criteria=None,
+                 record_history=False,
+                 checkpoint=None,
+                 checkpoint_period=100):
+        """Minimize `objective_function` with the cross-entropy method.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize.
+        num_iterations : int
+            The number of iterations (the number of evaluations is
+            `num_samples * num_iterations`).
+        bounds : ndarray
+            The `(2, ndim)` array of lower (first row) and upper (second row)
+            bounds (default: `objective_function.bounds`).
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`). The `sigma` reported to
+            the criteria is the largest standard deviation of the
+            distribution.
+        record_history : bool
+            Keep the best point, the best value found, the mean and the
+            largest standard deviation of the distribution at each iteration
+            in the result history (keys `'x'`, `'fx'`, `'mean'` and
+            `'sigma'`).
+        checkpoint : str
+            The path of a checkpoint file (`.npz`). If set, the state of the
+            run is saved every `checkpoint_period` iterations (and at the end)
+            and, if the file already exists, the run is resumed from it (see
+            `ailib.optimize.minimizers.checkpoint`).
+        checkpoint_period : int
+            The number of iterations between two checkpoints.
+
+        The other parameters are described in `initialize`.
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization.
+        """
+
+        if bounds is None:
+            bounds = objective_function.bounds
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        self.initialize(bounds,
+                        num_samples=num_samples,
+                        num_elites=num_elites,
+                        full_covariance=full_covariance,
+                        smoothing=smoothing,
+                        reuse_samples=reuse_samples,
+                        init_mean=init_mean,
+                        init_std=init_std,
+                        min_std=min_std)
+
+        if checkpoint is not None:
+            restore_checkpoint(checkpoint, self, state)
+
+        with CheckpointWriter(checkpoint, checkpoint_period) as writer:
+            for iteration_index in range(state.nit, num_iterations):
+                x = self.ask()
+                self.tell(x, objective_function(x))
+
+                state.update(self.best_x, self.best_fx, sigma=self.sigma, mean=self.mean.copy())
+
+                writer.update(self, state)
+
+                if state.stop():
+                    break
+
+            writer.update(self, state, force=True)
+
+        return state.result(x=self.best_x, fx=self.best_fx)
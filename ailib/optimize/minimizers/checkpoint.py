@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Checkpoints of long-running minimizers.
+
+A checkpoint contains the internal state of an optimizer (population,
+strategy parameters, ...), the state of the run (counters, best point found,
+history) and the state of the numpy random number generator, so that a
+resumed run is bit-identical to an uninterrupted one.
+
+Checkpoints are `.npz` files written atomically (the data is written to a
+temporary file which then replaces the previous checkpoint), so that an
+interrupted write never corrupts the last valid checkpoint. The
+`CheckpointWriter` writes them in a background thread: the optimization loop
+only pays for a copy of the state.
+"""
+
+__all__ = ['save_checkpoint',
+           'load_checkpoint',
+           'make_checkpoint',
+           'restore_checkpoint',
+           'CheckpointWriter']
+
+import os
+import tempfile
+import threading
+import numpy as np
+
+
+def save_checkpoint(filename, checkpoint):
+    """Atomically write a checkpoint to a (compressed) `.npz` file.
+
+    Parameters
+    ----------
+    filename : str
+        The path of the checkpoint file.
+    checkpoint : dict
+        The checkpoint (a dictionary of numpy arrays or numbers).
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    file_descriptor, temporary_filename = tempfile.mkstemp(dir=directory, suffix='.npz.tmp')
+
+    try:
+        with os.fdopen(file_descriptor, 'wb') as fd:
+            np.savez_compressed(fd, **checkpoint)
+            fd.flush()
+            os.fsync(fd.fileno())
+        os.replace(temporary_filename, filename)
+    except BaseException:
+        os.remove(temporary_filename)
+        raise
+
+
+def load_checkpoint(filename):
+    """Read a checkpoint written by `save_checkpoint`.
+
+    Parameters
+    ----------
+    filename : str
+        The path of the checkpoint file.
+
+    Returns
+    -------
+    dict
+        The checkpoint (a dictionary of numpy arrays).
+    """
+    with np.load(filename) as data:
+        return {key: data[key] for key in data.files}
+
+
+def _prefixed(prefix, state):
+    return {prefix + key: value for key, value in state.items()}
+
+
+def _unprefixed(prefix, checkpoint):
+    return {key[len(prefix):]: value for key, value in checkpoint.items() if key.startswith(prefix)}
+
+
+def make_checkpoint(optimizer, state):
+    """Make a checkpoint of a run.
+
+    Parameters
+    ----------
+    optimizer : Optimizer
+        The optimizer (it should have a `get_state` method).
+    state : OptimizationState
+        The state of the run.
+
+    Returns
+    -------
+    dict
+        The checkpoint (a dictionary of numpy arrays or numbers).
+    """
+    rng_name, rng_keys, rng_pos, rng_has_gauss, rng_cached_gaussian = np.random.get_state()
+
+    checkpoint = _prefixed('optimizer.', optimizer.get_state())
+    checkpoint.update(_prefixed('state.', state.get_state()))
+    checkpoint.update({'rng.name': rng_name,
+                       'rng.keys': rng_keys,
+                       'rng.pos': rng_pos,
+                       'rng.has_gauss': rng_has_gauss,
+                       'rng.cached_gaussian': rng_cached_gaussian})
+
+    return checkpoint
+
+
+def restore_checkpoint(filename, optimizer, state):
+    """Restore a run from a checkpoint file (if it exists).
+
+    The optimizer should have been initialized (with `initialize`) with the
+    same settings as the checkpointed run.
+
+    Parameters
+    ----------
+    filename : str
+        The path of the checkpoint file.
+    optimizer : Optimizer
+        The optimizer to restore.
+    state : OptimizationState
+        The state of the run to restore.
+
+    Returns
+    -------
+    bool
+        `True` if the run has been restored, `False` if there is no
+        checkpoint file.
+    """
+    if not os.path.exists(filename):
+        return False
+
+    checkpoint = load_checkpoint(filename)
+
+    optimizer.set_state(_unprefixed('optimizer.', checkpoint))
+    state.set_state(_unprefixed('state.', checkpoint))
+    np.random.set_state((str(checkpoint['rng.name']),
+                         checkpoint['rng.keys'],
+                         int(checkpoint['rng.pos']),
+                         int(checkpoint['rng.has_gauss']),
+                         float(checkpoint['rng.cached_gaussian'])))
+
+    return True
+
+
+class CheckpointWriter:
+    """Periodically write checkpoints of a run in a background thread.
+
+    Only the last checkpoint made is written: if the thread is still busy
+    writing a checkpoint when a new one is made, the pending (older) one is
+    dropped. The writer is a context manager: the pending checkpoint is
+    written when the block is left (even on an exception)::
+
+        with CheckpointWriter(filename, period) as writer:
+            for iteration_index in range(state.nit, num_iterations):
+                ...
+                state.update(...)
+                writer.update(optimizer, state)
+
+    Parameters
+    ----------
+    filename : str
+        The path of the checkpoint file. If `None`, the writer does nothing.
+    period : int
+        The number of iterations (or generations) between two checkpoints.
+    """
+
+    def __init__(self, filename, period=100):
+        self.filename = filename
+        self.period = period
+
+        self._condition = threading.Condition()
+        self._pending_checkpoint = None
+        self._closed = False
+        self._error = None
+
+        if filename is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        else:
+            self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def update(self, optimizer, state, force=False):
+        """Make a checkpoint if `state.nit` is a multiple of `period` (or if `force` is set).
+
+        Parameters
+        ----------
+        optimizer : Optimizer
+            The optimizer.
+        state : OptimizationState
+            The state of the run.
+        force : bool
+            Make a checkpoint whatever the iteration.
+        """
+        if self.filename is None:
+            return
+
+        if force or (state.nit % self.period == 0):
+            checkpoint = make_checkpoint(optimizer, state)
+            with self._condition:
+                self._pending_checkpoint = checkpoint
+                self._condition.notify()
+
+    def close(self):
+        """Write the pending checkpoint (if any) and stop the thread."""
+        if self._thread is None:
+            return
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending_checkpoint is None and not self._closed:
+                    self._condition.wait()
+                if self._pending_checkpoint is None:
+                    return
+                checkpoint, self._pending_checkpoint = self._pending_checkpoint, None
+
+            try:
+                save_checkpoint(self.filename, checkpoint)
+            except Exception as e:
+                self._error = e
@@ -21,12 +21,6 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-import cvxopt
-import cvxopt.solvers
-
-# Or:
-# from cvxopt import matrix, solvers
-
 import numpy as np
 import numbers
 
@@ -37,6 +31,8 @@ if __name__ == '__main__':
     import optimizer
 else:
     from . import optimizer
+    from .simplex import LinearProgram
+    from ...utils.grid import evaluate_grid
 
 class Optimizer(optimizer.Optimizer):
     """
@@ -53,6 +49,8 @@ class Optimizer(optimizer.Optimizer):
         """
         TODO
         """
+        self._cuts_lp = None
+
         if parallel is None:
             x = self.optimize_std(objective_function, num_iterations)
         elif parallel == "linear":
@@ -460,37 +458,30 @@ class Optimizer(optimizer.Optimizer):
         orig_array = np.zeros(dimension_of_each_point)
         np_b = np.array([-cut(orig_array) for cut in cut_list])
 
-        # Domain constraints
-        if domain_min is not None or domain_max is not None:
-            # max
-            max_const_A = np.concatenate((np.eye(dimension_of_each_point), np.zeros(dimension_of_each_point).reshape([-1, 1])), 1)
-            np_A = np.concatenate((np_A, max_const_A), 0)
-            np_b = np.concatenate((np_b, domain_max), 1)
-
-            # min
-            min_const_A = np.concatenate((-1. * np.eye(dimension_of_each_point), np.zeros(dimension_of_each_point).reshape([-1, 1])), 1)
-            np_A = np.concatenate((np_A, min_const_A), 0)
-            np_b = np.concatenate((np_b, -1. * domain_min), 1)
-
-        print("np_c =", np_c)
-        print("np_A =", np_A)
-        print("np_b =", np_b)
+        # The LP is kept between calls: only the new cuts are added and the
+        # previous optimal basis is the starting point of the dual simplex
+        # (see simplex.py)
+        if getattr(self, '_cuts_lp', None) is None or self._cuts_lp.num_constraints > number_of_points:
+            # Domain constraints are the bounds of the variables (the last variable is free)
+            if domain_min is not None:
+                bounds = [(low, high) for (low, high) in zip(domain_min, domain_max)] + [(None, None)]
+            else:
+                bounds = [(None, None)] * number_of_variables
 
-        # Convert numpy arrays to cvxopt matrices
-        c = cvxopt.matrix(np_c)
-        A = cvxopt.matrix(np_A)
-        b = cvxopt.matrix(np_b)
+            self._cuts_lp = LinearProgram(np_c, bounds=bounds)
 
-        print("c =", c)
-        print("A =", A)
-        print("b =", b)
+        num_new_cuts = number_of_points - self._cuts_lp.num_constraints
+        if num_new_cuts > 0:
+            self._cuts_lp.add_constraints(np_A[-num_new_cuts:], np_b[-num_new_cuts:])
 
         # Optimize...
-        sol = cvxopt.solvers.lp(c, A, b)
+        sol = self._cuts_lp.solve()
+
+        if not sol.success:
+            warnings.warn("Minimum of cuts: " + sol.message)
 
-        # Get and return the solution
-        xstar = sol['x']
-        np_xstar = np.array(xstar)
+        # Get and return the solution (a column vector)
+        np_xstar = sol.x.reshape([-1, 1])
 
         return np_xstar
 
@@ -643,21 +634,12 @@ class Optimizer(optimizer.Optimizer):
                     x2max = objective_function.domain_max[1]
                     assert x2min < x2max
 
-                    x1step = (x1max - x1min) / 200.
-                    x2step = (x2max - x2min) / 200.
-
-                    range_x1 = np.arange(x1min, x1max, x1step)
-                    range_x2 = np.arange(x2min, x2max, x2step)
-
-                    mesh_x1,mesh_x2 = np.meshgrid(range_x1, range_x2)
-
-                    # TODO: take advantage of meshgrid, for now, it's not optimized at
-                    #       all and not very well written
-                    z = np.zeros(mesh_x1.shape)         
-                    for x1i in range(z.shape[0]):
-                        for x2i in range(z.shape[1]):
-                            point = np.array([mesh_x1[x1i, x2i], mesh_x2[x1i, x2i]])
-                            z[x1i, x2i] = objective_function(point)
+                    mesh_x1, mesh_x2, z = evaluate_grid(objective_function,
+                                                        objective_function.domain_min,
+                                                        objective_function.domain_max,
+                                                        num_points=200,
+                                                        layout="rows",
+                                                        cache=True)     # One plot per iteration
 
                     # Contours and labels
                     levels = y
@@ -760,21 +742,12 @@ class Optimizer(optimizer.Optimizer):
                     x2max = objective_function.domain_max[1]
                     assert x2min < x2max
 
-                    x1step = (x1max - x1min) / 200.
-                    x2step = (x2max - x2min) / 200.
-
-                    range_x1 = np.arange(x1min, x1max, x1step)
-                    range_x2 = np.arange(x2min, x2max, x2step)
-
-                    mesh_x1,mesh_x2 = np.meshgrid(range_x1, range_x2)
-
-                    # TODO: take advantage of meshgrid, for now, it's not optimized at
-                    #       all and not very well written
-                    z = np.zeros(mesh_x1.shape)         
-                    for x1i in range(z.shape[0]):
-                        for x2i in range(z.shape[1]):
-                            point = np.array([mesh_x1[x1i, x2i], mesh_x2[x1i, x2i]])
-                            z[x1i, x2i] = objective_function(point)
+                    mesh_x1, mesh_x2, z = evaluate_grid(objective_function,
+                                                        objective_function.domain_min,
+                                                        objective_function.domain_max,
+                                                        num_points=200,
+                                                        layout="rows",
+                                                        cache=True)     # One plot per iteration
 
                     # PLOT
                     ax.plot_surface(mesh_x1, mesh_x2, z, rstride=5, cstride=5, linewidth=0.2, alpha=0.2)
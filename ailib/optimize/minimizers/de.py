@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__all__ = ['DifferentialEvolution']
+
+import numpy as np
+
+from .optimizer import Optimizer
+from .stopping import OptimizationState
+from .checkpoint import CheckpointWriter, restore_checkpoint
+
+
+def _sample_distinct_indices(num_choices, forbidden_indices_list):
+    """Draw one random index per row, distinct from the forbidden indices of this row.
+
+    Indices are drawn for all rows at once; rows having a conflict are
+    redrawn until there is none (which only takes a few passes when
+    `num_choices` is large compared to the number of forbidden indices).
+
+    Parameters
+    ----------
+    num_choices : int
+        Indices are drawn in `range(num_choices)`.
+    forbidden_indices_list : list of ndarray
+        The indices (one 1D array of size `num_rows` per forbidden index)
+        that cannot be drawn.
+
+    Returns
+    -------
+    ndarray
+        The 1D array of drawn indices.
+    """
+    num_rows = forbidden_indices_list[0].shape[0]
+    indices = np.random.randint(num_choices, size=num_rows)
+    conflict = np.any([indices == forbidden for forbidden in forbidden_indices_list], axis=0)
+
+    while np.any(conflict):
+        indices[conflict] = np.random.randint(num_choices, size=np.count_nonzero(conflict))
+        conflict = np.any([indices == forbidden for forbidden in forbidden_indices_list], axis=0)
+
+    return indices
+
+
+class DifferentialEvolution(Optimizer):
+    r"""Differential evolution optimizer.
+
+    For each individual :math:`\boldsymbol{x}_i` of the population, a mutant
+    vector :math:`\boldsymbol{v}_i` is made from the difference of other
+    individuals, then a trial vector is made by binomial crossover between
+    :math:`\boldsymbol{x}_i` and :math:`\boldsymbol{v}_i`; the trial vector
+    replaces :math:`\boldsymbol{x}_i` if it is not worse.
+
+    Available mutation strategies:
+
+    * `'rand/1/bin'`: :math:`\boldsymbol{v}_i = \boldsymbol{x}_{r_1} + F (\boldsymbol{x}_{r_2} - \boldsymbol{x}_{r_3})` ;
+    * `'best/1/bin'`: :math:`\boldsymbol{v}_i = \boldsymbol{x}_{best} + F (\boldsymbol{x}_{r_1} - \boldsymbol{x}_{r_2})` ;
+    * `'current-to-pbest/1/bin'`: :math:`\boldsymbol{v}_i = \boldsymbol{x}_i + F_i (\boldsymbol{x}_{pbest} - \boldsymbol{x}_i) + F_i (\boldsymbol{x}_{r_1} - \tilde{\boldsymbol{x}}_{r_2})`
+      where :math:`\boldsymbol{x}_{pbest}` is randomly chosen among the
+      `p_best` best individuals and :math:`\tilde{\boldsymbol{x}}_{r_2}` is
+      drawn from the population and an archive of replaced parents.
+      :math:`F_i` and :math:`CR_i` are adapted with the success history
+      based scheme of SHADE: each generation with successful trial vectors
+      overwrites one of the `memory_size` slots with their weighted means
+      (JADE would instead smooth a single mean with a learning rate).
+
+    The mutant and trial vectors of the whole population are made with
+    vectorized index sampling and the trial vectors are evaluated with a
+    single (batched) call to the objective function per generation.
+
+    The optimizer can also be driven step by step with the ask/tell
+    interface: `initialize` makes the initial population, `ask` returns the
+    `(ndim, pop_size)` array of vectors to evaluate (the initial population
+    first, then the trial vectors of each generation) and `tell` gives their
+    values back to the optimizer.
+
+    See:
+    * https://en.wikipedia.org/wiki/Differential_evolution
+    * R. Storn and K. Price, "Differential evolution - a simple and efficient
+      heuristic for global optimization over continuous spaces", Journal of
+      Global Optimization 11, 341-359 (1997).
+    * J. Zhang and A. C. Sanderson, "JADE: adaptive differential evolution
+      with optional external archive", IEEE Trans. Evol. Comput. 13(5),
+      945-958 (2009).
+    * R. Tanabe and A. Fukunaga, "Success-history based parameter adaptation
+      for differential evolution", IEEE CEC 2013 (SHADE).
+
+    Examples
+    --------
+    >>> from ailib.optimize.functions.unconstrained import Rosenbrock
+    >>> np.random.seed(0)
+    >>> res = DifferentialEvolution().minimize(Rosenbrock(2), num_gen=200)
+    >>> np.round(res.x, 6), res.nfev
+    (array([1., 1.]), 10050)
+
+    With the adaptive `'current-to-pbest/1/bin'` strategy:
+
+    >>> np.random.seed(0)
+    >>> res = DifferentialEvolution().minimize(Rosenbrock(2), num_gen=200, strategy='current-to-pbest/1/bin')
+    >>> np.round(res.x, 6), bool(res.fx < 1e-12)
+    (array([1., 1.]), True)
+    """
+
+    optimizer_name = "differential evolution"
+
+    _checkpoint_attributes = ('pop', 'pop_y', 'memory_F', 'memory_CR', 'memory_index', 'archive')
+
+    def initialize(self,
+                   bounds,
+                   pop_size=50,
+                   strategy='rand/1/bin',
+                   F=0.5,
+                   CR=0.9,
+                   p_best=0.1,
+                   memory_size=5,
+                   use_archive=True):
+        """Initialize the population (ask/tell interface).
+
+        Parameters
+        ----------
+        bounds : ndarray
+            The `(2, ndim)` array of lower (first row) and upper (second row)
+            bounds. The initial population is drawn within the bounds and
+            trial vectors are kept inside.
+        pop_size : int
+            The population size.
+        strategy : str
+            The mutation strategy: `'rand/1/bin'`, `'best/1/bin'` or
+            `'current-to-pbest/1/bin'`.
+        F : float
+            The differential weight (the initial mean of the adapted `F` for
+            `'current-to-pbest/1/bin'`).
+        CR : float
+            The crossover probability (the initial mean of the adapted `CR`
+            for `'current-to-pbest/1/bin'`).
+        p_best : float
+            The fraction of the population the `pbest` individual is drawn
+            from (`'current-to-pbest/1/bin'` only).
+        memory_size : int
+            The number of slots of the success history memory of `F` and `CR`
+            (`'current-to-pbest/1/bin'` only).
+        use_archive : bool
+            Use an archive of replaced parents (`'current-to-pbest/1/bin'`
+            only).
+        """
+
+        if strategy not in ('rand/1/bin', 'best/1/bin', 'current-to-pbest/1/bin'):
+            raise ValueError("Unknown strategy {}.".format(strategy))
+
+        num_required_individuals = 4 if strategy == 'rand/1/bin' else 3
+
+        if pop_size < num_required_individuals:
+            raise ValueError("The {} strategy requires at least {} individuals.".format(strategy, num_required_individuals))
+
+        self.lower = np.asarray(bounds[0], dtype=np.float64)
+        self.upper = np.asarray(bounds[1], dtype=np.float64)
+        self.ndim = self.lower.shape[0]
+
+        self.pop_size = pop_size
+        self.strategy = strategy
+        self.adaptive = (strategy == 'current-to-pbest/1/bin')
+        self.F = F
+        self.CR = CR
+        self.use_archive = use_archive
+
+        self.pop = np.random.uniform(self.lower, self.upper, size=[pop_size, self.ndim])
+        self.pop_y = None
+
+        if self.adaptive:
+            self.memory_F = np.full(memory_size, F)
+            self.memory_CR = np.full(memory_size, CR)
+            self.memory_index = 0
+            self.archive = np.zeros([0, self.ndim])
+            self.num_pbest = max(2, int(round(p_best * pop_size)))
+
+    @property
+    def best_x(self):
+        """The best individual of the population."""
+        return self.pop[self.pop_y.argmin()].copy()
+
+    @property
+    def best_fx(self):
+        """The value of the best individual of the population."""
+        return self.pop_y.min()
+
+    def ask(self):
+        """Make the trial vectors of the next generation.
+
+        Returns
+        -------
+        ndarray
+            The `(ndim, pop_size)` array of vectors to evaluate (the initial
+            population on the first call).
+        """
+
+        if self.pop_y is None:
+            return self.pop.T.copy()
+
+        pop, pop_y = self.pop, self.pop_y
+        pop_size, ndim = self.pop_size, self.ndim
+        lower, upper = self.lower, self.upper
+        all_indices = np.arange(pop_size)
+
+        # Control parameters ###########################
+
+        if self.adaptive:
+            memory_F, memory_CR = self.memory_F, self.memory_CR
+            slots = np.random.randint(memory_F.shape[0], size=pop_size)
+
+            CR_array = np.clip(np.random.normal(memory_CR[slots], 0.1), 0., 1.)
+
+            # F is drawn from a Cauchy distribution (redrawn while <= 0)
+            F_array = memory_F[slots] + 0.1 * np.random.standard_cauchy(size=pop_size)
+            while np.any(F_array <= 0.):
+                non_positive = F_array <= 0.
+                F_array[non_positive] = memory_F[slots[non_positive]] + 0.1 * np.random.standard_cauchy(size=np.count_nonzero(non_positive))
+            F_array = np.minimum(F_array, 1.)
+        else:
+            CR_array = np.full(pop_size, self.CR)
+            F_array = np.full(pop_size, self.F)
+
+        F_column = F_array[:, np.newaxis]
+
+        # Mutation #####################################
+
+        r1 = _sample_distinct_indices(pop_size, [all_indices])
+
+        if self.strategy == 'rand/1/bin':
+            r2 = _sample_distinct_indices(pop_size, [all_indices, r1])
+            r3 = _sample_distinct_indices(pop_size, [all_indices, r1, r2])
+            mutants = pop[r1] + F_column * (pop[r2] - pop[r3])
+
+        elif self.strategy == 'best/1/bin':
+            r2 = _sample_distinct_indices(pop_size, [all_indices, r1])
+            mutants = pop[pop_y.argmin()] + F_column * (pop[r1] - pop[r2])
+
+        else:
+            num_pbest = self.num_pbest
+            pbest_indices = np.argpartition(pop_y, num_pbest - 1)[:num_pbest]
+            pbest = pbest_indices[np.random.randint(num_pbest, size=pop_size)]
+            pop_and_archive = np.concatenate([pop, self.archive]) if self.use_archive else pop
+            r2 = _sample_distinct_indices(pop_and_archive.shape[0], [all_indices, r1])
+            mutants = pop + F_column * (pop[pbest] - pop) + F_column * (pop[r1] - pop_and_archive[r2])
+
+        # Binomial crossover ###########################
+
+        crossover_mask = np.random.uniform(size=[pop_size, ndim]) < CR_array[:, np.newaxis]
+        crossover_mask[all_indices, np.random.randint(ndim, size=pop_size)] = True
+        trials = np.where(crossover_mask, mutants, pop)
+
+        # Bounds: move back halfway between the parent and the violated bound
+        trials = np.where(trials < lower, (lower + pop) / 2., trials)
+        trials = np.where(trials > upper, (upper + pop) / 2., trials)
+
+        # Keep the control parameters for the adaptation in `tell`
+        self.F_array = F_array
+        self.CR_array = CR_array
+
+        return trials.T.copy()
+
+    def tell(self, x, fx):
+        """Select the individuals of the next generation.
+
+        Parameters
+        ----------
+        x : ndarray
+            The `(ndim, pop_size)` array returned by `ask`.
+        fx : ndarray
+            The values of the objective function at `x`.
+        """
+
+        trials = np.asarray(x, dtype=np.float64).T
+        trials_y = np.asarray(fx, dtype=np.float64)
+
+        if trials.shape != (self.pop_size, self.ndim) or trials_y.shape != (self.pop_size,):
+            raise ValueError("The batch doesn't match the last asked vectors.")
+
+        if self.pop_y is None:
+            self.pop = trials.copy()
+            self.pop_y = trials_y.copy()
+            return
+
+        pop, pop_y = self.pop, self.pop_y
+
+        improved = trials_y <= pop_y
+
+        if self.adaptive:
+            strictly_improved = trials_y < pop_y
+
+            if self.use_archive:
+                self.archive = np.concatenate([self.archive, pop[strictly_improved]])
+                if self.archive.shape[0] > self.pop_size:
+                    self.archive = self.archive[np.random.choice(self.archive.shape[0], self.pop_size, replace=False)]
+
+            if np.any(strictly_improved):
+                weights = pop_y[strictly_improved] - trials_y[strictly_improved]
+                weights /= weights.sum()
+                successful_F = self.F_array[strictly_improved]
+                successful_CR = self.CR_array[strictly_improved]
+                self.memory_CR[self.memory_index] = np.sum(weights * successful_CR)
+                self.memory_F[self.memory_index] = np.sum(weights * successful_F**2) / np.sum(weights * successful_F)
+                self.memory_index = (self.memory_index + 1) % self.memory_F.shape[0]
+
+        pop[improved] = trials[improved]
+        pop_y[improved] = trials_y[improved]
+
+    def minimize(self,
+                 objective_function,
+                 num_gen=100,
+                 pop_size=50,
+                 strategy='rand/1/bin',
+                 F=0.5,
+                 CR=0.9,
+                 p_best=0.1,
+                 memory_size=5,
+                 use_archive=True,
+                 bounds=None,
+                 stopping_criteria=None,
+                 record_history=False,
+                 checkpoint=None,
+                 checkpoint_period=100):
+        """Minimize `objective_function` with a differential evolution.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize.
+        num_gen : int
+            The number of generations (the number of evaluations is
+            `pop_size * (num_gen + 1)`).
+        bounds : ndarray
+            The `(2, ndim)` array of lower (first row) and upper (second row)
+            bounds (default: `objective_function.bounds`).
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`).
+        record_history : bool
+            Keep the best point and the best value found at each generation
+            in the result history (keys `'x'` and `'fx'`).
+        checkpoint : str
+            The path of a checkpoint file (`.npz`). If set, the state of the
+            run is saved every `checkpoint_period` generations (and at the end)
+            and, if the file already exists, the run is resumed from it (see
+            `ailib.optimize.minimizers.checkpoint`).
+        checkpoint_period : int
+            The number of generations between two checkpoints.
+
+        The other parameters are described in `initialize`.
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization.
+        """
+
+        if bounds is None:
+            bounds = objective_function.bounds
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        self.initialize(bounds,
+                        pop_size=pop_size,
+                        strategy=strategy,
+                        F=F,
+                        CR=CR,
+                        p_best=p_best,
+                        memory_size=memory_size,
+                        use_archive=use_archive)
+
+        if (checkpoint is None) or not restore_checkpoint(checkpoint, self, state):
+            # Evaluate the initial population
+            x = self.ask()
+            self.tell(x, objective_function(x))
+
+        with CheckpointWriter(checkpoint, checkpoint_period) as writer:
+            for gen in range(state.nit, num_gen):
+                x = self.ask()
+                self.tell(x, objective_function(x))
+
+                state.update(self.best_x, self.best_fx)
+
+                writer.update(self, state)
+
+                if state.stop():
+                    break
+
+            writer.update(self, state, force=True)
+
+        return state.result(x=self.best_x, fx=self.best_fx)
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+r"""
+Genetic algorithm for binary problems.
+
+Genomes are stored bit-packed: the population is a `(pop_size, num_words)`
+array of `uint64` words (bit `i` of a genome is bit `i % 64` of its word
+`i // 64`; the padding bits of the last word are zero). Compared to an array
+of booleans, this uses 8 times less memory (64 times less than a list of
+Python integers) and the variation operators process 64 genes per machine
+operation:
+
+* crossover (uniform, one-point or two-point) selects the bits of the
+  parents with word masks: `child = (a & mask) | (b & ~mask)`;
+* mutation XORs the population with a sparse mask of flipped bits;
+* tournament selection is vectorized over the whole population.
+
+The objective function receives the genomes unpacked as a `(num_bits, n)`
+boolean array (like other objective functions) or, with
+`packed_genomes=True`, as the `(n, num_words)` array of words (see
+`unpack_bits` and `popcount`).
+
+See:
+* https://en.wikipedia.org/wiki/Genetic_algorithm
+* D. E. Goldberg, *Genetic Algorithms in Search, Optimization and Machine
+  Learning*, Addison-Wesley (1989).
+"""
+
+__all__ = ['pack_bits',
+           'unpack_bits',
+           'popcount',
+           'GeneticAlgorithm']
+
+import numpy as np
+
+from .optimizer import Optimizer
+from .stopping import OptimizationState
+from .checkpoint import CheckpointWriter, restore_checkpoint
+
+_WORD_DTYPE = np.dtype('<u8')
+_ALL_ONES = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+# The number of set bits of each byte value
+_POPCOUNT_TABLE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1).sum(axis=1).astype(np.int64)
+
+# Each byte value with its bits in reverse order: `np.packbits` and
+# `np.unpackbits` are big-endian within bytes (the `bitorder` argument needs
+# numpy >= 1.17) while bit `i` of a genome is bit `i % 8` of its byte
+_REVERSED_BYTES = np.packbits(np.unpackbits(np.arange(256, dtype=np.uint8)[:, np.newaxis], axis=1)[:, ::-1], axis=1).ravel()
+
+
+def pack_bits(bits):
+    """Pack boolean genomes into `uint64` words.
+
+    Parameters
+    ----------
+    bits : array_like
+        The `(n, num_bits)` boolean array of genomes (one genome per row).
+
+    Returns
+    -------
+    ndarray
+        The `(n, ceil(num_bits / 64))` array of words.
+
+    Examples
+    --------
+    >>> pack_bits([[1, 0, 1], [0, 0, 0]])
+    array([[5],
+           [0]], dtype=uint64)
+    """
+    bits = np.asarray(bits, dtype=bool)
+    num_genomes, num_bits = bits.shape
+    num_words = -(-num_bits // 64)
+
+    packed_bytes = np.zeros([num_genomes, num_words * 8], dtype=np.uint8)
+    packed_bytes[:, :-(-num_bits // 8)] = _REVERSED_BYTES[np.packbits(bits, axis=1)]
+
+    return packed_bytes.view(_WORD_DTYPE).astype(np.uint64)
+
+
+def unpack_bits(words, num_bits):
+    """Unpack `uint64` words into boolean genomes (the inverse of `pack_bits`).
+
+    Parameters
+    ----------
+    words : ndarray
+        The `(n, num_words)` array of words.
+    num_bits : int
+        The number of bits of each genome.
+
+    Returns
+    -------
+    ndarray
+        The `(n, num_bits)` boolean array of genomes.
+    """
+    packed_bytes = np.ascontiguousarray(words, dtype=_WORD_DTYPE).view(np.uint8)
+    return np.unpackbits(_REVERSED_BYTES[packed_bytes], axis=1)[:, :num_bits].astype(bool)
+
+
+def popcount(words):
+    """The number of set bits of each packed genome.
+
+    Parameters
+    ----------
+    words : ndarray
+        The `(n, num_words)` array of words.
+
+    Returns
+    -------
+    ndarray
+        The `n` numbers of set bits.
+
+    Examples
+    --------
+    >>> popcount(pack_bits([[1, 0, 1], [1, 1, 1]]))
+    array([2, 3])
+    """
+    packed_bytes = np.ascontiguousarray(words, dtype=_WORD_DTYPE).view(np.uint8)
+    return _POPCOUNT_TABLE[packed_bytes].sum(axis=1)
+
+
+def _prefix_masks(points, num_words):
+    """The word masks of the bits lower than `points` (one mask per row)."""
+    num_prefix_bits = np.clip(points[:, np.newaxis] - 64 * np.arange(num_words), 0, 64)
+    shift = np.minimum(num_prefix_bits, 63).astype(np.uint64)
+    masks = (np.uint64(1) << shift) - np.uint64(1)
+    return np.where(num_prefix_bits >= 64, _ALL_ONES, masks)
+
+
+class GeneticAlgorithm(Optimizer):
+    """Genetic algorithm with bit-packed binary genomes.
+
+    Each generation, `pop_size - num_elites` offspring are made by tournament
+    selection, crossover (applied to each pair of parents with probability
+    `crossover_probability`) and bit-flip mutation; they replace the
+    population except its `num_elites` best individuals.
+
+    The optimizer can also be driven step by step with the ask/tell
+    interface: `initialize` makes the initial population, `ask` returns the
+    genomes to evaluate (the initial population first, then the offspring of
+    each generation) and `tell` gives their values back to the optimizer.
+    """
+
+    optimizer_name = "genetic algorithm"
+
+    _checkpoint_attributes = ('pop', 'pop_fx', 'offspring')
+
+    def initialize(self,
+                   num_bits,
+                   pop_size=100,
+                   crossover='uniform',
+                   crossover_probability=0.9,
+                   mutation_probability=None,
+                   tournament_size=2,
+                   num_elites=1,
+                   init_probability=0.5,
+                   packed_genomes=False):
+        """Initialize the population (ask/tell interface).
+
+        Parameters
+        ----------
+        num_bits : int
+            The number of bits of the genomes.
+        pop_size : int
+            The population size.
+        crossover : str
+            `'uniform'`, `'one_point'` or `'two_point'`.
+        crossover_probability : float
+            The probability to apply the crossover to a pair of parents.
+        mutation_probability : float
+            The probability to flip each bit (default: `1/num_bits`).
+        tournament_size : int
+            The number of individuals competing in each tournament.
+        num_elites : int
+            The number of best individuals kept from one generation to the
+            next.
+        init_probability : float
+            The probability of each bit of the initial genomes to be set.
+        packed_genomes : bool
+            Exchange genomes as `(n, num_words)` arrays of `uint64` words
+            instead of `(num_bits, n)` boolean arrays in `ask` (and in
+            `minimize`, with the objective function).
+        """
+
+        if crossover not in ('uniform', 'one_point', 'two_point'):
+            raise ValueError("Unknown crossover {}.".format(crossover))
+
+        if not 0 <= num_elites < pop_size:
+            raise ValueError("num_elites must be in [0, pop_size).")
+
+        self.num_bits = num_bits
+        self.num_words = -(-num_bits // 64)
+        self.pop_size = pop_size
+        self.crossover = crossover
+        self.crossover_probability = crossover_probability
+        self.mutation_probability = 1. / num_bits if mutation_probability is None else mutation_probability
+        self.tournament_size = tournament_size
+        self.num_elites = num_elites
+        self.packed_genomes = packed_genomes
+
+        self.pop = pack_bits(np.random.uniform(size=[pop_size, num_bits]) < init_probability)
+        self.pop_fx = None
+        self.offspring = self.pop
+
+    @property
+    def best_x(self):
+        """The genome of the best individual (a 1D boolean array)."""
+        return unpack_bits(self.pop[np.argmin(self.pop_fx)][np.newaxis, :], self.num_bits)[0]
+
+    @property
+    def best_fx(self):
+        """The value of the best individual."""
+        return self.pop_fx.min()
+
+    def _export(self, words):
+        if self.packed_genomes:
+            return words.copy()
+        return unpack_bits(words, self.num_bits).T
+
+    def _tournament(self, num_winners):
+        candidates = np.random.randint(self.pop_size, size=[self.tournament_size, num_winners])
+        winners = np.argmin(self.pop_fx[candidates], axis=0)
+        return candidates[winners, np.arange(num_winners)]
+
+    def _crossover_masks(self, num_pairs):
+        if self.crossover == 'uniform':
+            masks = np.random.randint(0, 2**64, size=[num_pairs, self.num_words], dtype=np.uint64)
+        elif self.crossover == 'one_point':
+            masks = _prefix_masks(np.random.randint(1, self.num_bits, size=num_pairs), self.num_words)
+        else:
+            points = np.sort(np.random.randint(1, self.num_bits, size=[num_pairs, 2]), axis=1)
+            masks = _prefix_masks(points[:, 0], self.num_words) ^ _prefix_masks(points[:, 1], self.num_words)
+
+        # Pairs that are not crossed are copied
+        crossed = np.random.uniform(size=num_pairs) < self.crossover_probability
+        return np.where(crossed[:, np.newaxis], masks, _ALL_ONES)
+
+    def _mutation_masks(self, num_genomes):
+        # Flipped bits are drawn as positions in the concatenated genomes
+        num_flips = np.random.binomial(num_genomes * self.num_bits, self.mutation_probability)
+        positions = np.random.randint(num_genomes * self.num_bits, size=num_flips)
+        rows, bits = np.divmod(positions, self.num_bits)
+
+        masks = np.zeros([num_genomes, self.num_words], dtype=np.uint64)
+        np.bitwise_or.at(masks, (rows, bits // 64), np.uint64(1) << (bits % 64).astype(np.uint64))
+        return masks
+
+    def ask(self):
+        """Make the offspring of the next generation.
+
+        Returns
+        -------
+        ndarray
+            The genomes to evaluate (the initial population on the first
+            call): a `(num_bits, n)` boolean array, or a `(n, num_words)`
+            array of words if `packed_genomes` is set.
+        """
+
+        if self.pop_fx is None:
+            return self._export(self.pop)
+
+        num_offspring = self.pop_size - self.num_elites
+        num_pairs = -(-num_offspring // 2)
+
+        parents_1 = self.pop[self._tournament(num_pairs)]
+        parents_2 = self.pop[self._tournament(num_pairs)]
+
+        masks = self._crossover_masks(num_pairs)
+        offspring = np.concatenate([(parents_1 & masks) | (parents_2 & ~masks),
+                                    (parents_2 & masks) | (parents_1 & ~masks)])[:num_offspring]
+
+        offspring ^= self._mutation_masks(num_offspring)
+
+        self.offspring = offspring
+
+        return self._export(offspring)
+
+    def tell(self, x, fx):
+        """Select the individuals of the next generation.
+
+        Parameters
+        ----------
+        x : ndarray
+            The genomes returned by `ask` (boolean or packed).
+        fx : ndarray
+            The values of the objective function for these genomes.
+        """
+
+        x = np.asarray(x)
+        y = np.asarray(fx, dtype=np.float64)
+
+        words = x.copy() if x.dtype == np.uint64 else pack_bits(x.T)
+
+        if words.shape != self.offspring.shape or y.shape != (words.shape[0],):
+            raise ValueError("The batch doesn't match the last asked genomes.")
+
+        if self.pop_fx is None:
+            self.pop = words
+            self.pop_fx = y.copy()
+            return
+
+        elites = np.argsort(self.pop_fx, kind='stable')[:self.num_elites]
+
+        self.pop = np.concatenate([self.pop[elites], words])
+        self.pop_fx = np.concatenate([self.pop_fx[elites], y])
+        self.offspring = self.pop
+
+    def minimize(self,
+                 objective_function,
+                 num_gen=100,
+                 num_bits=None,
+                 pop_size=100,
+                 crossover='uniform',
+                 crossover_probability=0.9,
+                 mutation_probability=None,
+                 tournament_size=2,
+                 num_elites=1,
+                 init_probability=0.5,
+                 packed_genomes=False,
+                 stopping_criteria=None,
+                 record_history=False,
+                 checkpoint=None,
+                 checkpoint_period=100):
+        """Minimize `objective_function` with a genetic algorithm.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize: it takes a batch of genomes (see
+            `packed_genomes`) and returns their values.
+        num_gen : int
+            The number of generations.
+        num_bits : int
+            The number of bits of the genomes (default:
+            `objective_function.ndim`).
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`).
+        record_history : bool
+            Keep the best genome and the best value found at each generation
+            in the result history (keys `'x'` and `'fx'`).
+        checkpoint : str
+            The path of a checkpoint file (`.npz`). If set, the state of the
+            run is saved every `checkpoint_period` generations (and at the end)
+            and, if the file already exists, the run is resumed from it (see
+            `ailib.optimize.minimizers.checkpoint`).
+        checkpoint_period : int
+            The number of generations between two checkpoints.
+
+        The other parameters are described in `initialize`.
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization (`x` is a boolean array).
+        """
+
+        if num_bits is None:
+            num_bits = objective_function.ndim
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        self.initialize(num_bits,
+                        pop_size=pop_size,
+                        crossover=crossover,
+                        crossover_probability=crossover_probability,
+                        mutation_probability=mutation_probability,
+                        tournament_size=tournament_size,
+                        num_elites=num_elites,
+                        init_probability=init_probability,
+                        packed_genomes=packed_genomes)
+
+        if (checkpoint is None) or not restore_checkpoint(checkpoint, self, state):
+            # Evaluate the initial population
+            x = self.ask()
+            self.tell(x, objective_function(x))
+
+        with CheckpointWriter(checkpoint, checkpoint_period) as writer:
+            for gen in range(state.nit, num_gen):
+                x = self.ask()
+                self.tell(x, objective_function(x))
+
+                state.update(self.best_x, self.best_fx)
+
+                writer.update(self, state)
+
+                if state.stop():
+                    break
+
+            writer.update(self, state, force=True)
+
+        return state.result(x=self.best_x, fx=self.best_fx)
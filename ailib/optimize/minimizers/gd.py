@@ -26,44 +26,578 @@ __all__ = ['GradientDescent']
 import numpy as np
 
 from .optimizer import Optimizer
+from .line_search import armijo_backtracking, wolfe_line_search
+from .stopping import OptimizationState
 
 class GradientDescent(Optimizer):
+    r"""Gradient descent optimizer.
+
+    Several update rules are available:
+
+    * `'gd'`: the plain (steepest) gradient descent
+      :math:`\boldsymbol{x} \leftarrow \boldsymbol{x} - \eta \nabla f(\boldsymbol{x})`
+      where the step length :math:`\eta` is either fixed or computed by a
+      line search (Armijo backtracking or Wolfe conditions) ;
+    * `'momentum'`: the (heavy ball) momentum method
+      :math:`\boldsymbol{v} \leftarrow \gamma \boldsymbol{v} - \eta \nabla f(\boldsymbol{x})`,
+      :math:`\boldsymbol{x} \leftarrow \boldsymbol{x} + \boldsymbol{v}` ;
+    * `'nesterov'`: the Nesterov accelerated gradient (the gradient is
+      evaluated at the look-ahead point :math:`\boldsymbol{x} + \gamma \boldsymbol{v}`) ;
+    * `'adam'`: the Adam method (adaptive moment estimation).
+
+    `minimize_multistart` runs several descents from random starting points
+    in lockstep, with batched gradient evaluations.
+
+    See:
+    * https://en.wikipedia.org/wiki/Gradient_descent
+    * https://en.wikipedia.org/wiki/Stochastic_gradient_descent#Momentum
+    * https://arxiv.org/abs/1412.6980 (Adam)
+
+    Examples
+    --------
+    >>> from ailib.optimize.functions.unconstrained import Sphere
+    >>> res = GradientDescent().minimize(Sphere(2), x_init=np.array([1., -2.]), gtol=1e-8)
+    >>> res.termination_reason, bool(res.fx < 1e-15)
+    ('gtol', True)
+
+    With an Armijo line search, the descent stops when no acceptable step
+    length is found:
+
+    >>> res = GradientDescent().minimize(Sphere(2), x_init=np.array([1., -2.]), line_search='armijo')
+    >>> res.termination_reason, np.round(res.x, 6)
+    ('line_search_failure', array([0., 0.]))
+    """
 
     optimizer_name = "gradient descent"
 
-    def minimize(self, objective_function, num_iterations=1000, ndim=None, dmin=None, dmax=None):
+    def minimize(self,
+                 objective_function,
+                 num_iterations=1000,
+                 ndim=None,
+                 dmin=None,
+                 dmax=None,
+                 x_init=None,
+                 update_rule='gd',
+                 learning_rate=None,
+                 line_search=None,
+                 momentum=0.9,
+                 beta1=0.9,
+                 beta2=0.999,
+                 epsilon=1e-8,
+                 gtol=None,
+                 xtol=None,
+                 stopping_criteria=None,
+                 record_history=False,
+                 plot=False):
+        r"""Minimize `objective_function` with a gradient descent.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize. It should have a `gradient` method.
+        num_iterations : int
+            The maximum number of iterations.
+        ndim : int
+            The number of dimensions of the solution space (default:
+            `objective_function.ndim`).
+        dmin : ndarray
+            The lower bounds of the domain used to draw the initial point
+            (default: `objective_function.bounds[0]`).
+        dmax : ndarray
+            The upper bounds of the domain used to draw the initial point
+            (default: `objective_function.bounds[1]`).
+        x_init : ndarray
+            The initial point (a 1D numpy array). If `None`, it is uniformly
+            drawn in `[dmin, dmax]`.
+        update_rule : str
+            The update rule: `'gd'`, `'momentum'`, `'nesterov'` or `'adam'`.
+        learning_rate : float
+            The (fixed) step length. When a line search is used, it is the
+            first trial step length. Default: 0.1 for a fixed step (0.001
+            for Adam) and 1.0 for a line search.
+        line_search : str
+            The line search used to compute the step length of the `'gd'`
+            update rule: `None` (fixed step length), `'armijo'` (backtracking
+            line search) or `'wolfe'` (strong Wolfe conditions). The descent
+            is stopped (termination reason `'line_search_failure'`) when no
+            acceptable step length is found.
+        momentum : float
+            The momentum coefficient :math:`\gamma` used by the `'momentum'`
+            and `'nesterov'` update rules.
+        beta1 : float
+            The decay rate of the first moment estimate (`'adam'` only).
+        beta2 : float
+            The decay rate of the second moment estimate (`'adam'` only).
+        epsilon : float
+            The small constant that avoids divisions by zero (`'adam'` only).
+        gtol : float
+            The optimization is stopped when the euclidean norm of the
+            gradient is smaller than `gtol`.
+        xtol : float
+            The optimization is stopped when the euclidean norm of the last
+            step is smaller than `xtol`.
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`). The value of the current
+            point is evaluated at each iteration when stopping criteria are
+            given.
+        record_history : bool
+            Keep an history of visited points, gradients and values in the
+            result (keys `'x'`, `'nabla'` and `'fx'`). If `False`, the
+            memory used by the optimizer is O(ndim).
+        plot : bool
+            Plot the visited points and the value over iterations at the end
+            of the optimization (implies `record_history`).
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization; `x` is the last point of the
+            descent and `fx` its value.
+        """
+
+        if update_rule not in ('gd', 'momentum', 'nesterov', 'adam'):
+            raise ValueError("Unknown update rule {}.".format(update_rule))
+
+        if line_search not in (None, 'armijo', 'wolfe'):
+            raise ValueError("Unknown line search {}.".format(line_search))
+
+        if (line_search is not None) and (update_rule != 'gd'):
+            raise ValueError("Line search is only available with the 'gd' update rule.")
+
+        if learning_rate is None:
+            if line_search is not None:
+                learning_rate = 1.
+            elif update_rule == 'adam':
+                learning_rate = 0.001
+            else:
+                learning_rate = 0.1
 
         if dmin is None:
-            dmin = objective_function.domain_min
+            dmin = objective_function.bounds[0]
 
         if dmax is None:
-            dmax = objective_function.domain_max
+            dmax = objective_function.bounds[1]
 
         if ndim is None:
             ndim = objective_function.ndim
-        
+
+        record_history = record_history or plot
+        evaluate_fx = record_history or (stopping_criteria is not None)
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
         # Get the first point
-        x = np.random.uniform(dmin, dmax, ndim)
+        if x_init is None:
+            x = np.random.uniform(dmin, dmax, ndim)
+        else:
+            x = np.array(x_init, dtype=np.float64)
+
+        # Init the update rules state
+        velocity = np.zeros(ndim)        # 'momentum' and 'nesterov'
+        first_moment = np.zeros(ndim)    # 'adam'
+        second_moment = np.zeros(ndim)   # 'adam'
 
-        # Init history lists
-        x_history_array = np.zeros([num_iterations, ndim])
-        nabla_history_array = np.zeros([num_iterations, ndim])
+        fx = None
 
         # Main loop: for each iteration do...
         for sample_index in range(num_iterations):
 
             # Compute the gradient of objective_function at x
-            nabla = objective_function.gradient(x)
-            coef = .1  # TODO!!! : http://fr.wikipedia.org/wiki/Algorithme_du_gradient + http://fr.wikipedia.org/wiki/Recherche_lin%C3%A9aire  +  http://fr.wikipedia.org/wiki/Algorithme_%C3%A0_r%C3%A9gions_de_confiance
+            if update_rule == 'nesterov':
+                nabla = objective_function.gradient(x + momentum * velocity)
+            else:
+                nabla = objective_function.gradient(x)
+
+            if (gtol is not None) and (np.linalg.norm(nabla) <= gtol):
+                state.terminate("gtol")
+                break
+
+            # Compute the step
+            if update_rule == 'gd':
+                if line_search is None:
+                    step = -learning_rate * nabla
+                else:
+                    direction = -nabla
+                    if fx is None:
+                        fx = objective_function(x)
+
+                    if line_search == 'armijo':
+                        alpha, fx = armijo_backtracking(objective_function, x, fx, nabla, direction, alpha_init=learning_rate)
+                    else:
+                        alpha, fx, _ = wolfe_line_search(objective_function, objective_function.gradient, x, fx, nabla, direction, alpha_init=learning_rate)
+
+                    if alpha <= 0.:
+                        state.terminate("line_search_failure")
+                        break
+
+                    step = alpha * direction
+
+            elif update_rule in ('momentum', 'nesterov'):
+                velocity *= momentum
+                velocity -= learning_rate * nabla
+                step = velocity
+
+            elif update_rule == 'adam':
+                first_moment *= beta1
+                first_moment += (1. - beta1) * nabla
+                second_moment *= beta2
+                second_moment += (1. - beta2) * nabla**2
+                first_moment_hat = first_moment / (1. - beta1**(sample_index + 1))
+                second_moment_hat = second_moment / (1. - beta2**(sample_index + 1))
+                step = -learning_rate * first_moment_hat / (np.sqrt(second_moment_hat) + epsilon)
 
-            x = x - coef * nabla
+            x = x + step
+
+            if line_search is None:
+                fx = objective_function(x) if evaluate_fx else None
 
             # Keep an history of x and nabla to plot things...
-            x_history_array[sample_index, :] = x
-            nabla_history_array[sample_index, :] = nabla
+            if record_history:
+                state.update(x, fx, nabla=nabla)
+            else:
+                state.update(x, fx)
+
+            if (xtol is not None) and (np.linalg.norm(step) <= xtol):
+                state.terminate("xtol")
+                break
+
+            if state.stop():
+                break
+
+        if fx is None:
+            # The value of the last point has not been evaluated in the loop
+            fx = objective_function(x)
+
+        res = state.result(x=x, fx=fx)
+
+        if plot and res.nit > 0:
+            self.plotSamples(res.history['x'], res.history['fx'], objective_function=objective_function)
+            self.plotCosts(res.history['fx'])
+
+        return res
+
+    def minimize_multistart(self,
+                            objective_function,
+                            num_starts=10,
+                            num_iterations=1000,
+                            ndim=None,
+                            dmin=None,
+                            dmax=None,
+                            x_init=None,
+                            update_rule='gd',
+                            learning_rate=None,
+                            line_search=None,
+                            momentum=0.9,
+                            beta1=0.9,
+                            beta2=0.999,
+                            epsilon=1e-8,
+                            gtol=1e-6,
+                            xtol=None,
+                            merge_tol=None,
+                            merge_period=10,
+                            stopping_criteria=None,
+                            record_history=False):
+        r"""Minimize `objective_function` with several gradient descents run in lockstep.
+
+        The `num_starts` current points are the columns of a
+        `(ndim, num_starts)` array: each iteration makes one batched call of
+        `objective_function.gradient` (and of `objective_function` for the
+        line search) for all the starts that are still running. Each start
+        has its own step length (with the Armijo line search) and its own
+        update rule state.
+
+        A start stops when its gradient norm is smaller than `gtol` (or its
+        last step norm smaller than `xtol`, or its gradient is not finite,
+        or its line search finds no acceptable step length); it is then
+        masked out of the batch. Every `merge_period` iterations, the running
+        starts closer than `merge_tol` to another start (a stopped one or a
+        running one with a smaller index) are stopped too: they have
+        collapsed into the same basin.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize. Its `gradient` method (and the function
+            itself) must accept a `(ndim, n)` array of points.
+        num_starts : int
+            The number of starting points.
+        num_iterations : int
+            The maximum number of iterations.
+        x_init : ndarray
+            The `(ndim, num_starts)` array of starting points. If `None`,
+            they are uniformly drawn in `[dmin, dmax]`.
+        learning_rate : float or ndarray
+            The (fixed) step length, or one step length per start. With the
+            Armijo line search, it is the first trial step length; then
+            each start begins its line search with twice its last accepted
+            step length.
+        line_search : str
+            `None` (fixed step length) or `'armijo'` (batched backtracking
+            line search, `'gd'` update rule only).
+        gtol : float
+            A start is stopped when the euclidean norm of its gradient is
+            smaller than `gtol`.
+        xtol : float
+            A start is stopped when the euclidean norm of its last step is
+            smaller than `xtol`.
+        merge_tol : float
+            The distance under which two starts are in the same basin
+            (default: `1e-3` times the diameter of `[dmin, dmax]`; 0
+            disables merging).
+        merge_period : int
+            The number of iterations between two merges.
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`).
+        record_history : bool
+            Keep the best point, its value and the number of running starts
+            at each iteration in the result history (keys `'x'`, `'fx'` and
+            `'num_running'`).
+
+        The other parameters are described in `minimize`.
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization: `x` and `fx` are the best final
+            point and its value; `starts_x` is the `(ndim, num_starts)` array
+            of final points, `starts_fx` their values (`nan` for merged
+            starts) and `starts_status` the reason why each start stopped
+            (`'gtol'`, `'xtol'`, `'merged'`, `'diverged'`,
+            `'line_search_failure'` or `'max_iterations'`). When all the
+            starts have stopped, the termination reason is `'converged'` if
+            one of them has reached `gtol` or `xtol`, else
+            `'line_search_failure'` or `'diverged'`.
+        """
+
+        if update_rule not in ('gd', 'momentum', 'nesterov', 'adam'):
+            raise ValueError("Unknown update rule {}.".format(update_rule))
+
+        if line_search not in (None, 'armijo'):
+            raise ValueError("Unknown line search {} (multi-start descents only support 'armijo').".format(line_search))
+
+        if (line_search is not None) and (update_rule != 'gd'):
+            raise ValueError("Line search is only available with the 'gd' update rule.")
+
+        if learning_rate is None:
+            if line_search is not None:
+                learning_rate = 1.
+            elif update_rule == 'adam':
+                learning_rate = 0.001
+            else:
+                learning_rate = 0.1
+
+        if dmin is None:
+            dmin = objective_function.bounds[0]
+
+        if dmax is None:
+            dmax = objective_function.bounds[1]
+
+        if ndim is None:
+            ndim = objective_function.ndim
+
+        dmin = np.broadcast_to(np.asarray(dmin, dtype=np.float64), [ndim])
+        dmax = np.broadcast_to(np.asarray(dmax, dtype=np.float64), [ndim])
+
+        if merge_tol is None:
+            merge_tol = 1e-3 * np.linalg.norm(dmax - dmin)
+
+        learning_rate = np.broadcast_to(np.asarray(learning_rate, dtype=np.float64), [num_starts]).copy()
+
+        evaluate_fx = record_history or (stopping_criteria is not None) or (line_search is not None)
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        # Get the first points (one per column)
+        if x_init is None:
+            x = np.random.uniform(dmin[:, np.newaxis], dmax[:, np.newaxis], [ndim, num_starts])
+        else:
+            x = np.array(x_init, dtype=np.float64)
+            if x.shape != (ndim, num_starts):
+                raise ValueError("x_init must be a ({}, {}) array.".format(ndim, num_starts))
+
+        # Init the update rules state
+        velocity = np.zeros([ndim, num_starts])        # 'momentum' and 'nesterov'
+        first_moment = np.zeros([ndim, num_starts])    # 'adam'
+        second_moment = np.zeros([ndim, num_starts])   # 'adam'
+
+        fx = np.full(num_starts, np.nan)
+        if line_search is not None:
+            fx = np.asarray(objective_function(x), dtype=np.float64).copy()
+
+        status = np.full(num_starts, 'max_iterations', dtype=object)
+        running = np.ones(num_starts, dtype=bool)
+
+        # Main loop: for each iteration do...
+        for iteration_index in range(num_iterations):
+
+            indices = np.flatnonzero(running)
+            xr = x[:, indices]
+
+            # Compute the gradients of objective_function at the running points (one batched call)
+            if update_rule == 'nesterov':
+                nabla = objective_function.gradient(xr + momentum * velocity[:, indices])
+            else:
+                nabla = objective_function.gradient(xr)
+
+            nabla = np.asarray(nabla, dtype=np.float64).reshape([ndim, -1])
+
+            # Diverging starts are stopped (as they would end a single descent with nan)
+            diverged = ~np.all(np.isfinite(nabla), axis=0)
+            if np.any(diverged):
+                status[indices[diverged]] = 'diverged'
+                running[indices[diverged]] = False
+                indices, xr, nabla = indices[~diverged], xr[:, ~diverged], nabla[:, ~diverged]
+
+            if gtol is not None:
+                gradient_converged = np.linalg.norm(nabla, axis=0) <= gtol
+                status[indices[gradient_converged]] = 'gtol'
+                running[indices[gradient_converged]] = False
+
+                kept = ~gradient_converged
+                indices, xr, nabla = indices[kept], xr[:, kept], nabla[:, kept]
+
+            if indices.size == 0:
+                state.terminate(self._multistart_termination_reason(status))
+                break
+
+            # Compute the steps
+            if update_rule == 'gd':
+                if line_search is None:
+                    step = -learning_rate[indices] * nabla
+                else:
+                    step, accepted = self._batched_armijo(objective_function, xr, fx, nabla, learning_rate, indices)
+
+                    # Starts without an acceptable step length are stopped where they are
+                    status[indices[~accepted]] = 'line_search_failure'
+                    running[indices[~accepted]] = False
+
+            elif update_rule in ('momentum', 'nesterov'):
+                velocity[:, indices] = momentum * velocity[:, indices] - learning_rate[indices] * nabla
+                step = velocity[:, indices]
+
+            elif update_rule == 'adam':
+                first_moment[:, indices] = beta1 * first_moment[:, indices] + (1. - beta1) * nabla
+                second_moment[:, indices] = beta2 * second_moment[:, indices] + (1. - beta2) * nabla**2
+                first_moment_hat = first_moment[:, indices] / (1. - beta1**(iteration_index + 1))
+                second_moment_hat = second_moment[:, indices] / (1. - beta2**(iteration_index + 1))
+                step = -learning_rate[indices] * first_moment_hat / (np.sqrt(second_moment_hat) + epsilon)
+
+            x[:, indices] = xr + step
+
+            if evaluate_fx and line_search is None:
+                fx[indices] = objective_function(x[:, indices])
+
+            if xtol is not None:
+                step_converged = running[indices] & (np.linalg.norm(step, axis=0) <= xtol)
+                status[indices[step_converged]] = 'xtol'
+                running[indices[step_converged]] = False
+
+            # Stop the starts that have collapsed into the basin of another start
+            if merge_tol > 0. and (iteration_index + 1) % merge_period == 0:
+                merged = self._merged_starts(x, running, status, merge_tol)
+                status[merged] = 'merged'
+                running[merged] = False
+
+            if evaluate_fx:
+                not_merged = np.flatnonzero(status != 'merged')
+                best = not_merged[np.nanargmin(fx[not_merged])]
+                state.update(x[:, best], fx[best], num_running=np.count_nonzero(running))
+            else:
+                state.update(x[:, indices[0]], num_running=np.count_nonzero(running))
+
+            if not np.any(running):
+                state.terminate(self._multistart_termination_reason(status))
+                break
+
+            if state.stop():
+                break
+
+        # Evaluate the final points (except the merged ones) in one batched call
+        not_merged = np.flatnonzero(status != 'merged')
+        fx = np.full(num_starts, np.nan)
+        fx[not_merged] = objective_function(x[:, not_merged])
+        best = not_merged[np.nanargmin(fx[not_merged])] if np.any(np.isfinite(fx[not_merged])) else not_merged[0]
+
+        return state.result(x=x[:, best].copy(),
+                            fx=fx[best],
+                            starts_x=x,
+                            starts_fx=fx,
+                            starts_status=status.astype(str))
+
+    @staticmethod
+    def _batched_armijo(objective_function, x, fx, nabla, learning_rate, indices, c1=1e-4, max_backtracks=30):
+        """Armijo backtracking line searches for the columns of `x` (steepest descent directions).
+
+        `fx` and `learning_rate` are updated in place (at `indices`): each
+        start begins its next line search with twice its accepted step length.
+
+        Returns the steps and a boolean mask of the columns for which an
+        acceptable step length has been found (the other steps are zero).
+        """
+        alpha = learning_rate[indices].copy()
+        f0 = fx[indices]
+        slope = -np.sum(nabla**2, axis=0)
+
+        new_fx = f0.copy()
+        accepted = np.zeros(indices.size, dtype=bool)
+
+        for backtrack_index in range(max_backtracks):
+            trying = np.flatnonzero(~accepted)
+            if trying.size == 0:
+                break
+
+            trial_fx = objective_function(x[:, trying] - alpha[trying] * nabla[:, trying])
+            sufficient_decrease = trial_fx <= f0[trying] + c1 * alpha[trying] * slope[trying]
+
+            new_fx[trying[sufficient_decrease]] = trial_fx[sufficient_decrease]
+            accepted[trying[sufficient_decrease]] = True
+            alpha[trying[~sufficient_decrease]] *= 0.5
+
+        # Starts without sufficient decrease don't move
+        alpha[~accepted] = 0.
+
+        fx[indices] = new_fx
+        learning_rate[indices[accepted]] = 2. * alpha[accepted]
+
+        return -alpha * nabla, accepted
+
+    @staticmethod
+    def _multistart_termination_reason(status):
+        """`'converged'` if a start has converged, else the reason why the starts stopped."""
+        if np.any((status == 'gtol') | (status == 'xtol')):
+            return "converged"
+        elif np.any(status == 'line_search_failure'):
+            return "line_search_failure"
+        else:
+            return "diverged"
+
+    @staticmethod
+    def _merged_starts(x, running, status, merge_tol):
+        """The running starts closer than `merge_tol` to a stopped start or to a running start with a smaller index.
+
+        A running start merged into another one doesn't count as a reference
+        for the next ones.
+        """
+        candidates = np.flatnonzero(running)
+        references = np.flatnonzero(~running & (status != 'merged'))
+        points = np.concatenate([references, candidates])
+
+        # The distances between the running starts and all the others (one call)
+        xc, xp = x[:, candidates], x[:, points]
+        squared_distances = (np.sum(xc**2, axis=0)[:, np.newaxis]
+                             - 2. * xc.T @ xp
+                             + np.sum(xp**2, axis=0)[np.newaxis, :])
+        close = squared_distances <= merge_tol**2
+
+        merged = np.any(close[:, :references.size], axis=1)
+
+        # close_to_previous[i, j]: the running starts j < i are close to i
+        close_to_previous = np.tril(close[:, references.size:], k=-1)
 
-        y_history_array = objective_function(x_history_array)
-        self.plotSamples(x_history_array, y_history_array, objective_function=objective_function)
-        self.plotCosts(y_history_array)
+        # Only the starts close to a previous running start depend on which of those are merged
+        for i in np.flatnonzero(~merged & np.any(close_to_previous, axis=1)):
+            merged[i] = np.any(close_to_previous[i, :i] & ~merged[:i])
 
-        return x
+        return candidates[merged]
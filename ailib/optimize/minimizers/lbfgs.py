@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__all__ = ['LBFGS']
+
+import numpy as np
+
+from .optimizer import Optimizer
+from .line_search import wolfe_line_search
+from .stopping import OptimizationState
+
+class LBFGS(Optimizer):
+    r"""Limited-memory BFGS optimizer (with bound constraints).
+
+    L-BFGS approximates the inverse Hessian of the objective function with
+    the `memory_size` last pairs of steps
+    :math:`\boldsymbol{s}_k = \boldsymbol{x}_{k+1} - \boldsymbol{x}_k` and
+    gradient differences
+    :math:`\boldsymbol{y}_k = \nabla f(\boldsymbol{x}_{k+1}) - \nabla f(\boldsymbol{x}_k)`.
+    The search direction is computed with the *two-loop recursion*; the
+    pairs are kept in a ring buffer made of two preallocated
+    `(memory_size, ndim)` arrays so that the memory used by the optimizer is
+    O(memory_size * ndim).
+    The step length is computed with a line search satisfying the strong
+    Wolfe conditions.
+
+    Bounds are handled by projection (in the spirit of L-BFGS-B): variables
+    lying on a bound with a gradient pointing outside the domain are fixed
+    (active set), the search direction is restricted to the free variables
+    and the line search is limited to the feasible part of the search
+    direction.
+
+    See:
+    * https://en.wikipedia.org/wiki/Limited-memory_BFGS
+    * J. Nocedal and S. Wright, *Numerical Optimization*, 2nd ed., chapter 7.
+
+    Examples
+    --------
+    >>> from ailib.optimize.functions.unconstrained import Rosenbrock, Sphere
+    >>> res = LBFGS().minimize(Rosenbrock(2), x_init=np.array([-1.2, 1.]))
+    >>> res.termination_reason, np.round(res.x, 6)
+    ('gtol', array([1., 1.]))
+
+    With bounds, the solution lies on the boundary of the domain:
+
+    >>> res = LBFGS().minimize(Sphere(2), x_init=np.array([3., -2.]), bounds=np.array([[1., -5.], [5., 5.]]))
+    >>> res.x, res.fx
+    (array([1., 0.]), 1.0)
+    """
+
+    optimizer_name = "L-BFGS"
+
+    def minimize(self,
+                 objective_function,
+                 num_iterations=1000,
+                 x_init=None,
+                 memory_size=10,
+                 bounds=None,
+                 gtol=1e-6,
+                 ftol=1e-12,
+                 c1=1e-4,
+                 c2=0.9,
+                 stopping_criteria=None,
+                 record_history=False):
+        r"""Minimize `objective_function` with the L-BFGS algorithm.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize. It should have a `gradient` method.
+        num_iterations : int
+            The maximum number of iterations.
+        x_init : ndarray
+            The initial point (a 1D numpy array). If `None`, it is uniformly
+            drawn within `bounds`.
+        memory_size : int
+            The number of :math:`(\boldsymbol{s}, \boldsymbol{y})` pairs
+            used to approximate the inverse Hessian.
+        bounds : ndarray
+            The `(2, ndim)` array of lower (first row) and upper (second row)
+            bounds (default: `objective_function.bounds`). Use `-np.inf` and
+            `np.inf` for unbounded variables.
+        gtol : float
+            The optimization is stopped when the infinity norm of the
+            projected gradient is smaller than `gtol`.
+        ftol : float
+            The optimization is stopped when the relative decrease of the
+            objective function is smaller than `ftol`.
+        c1 : float
+            The sufficient decrease parameter of the line search.
+        c2 : float
+            The curvature parameter of the line search.
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`).
+        record_history : bool
+            Keep an history of visited points and values in the result (keys
+            `'x'` and `'fx'`).
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization.
+        """
+
+        ndim = objective_function.ndim
+
+        if bounds is None:
+            bounds = objective_function.bounds
+
+        if bounds is None:
+            lower = np.full(ndim, -np.inf)
+            upper = np.full(ndim, np.inf)
+        else:
+            lower = np.asarray(bounds[0], dtype=np.float64)
+            upper = np.asarray(bounds[1], dtype=np.float64)
+
+        if x_init is None:
+            x = np.random.uniform(lower, upper, ndim)
+        else:
+            x = np.clip(np.array(x_init, dtype=np.float64), lower, upper)
+
+        # The ring buffer of (s, y) pairs
+        s_array = np.zeros([memory_size, ndim])
+        y_array = np.zeros([memory_size, ndim])
+        rho_array = np.zeros(memory_size)
+        alpha_array = np.zeros(memory_size)
+        head = 0          # The index where the next pair is stored
+        num_pairs = 0     # The number of pairs currently stored
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        fx = objective_function(x)
+        nabla = objective_function.gradient(x)
+
+        for iteration_index in range(num_iterations):
+
+            # Active set: variables on a bound with a gradient pointing outward
+            active = ((x <= lower) & (nabla > 0.)) | ((x >= upper) & (nabla < 0.))
+
+            projected_nabla = np.where(active, 0., nabla)
+
+            if np.max(np.abs(projected_nabla)) <= gtol:
+                state.terminate("gtol")
+                break
+
+            # Two-loop recursion (newest to oldest pair, then oldest to newest)
+            q = projected_nabla.copy()
+            ring_indices = [(head - 1 - k) % memory_size for k in range(num_pairs)]
+
+            for i in ring_indices:
+                alpha_array[i] = rho_array[i] * np.dot(s_array[i], q)
+                q -= alpha_array[i] * y_array[i]
+
+            if num_pairs > 0:
+                newest = ring_indices[0]
+                q *= np.dot(s_array[newest], y_array[newest]) / np.dot(y_array[newest], y_array[newest])
+            else:
+                q /= max(1., np.linalg.norm(q))
+
+            for i in reversed(ring_indices):
+                beta = rho_array[i] * np.dot(y_array[i], q)
+                q += (alpha_array[i] - beta) * s_array[i]
+
+            direction = -q
+            direction[active] = 0.
+            direction[((x <= lower) & (direction < 0.)) | ((x >= upper) & (direction > 0.))] = 0.
+
+            if np.dot(direction, nabla) >= 0.:
+                # Not a descent direction: restart from the steepest descent
+                num_pairs = 0
+                direction = -projected_nabla / max(1., np.linalg.norm(projected_nabla))
+
+            # Largest feasible step along the direction
+            with np.errstate(divide='ignore', invalid='ignore'):
+                step_to_bounds = np.where(direction > 0., (upper - x) / direction,
+                                          np.where(direction < 0., (lower - x) / direction, np.inf))
+            alpha_max = max(np.min(step_to_bounds), 0.)
+
+            alpha, fx_new, nabla_new = wolfe_line_search(objective_function,
+                                                         objective_function.gradient,
+                                                         x, fx, nabla, direction,
+                                                         alpha_init=min(1., alpha_max),
+                                                         c1=c1, c2=c2,
+                                                         alpha_max=alpha_max)
+
+            if alpha <= 0.:
+                if num_pairs > 0:
+                    # Discard the curvature information and retry
+                    num_pairs = 0
+                    continue
+                state.terminate("line_search_failure")
+                break
+
+            x_new = np.clip(x + alpha * direction, lower, upper)
+
+            # Update the ring buffer
+            s = x_new - x
+            y = nabla_new - nabla
+            sy = np.dot(s, y)
+
+            if sy > 1e-10 * np.dot(y, y):
+                s_array[head] = s
+                y_array[head] = y
+                rho_array[head] = 1. / sy
+                head = (head + 1) % memory_size
+                num_pairs = min(num_pairs + 1, memory_size)
+
+            decrease = fx - fx_new
+
+            x, fx, nabla = x_new, fx_new, nabla_new
+
+            state.update(x, fx)
+
+            if decrease <= ftol * max(abs(fx), abs(fx + decrease), 1.):
+                state.terminate("ftol")
+                break
+
+            if state.stop():
+                break
+
+        return state.result(x=x, fx=fx)
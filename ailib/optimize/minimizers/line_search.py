@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+r"""
+Line search procedures used by gradient based minimizers.
+
+Given a point :math:`\boldsymbol{x}` and a descent direction
+:math:`\boldsymbol{d}`, these functions look for a step length
+:math:`\alpha > 0` such that :math:`\boldsymbol{x} + \alpha \boldsymbol{d}`
+sufficiently decreases the objective function.
+
+See:
+* https://en.wikipedia.org/wiki/Line_search
+* https://en.wikipedia.org/wiki/Backtracking_line_search
+* https://en.wikipedia.org/wiki/Wolfe_conditions
+* J. Nocedal and S. Wright, *Numerical Optimization*, 2nd ed., chapter 3.
+"""
+
+__all__ = ['armijo_backtracking',
+           'wolfe_line_search']
+
+import numpy as np
+
+
+def armijo_backtracking(func, x, fx, nabla, direction, alpha_init=1., c1=1e-4, rho=0.5, max_iterations=50):
+    r"""Backtracking line search with the Armijo (sufficient decrease) rule.
+
+    The step length starts at `alpha_init` and is multiplied by `rho` until
+
+    .. math::
+
+        f(\boldsymbol{x} + \alpha \boldsymbol{d}) \leq f(\boldsymbol{x}) + c_1 \alpha \nabla f(\boldsymbol{x})^\top \boldsymbol{d}
+
+    Parameters
+    ----------
+    func : callable object
+        The objective function.
+    x : ndarray
+        The current point (a 1D numpy array).
+    fx : float
+        The value of `func` at `x`.
+    nabla : ndarray
+        The gradient of `func` at `x` (a 1D numpy array).
+    direction : ndarray
+        The search direction (a 1D numpy array). It should be a descent
+        direction i.e. `np.dot(nabla, direction) < 0`.
+    alpha_init : float
+        The initial (largest) step length.
+    c1 : float
+        The sufficient decrease parameter (:math:`0 < c_1 < 1`).
+    rho : float
+        The contraction factor applied to the step length at each iteration
+        (:math:`0 < \rho < 1`).
+    max_iterations : int
+        The maximum number of contractions.
+
+    Returns
+    -------
+    tuple
+        The step length `alpha` and the value of `func` at
+        `x + alpha * direction`. `alpha` is `0.` if no acceptable step has
+        been found (e.g. if `direction` is not a descent direction).
+
+    Examples
+    --------
+    >>> func = lambda x: float(np.sum(x**2))
+    >>> x = np.array([1., 2.])
+    >>> armijo_backtracking(func, x, func(x), 2. * x, -2. * x)
+    (0.5, 0.0)
+    >>> armijo_backtracking(func, x, func(x), 2. * x, 2. * x)
+    (0.0, 5.0)
+    """
+    slope = np.dot(nabla, direction)
+
+    if slope >= 0.:
+        return 0., fx
+
+    alpha = alpha_init
+
+    for iteration_index in range(max_iterations):
+        fx_new = func(x + alpha * direction)
+
+        if fx_new <= fx + c1 * alpha * slope:
+            return alpha, fx_new
+
+        alpha *= rho
+
+    return 0., fx
+
+
+def wolfe_line_search(func, grad, x, fx, nabla, direction, alpha_init=1., c1=1e-4, c2=0.9, strong=True, alpha_max=np.inf, max_iterations=30):
+    r"""Line search satisfying the (strong) Wolfe conditions.
+
+    This is the bracketing and zoom procedure described in Nocedal and Wright
+    (algorithms 3.5 and 3.6). The returned step length satisfies the
+    sufficient decrease condition
+
+    .. math::
+
+        f(\boldsymbol{x} + \alpha \boldsymbol{d}) \leq f(\boldsymbol{x}) + c_1 \alpha \nabla f(\boldsymbol{x})^\top \boldsymbol{d}
+
+    and the curvature condition
+
+    .. math::
+
+        \left| \nabla f(\boldsymbol{x} + \alpha \boldsymbol{d})^\top \boldsymbol{d} \right| \leq c_2 \left| \nabla f(\boldsymbol{x})^\top \boldsymbol{d} \right|
+
+    (or :math:`\nabla f(\boldsymbol{x} + \alpha \boldsymbol{d})^\top \boldsymbol{d} \geq c_2 \nabla f(\boldsymbol{x})^\top \boldsymbol{d}`
+    if `strong` is `False`).
+
+    Parameters
+    ----------
+    func : callable object
+        The objective function.
+    grad : callable object
+        The gradient of the objective function.
+    x : ndarray
+        The current point (a 1D numpy array).
+    fx : float
+        The value of `func` at `x`.
+    nabla : ndarray
+        The gradient of `func` at `x` (a 1D numpy array).
+    direction : ndarray
+        The search direction (a 1D numpy array). It should be a descent
+        direction i.e. `np.dot(nabla, direction) < 0`.
+    alpha_init : float
+        The first trial step length.
+    c1 : float
+        The sufficient decrease parameter.
+    c2 : float
+        The curvature parameter (:math:`0 < c_1 < c_2 < 1`).
+    strong : bool
+        Check the strong Wolfe conditions if `True`, the weak ones otherwise.
+    alpha_max : float
+        The largest admissible step length (e.g. the distance to the bounds
+        of the domain along `direction`).
+    max_iterations : int
+        The maximum number of trial step lengths.
+
+    Returns
+    -------
+    tuple
+        The step length `alpha`, the value of `func` and the gradient of
+        `func` at `x + alpha * direction`.
+        If no step length satisfying the Wolfe conditions has been found, the
+        best step length satisfying the sufficient decrease condition is
+        returned (`alpha` is `0.` if there is none, in which case the returned
+        value and gradient are `fx` and `nabla`).
+
+    Examples
+    --------
+    >>> func = lambda x: float(np.sum(x**2))
+    >>> grad = lambda x: 2. * x
+    >>> x = np.array([1., 2.])
+    >>> wolfe_line_search(func, grad, x, func(x), grad(x), -grad(x))
+    (0.5, 0.0, array([0., 0.]))
+    """
+    slope = np.dot(nabla, direction)
+
+    if slope >= 0.:
+        return 0., fx, nabla
+
+    def phi(alpha):
+        x_alpha = x + alpha * direction
+        return func(x_alpha), grad(x_alpha)
+
+    def curvature_ok(dphi):
+        if strong:
+            return abs(dphi) <= -c2 * slope
+        else:
+            return dphi >= c2 * slope
+
+    # The best point satisfying the sufficient decrease condition (fallback)
+    best = (0., fx, nabla)
+
+    def zoom(alpha_lo, f_lo, dphi_lo, alpha_hi, f_hi, num_iterations):
+        nonlocal best
+        for iteration_index in range(num_iterations):
+            # Quadratic interpolation, safeguarded by a bisection
+            denominator = 2. * (f_hi - f_lo - dphi_lo * (alpha_hi - alpha_lo))
+            if denominator > 0.:
+                alpha = alpha_lo - dphi_lo * (alpha_hi - alpha_lo)**2 / denominator
+            else:
+                alpha = np.nan
+
+            lower, upper = min(alpha_lo, alpha_hi), max(alpha_lo, alpha_hi)
+            margin = 0.1 * (upper - lower)
+            if not (lower + margin <= alpha <= upper - margin):
+                alpha = 0.5 * (alpha_lo + alpha_hi)
+
+            f_alpha, g_alpha = phi(alpha)
+            dphi = np.dot(g_alpha, direction)
+
+            if (f_alpha > fx + c1 * alpha * slope) or (f_alpha >= f_lo):
+                alpha_hi, f_hi = alpha, f_alpha
+            else:
+                if f_alpha < best[1]:
+                    best = (alpha, f_alpha, g_alpha)
+                if curvature_ok(dphi):
+                    return alpha, f_alpha, g_alpha
+                if dphi * (alpha_hi - alpha_lo) >= 0.:
+                    alpha_hi, f_hi = alpha_lo, f_lo
+                alpha_lo, f_lo, dphi_lo = alpha, f_alpha, dphi
+        return best
+
+    alpha_prev, f_prev, dphi_prev = 0., fx, slope
+    alpha = min(alpha_init, alpha_max)
+
+    for iteration_index in range(max_iterations):
+        f_alpha, g_alpha = phi(alpha)
+        dphi = np.dot(g_alpha, direction)
+
+        if (f_alpha > fx + c1 * alpha * slope) or (iteration_index > 0 and f_alpha >= f_prev):
+            return zoom(alpha_prev, f_prev, dphi_prev, alpha, f_alpha, max_iterations - iteration_index)
+
+        if f_alpha < best[1]:
+            best = (alpha, f_alpha, g_alpha)
+
+        if curvature_ok(dphi):
+            return alpha, f_alpha, g_alpha
+
+        if dphi >= 0.:
+            return zoom(alpha, f_alpha, dphi, alpha_prev, f_prev, max_iterations - iteration_index)
+
+        if alpha >= alpha_max:
+            # The step cannot be extended any further
+            return best
+
+        alpha_prev, f_prev, dphi_prev = alpha, f_alpha, dphi
+        alpha = min(2. * alpha, alpha_max)
+
+    return best
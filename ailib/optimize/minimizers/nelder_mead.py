@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__all__ = ['NelderMead']
+
+import numpy as np
+
+from .optimizer import Optimizer
+from .stopping import OptimizationState
+
+class NelderMead(Optimizer):
+    r"""Nelder-Mead (downhill simplex) optimizer.
+
+    A derivative-free local optimizer: the simplex of :math:`n+1` points is
+    moved by reflection, expansion, contraction and shrink steps.
+
+    In *speculative* mode (default), the reflection, expansion, outside
+    contraction and inside contraction points are all evaluated at once in a
+    single (batched) call to the objective function, then the usual
+    Nelder-Mead rules choose among them. This costs more evaluations than the
+    sequential algorithm but each iteration requires a single round of
+    evaluations, which can be run in parallel. The :math:`n` new vertices of
+    a shrink step are also evaluated in a single batch.
+
+    With `adaptive` set, the coefficients depend on the dimension :math:`n`
+    of the problem (:math:`\rho = 1`, :math:`\chi = 1 + 2/n`,
+    :math:`\psi = 3/4 - 1/(2n)`, :math:`\sigma = 1 - 1/n`) which
+    significantly improves the performances in high dimension.
+
+    See:
+    * https://en.wikipedia.org/wiki/Nelder%E2%80%93Mead_method
+    * F. Gao and L. Han, "Implementing the Nelder-Mead simplex algorithm with
+      adaptive parameters", Computational Optimization and Applications
+      51(1), 259-277 (2012).
+
+    Examples
+    --------
+    The speculative and the sequential modes visit the same simplices, the
+    sequential mode needs fewer evaluations:
+
+    >>> from ailib.optimize.functions.unconstrained import Rosenbrock
+    >>> res = NelderMead().minimize(Rosenbrock(2), x_init=np.array([-1.2, 1.]))
+    >>> res.termination_reason, np.round(res.x, 6), res.nit, res.nfev
+    ('xtol_ftol', array([1., 1.]), 116, 467)
+    >>> res = NelderMead().minimize(Rosenbrock(2), x_init=np.array([-1.2, 1.]), speculative=False)
+    >>> res.termination_reason, np.round(res.x, 6), res.nit, res.nfev
+    ('xtol_ftol', array([1., 1.]), 116, 219)
+    """
+
+    optimizer_name = "Nelder-Mead"
+
+    def minimize(self,
+                 objective_function,
+                 num_iterations=1000,
+                 x_init=None,
+                 initial_step=0.05,
+                 adaptive=False,
+                 speculative=True,
+                 xtol=1e-8,
+                 ftol=1e-8,
+                 stopping_criteria=None,
+                 record_history=False):
+        """Minimize `objective_function` with the Nelder-Mead method.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize.
+        num_iterations : int
+            The maximum number of iterations.
+        x_init : ndarray
+            The initial point (a 1D numpy array). If `None`, it is uniformly
+            drawn within `objective_function.bounds`.
+        initial_step : float
+            The initial simplex is made of `x_init` and of the points
+            obtained by moving each coordinate of `x_init` by
+            `initial_step` times its value (or by 0.00025 for zero
+            coordinates).
+        adaptive : bool
+            Use dimension dependent coefficients.
+        speculative : bool
+            Evaluate all the candidate points of an iteration at once.
+        xtol : float
+            The optimization is stopped when all the vertices are within
+            `xtol` of the best one (infinity norm) ...
+        ftol : float
+            ... and all the values are within `ftol` of the best one.
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`).
+        record_history : bool
+            Keep the best point and the best value found at each iteration in
+            the result history (keys `'x'` and `'fx'`).
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization.
+        """
+
+        ndim = objective_function.ndim
+
+        if adaptive:
+            n = max(ndim, 2)
+            rho, chi, psi, sigma = 1., 1. + 2. / n, 0.75 - 1. / (2. * n), 1. - 1. / n
+        else:
+            rho, chi, psi, sigma = 1., 2., 0.5, 0.5
+
+        if x_init is None:
+            x_init = np.random.uniform(objective_function.bounds[0], objective_function.bounds[1], ndim)
+
+        x_init = np.array(x_init, dtype=np.float64)
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        # Init the simplex (one vertex per row) ########
+
+        simplex = np.tile(x_init, (ndim + 1, 1))
+        steps = np.where(x_init != 0., initial_step * x_init, 0.00025)
+        simplex[np.arange(1, ndim + 1), np.arange(ndim)] += steps
+
+        values = objective_function(simplex.T)
+
+        for iteration_index in range(num_iterations):
+
+            order = np.argsort(values)
+            simplex = simplex[order]
+            values = values[order]
+
+            if (np.max(np.abs(simplex[1:] - simplex[0])) <= xtol) and (np.max(np.abs(values[1:] - values[0])) <= ftol):
+                state.terminate("xtol_ftol")
+                break
+
+            centroid = np.mean(simplex[:-1], axis=0)
+            direction = centroid - simplex[-1]
+
+            x_reflection = centroid + rho * direction
+            x_expansion = centroid + rho * chi * direction
+            x_outside_contraction = centroid + psi * rho * direction
+            x_inside_contraction = centroid - psi * direction
+
+            if speculative:
+                candidates = np.array([x_reflection, x_expansion, x_outside_contraction, x_inside_contraction])
+                f_reflection, f_expansion, f_outside_contraction, f_inside_contraction = objective_function(candidates.T)
+            else:
+                f_reflection = objective_function(x_reflection)
+
+            shrink = False
+
+            if f_reflection < values[0]:
+                if not speculative:
+                    f_expansion = objective_function(x_expansion)
+
+                if f_expansion < f_reflection:
+                    simplex[-1], values[-1] = x_expansion, f_expansion
+                else:
+                    simplex[-1], values[-1] = x_reflection, f_reflection
+
+            elif f_reflection < values[-2]:
+                simplex[-1], values[-1] = x_reflection, f_reflection
+
+            elif f_reflection < values[-1]:
+                if not speculative:
+                    f_outside_contraction = objective_function(x_outside_contraction)
+
+                if f_outside_contraction <= f_reflection:
+                    simplex[-1], values[-1] = x_outside_contraction, f_outside_contraction
+                else:
+                    shrink = True
+
+            else:
+                if not speculative:
+                    f_inside_contraction = objective_function(x_inside_contraction)
+
+                if f_inside_contraction < values[-1]:
+                    simplex[-1], values[-1] = x_inside_contraction, f_inside_contraction
+                else:
+                    shrink = True
+
+            if shrink:
+                simplex[1:] = simplex[0] + sigma * (simplex[1:] - simplex[0])
+                values[1:] = objective_function(simplex[1:].T)
+
+            best_index = values.argmin()
+            state.update(simplex[best_index], values[best_index])
+
+            if state.stop():
+                break
+
+        best_index = values.argmin()
+        return state.result(x=simplex[best_index].copy(), fx=values[best_index])
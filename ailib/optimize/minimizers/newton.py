@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__all__ = ['Newton',
+           'TrustRegionNewtonCG']
+
+import numpy as np
+
+from .optimizer import Optimizer
+from .line_search import armijo_backtracking
+from .stopping import OptimizationState
+
+
+def _modified_cholesky(hess, beta=1e-3, max_iterations=60):
+    """Cholesky factorization of `hess + tau I` with the smallest `tau` found.
+
+    `tau` is zero if `hess` is positive definite, otherwise it is increased
+    geometrically until the factorization succeeds (Nocedal and Wright,
+    algorithm 3.3).
+
+    Returns
+    -------
+    tuple
+        The factorization (as returned by `scipy.linalg.cho_factor`) and
+        `tau`.
+    """
+    import scipy.linalg
+
+    min_diagonal = np.min(np.diag(hess))
+    tau = 0. if min_diagonal > 0. else beta - min_diagonal
+    identity = np.eye(hess.shape[0])
+
+    for iteration_index in range(max_iterations):
+        try:
+            return scipy.linalg.cho_factor(hess + tau * identity), tau
+        except np.linalg.LinAlgError:
+            tau = max(2. * tau, beta)
+
+    raise np.linalg.LinAlgError("Cannot make the Hessian matrix positive definite.")
+
+
+def _steihaug_cg(hess, nabla, radius, tol, max_iterations):
+    r"""Approximately solve the trust-region subproblem with conjugate gradients.
+
+    Minimize :math:`g^T p + 1/2 p^T H p` subject to :math:`\|p\| \leq \Delta`
+    using only Hessian-vector products (Steihaug-Toint truncated CG).
+
+    Returns
+    -------
+    tuple
+        The step `p` and a boolean telling whether `p` lies on the boundary
+        of the trust region.
+    """
+    z = np.zeros(nabla.shape)
+    r = nabla.copy()
+    d = -r
+    rr = np.dot(r, r)
+
+    if np.sqrt(rr) < tol:
+        return z, False
+
+    def to_boundary(z, d):
+        # The positive tau such that ||z + tau d|| = radius
+        a = np.dot(d, d)
+        b = 2. * np.dot(z, d)
+        c = np.dot(z, z) - radius**2
+        tau = (-b + np.sqrt(b**2 - 4. * a * c)) / (2. * a)
+        return z + tau * d
+
+    for iteration_index in range(max_iterations):
+        hess_d = np.dot(hess, d)
+        curvature = np.dot(d, hess_d)
+
+        if curvature <= 0.:
+            # Negative curvature direction: go to the boundary
+            return to_boundary(z, d), True
+
+        alpha = rr / curvature
+        z_next = z + alpha * d
+
+        if np.linalg.norm(z_next) >= radius:
+            return to_boundary(z, d), True
+
+        r += alpha * hess_d
+        rr_next = np.dot(r, r)
+
+        if np.sqrt(rr_next) < tol:
+            return z_next, False
+
+        d = -r + (rr_next / rr) * d
+        z, rr = z_next, rr_next
+
+    return z, False
+
+
+class Newton(Optimizer):
+    r"""Damped Newton optimizer.
+
+    The search direction is the Newton direction
+    :math:`\boldsymbol{d} = - \left( \nabla^2 f(\boldsymbol{x}) + \tau I \right)^{-1} \nabla f(\boldsymbol{x})`
+    where :math:`\tau \geq 0` is the smallest shift making the Hessian matrix
+    positive definite (modified Cholesky factorization). The step length is
+    computed with an Armijo backtracking line search starting from the full
+    Newton step, which gives quadratic local convergence on smooth functions.
+
+    The Cholesky factorization can be reused for several iterations
+    (`refactorization_period` > 1) to save Hessian evaluations and
+    factorizations (the so-called *chord* or *Shamanskii* method).
+
+    See:
+    * https://en.wikipedia.org/wiki/Newton%27s_method_in_optimization
+    * J. Nocedal and S. Wright, *Numerical Optimization*, 2nd ed., chapter 3.4.
+
+    Examples
+    --------
+    >>> from ailib.optimize.functions.unconstrained import Rosenbrock
+    >>> res = Newton().minimize(Rosenbrock(2), x_init=np.array([-1.2, 1.]))
+    >>> res.termination_reason, np.round(res.x, 6), res.nhev
+    ('gtol', array([1., 1.]), 21)
+
+    Reusing the factorization saves Hessian evaluations:
+
+    >>> res = Newton().minimize(Rosenbrock(2), x_init=np.array([-1.2, 1.]), refactorization_period=3)
+    >>> res.termination_reason, np.round(res.x, 6), res.nhev
+    ('gtol', array([1., 1.]), 15)
+    """
+
+    optimizer_name = "damped Newton"
+
+    def minimize(self,
+                 objective_function,
+                 num_iterations=100,
+                 x_init=None,
+                 gtol=1e-8,
+                 refactorization_period=1,
+                 c1=1e-4,
+                 stopping_criteria=None,
+                 record_history=False):
+        """Minimize `objective_function` with the damped Newton method.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize. It should have a `gradient` and a
+            `hessian` method.
+        num_iterations : int
+            The maximum number of iterations.
+        x_init : ndarray
+            The initial point (a 1D numpy array). If `None`, it is uniformly
+            drawn within `objective_function.bounds`.
+        gtol : float
+            The optimization is stopped when the euclidean norm of the
+            gradient is smaller than `gtol`.
+        refactorization_period : int
+            The number of iterations a Hessian factorization is reused for.
+        c1 : float
+            The sufficient decrease parameter of the line search.
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`).
+        record_history : bool
+            Keep an history of visited points and values in the result (keys
+            `'x'` and `'fx'`).
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization.
+        """
+
+        import scipy.linalg
+
+        if x_init is None:
+            x = np.random.uniform(objective_function.bounds[0], objective_function.bounds[1], objective_function.ndim)
+        else:
+            x = np.array(x_init, dtype=np.float64)
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        fx = objective_function(x)
+        factorization = None
+        factorization_age = 0
+
+        for iteration_index in range(num_iterations):
+
+            nabla = objective_function.gradient(x)
+
+            if np.linalg.norm(nabla) <= gtol:
+                state.terminate("gtol")
+                break
+
+            if (factorization is None) or (factorization_age >= refactorization_period):
+                factorization, _ = _modified_cholesky(objective_function.hessian(x))
+                factorization_age = 0
+
+            direction = -scipy.linalg.cho_solve(factorization, nabla)
+            alpha, fx_new = armijo_backtracking(objective_function, x, fx, nabla, direction, alpha_init=1., c1=c1)
+
+            if alpha <= 0.:
+                if factorization_age > 0:
+                    # The reused factorization is too old: refresh it
+                    factorization = None
+                    continue
+                state.terminate("line_search_failure")
+                break
+
+            x = x + alpha * direction
+            fx = fx_new
+            factorization_age += 1
+
+            state.update(x, fx)
+
+            if state.stop():
+                break
+
+        return state.result(x=x, fx=fx)
+
+
+class TrustRegionNewtonCG(Optimizer):
+    r"""Trust-region Newton-CG optimizer.
+
+    At each iteration, the quadratic model
+    :math:`m(\boldsymbol{p}) = f(\boldsymbol{x}) + \nabla f(\boldsymbol{x})^\top \boldsymbol{p} + \frac{1}{2} \boldsymbol{p}^\top \nabla^2 f(\boldsymbol{x}) \boldsymbol{p}`
+    is minimized within a ball of radius :math:`\Delta` with the Steihaug
+    conjugate gradient method (which only uses Hessian-vector products).
+    The radius is then updated according to the agreement between the model
+    and the objective function.
+
+    When the Hessian matrix is positive definite, its Cholesky factorization
+    gives the exact Newton step which is taken directly if it lies within the
+    trust region. The Hessian, its factorization and the Newton step are kept
+    while the iterate does not move, i.e. they are reused after a rejected
+    step instead of being recomputed.
+
+    See:
+    * https://en.wikipedia.org/wiki/Trust_region
+    * J. Nocedal and S. Wright, *Numerical Optimization*, 2nd ed., chapters 4 and 7.2.
+
+    Examples
+    --------
+    >>> from ailib.optimize.functions.unconstrained import Rosenbrock
+    >>> res = TrustRegionNewtonCG().minimize(Rosenbrock(2), x_init=np.array([-1.2, 1.]))
+    >>> res.termination_reason, np.round(res.x, 6)
+    ('gtol', array([1., 1.]))
+    """
+
+    optimizer_name = "trust-region Newton-CG"
+
+    def minimize(self,
+                 objective_function,
+                 num_iterations=100,
+                 x_init=None,
+                 initial_radius=1.,
+                 max_radius=1000.,
+                 eta=0.15,
+                 gtol=1e-8,
+                 use_cholesky=True,
+                 stopping_criteria=None,
+                 record_history=False):
+        r"""Minimize `objective_function` with the trust-region Newton-CG method.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize. It should have a `gradient` and a
+            `hessian` method.
+        num_iterations : int
+            The maximum number of iterations.
+        x_init : ndarray
+            The initial point (a 1D numpy array). If `None`, it is uniformly
+            drawn within `objective_function.bounds`.
+        initial_radius : float
+            The initial trust-region radius :math:`\Delta_0`.
+        max_radius : float
+            The largest trust-region radius.
+        eta : float
+            A step is accepted if the ratio between the actual and the
+            predicted reduction is larger than `eta` (:math:`0 \leq \eta < 1/4`).
+        gtol : float
+            The optimization is stopped when the euclidean norm of the
+            gradient is smaller than `gtol`.
+        use_cholesky : bool
+            Try to factorize the Hessian matrix to compute the exact Newton
+            step.
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`).
+        record_history : bool
+            Keep an history of visited points and values in the result (keys
+            `'x'` and `'fx'`).
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization.
+        """
+
+        import scipy.linalg
+
+        if x_init is None:
+            x = np.random.uniform(objective_function.bounds[0], objective_function.bounds[1], objective_function.ndim)
+        else:
+            x = np.array(x_init, dtype=np.float64)
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        radius = initial_radius
+
+        fx = objective_function(x)
+        nabla = objective_function.gradient(x)
+        hess = objective_function.hessian(x)
+        newton_step = None      # Cached until x moves
+        newton_step_computed = False
+
+        for iteration_index in range(num_iterations):
+
+            nabla_norm = np.linalg.norm(nabla)
+
+            if nabla_norm <= gtol:
+                state.terminate("gtol")
+                break
+
+            if use_cholesky and not newton_step_computed:
+                try:
+                    factorization = scipy.linalg.cho_factor(hess)
+                    newton_step = -scipy.linalg.cho_solve(factorization, nabla)
+                except np.linalg.LinAlgError:
+                    newton_step = None
+                newton_step_computed = True
+
+            if (newton_step is not None) and (np.linalg.norm(newton_step) <= radius):
+                step, on_boundary = newton_step, False
+            else:
+                cg_tol = min(0.5, np.sqrt(nabla_norm)) * nabla_norm
+                step, on_boundary = _steihaug_cg(hess, nabla, radius, cg_tol, max_iterations=2 * x.shape[0])
+
+            predicted_reduction = -(np.dot(nabla, step) + 0.5 * np.dot(step, np.dot(hess, step)))
+            fx_new = objective_function(x + step)
+            actual_reduction = fx - fx_new
+
+            if predicted_reduction > 0.:
+                ratio = actual_reduction / predicted_reduction
+            else:
+                ratio = -1.
+
+            # Update the trust-region radius
+            if ratio < 0.25:
+                radius = 0.25 * np.linalg.norm(step)
+            elif ratio > 0.75 and on_boundary:
+                radius = min(2. * radius, max_radius)
+
+            # Accept or reject the step
+            if ratio > eta:
+                x = x + step
+                fx = fx_new
+                nabla = objective_function.gradient(x)
+                hess = objective_function.hessian(x)
+                newton_step_computed = False
+
+            state.update(x, fx, radius=radius)
+
+            if radius <= np.finfo(np.float64).eps * max(1., np.linalg.norm(x)):
+                state.terminate("xtol")
+                break
+
+            if state.stop():
+                break
+
+        return state.result(x=x, fx=fx)
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+r"""
+NSGA-II multi-objective optimizer.
+
+The objective function returns one row per objective: an array of shape
+`(nobj, n)` for a batch of `n` points (see
+`ailib.optimize.functions.multiobjective`). All objectives are minimized.
+
+The non-dominated sorting and the crowding distance are computed for the
+whole population at once with NumPy:
+
+* `non_dominated_sort` computes the dominance relation of all pairs of
+  individuals as a boolean matrix (one broadcasted comparison per objective)
+  then peels the fronts one after the other; with two objectives and large
+  populations, a sort-based sweep (:math:`O(n \log n)`) is used instead of
+  the :math:`O(n^2)` matrix;
+* `crowding_distance` sorts each objective once (fronts being sorted
+  together) and computes the distances of all individuals with vectorized
+  differences.
+
+See:
+* K. Deb, A. Pratap, S. Agarwal and T. Meyarivan, "A fast and elitist
+  multiobjective genetic algorithm: NSGA-II", IEEE Trans. Evol. Comput.
+  6(2), 182-197 (2002).
+* X. Zhang, Y. Tian, R. Cheng and Y. Jin, "An efficient approach to
+  nondominated sorting for evolutionary multiobjective optimization", IEEE
+  Trans. Evol. Comput. 19(2), 201-213 (2015).
+"""
+
+__all__ = ['non_dominated_sort',
+           'crowding_distance',
+           'NSGA2']
+
+import numpy as np
+
+from .optimizer import Optimizer
+from .stopping import OptimizationState
+from .checkpoint import CheckpointWriter, restore_checkpoint
+
+# Above this population size, the sweep is used for bi-objective problems
+_SWEEP_THRESHOLD = 500
+
+
+def _dominance_matrix(fx):
+    """The `(n, n)` boolean matrix `D` such that `D[i, j]` is `True` if `i` dominates `j`."""
+    not_worse = np.ones((fx.shape[1], fx.shape[1]), dtype=bool)
+    better = np.zeros((fx.shape[1], fx.shape[1]), dtype=bool)
+
+    for fk in fx:
+        not_worse &= fk[:, np.newaxis] <= fk[np.newaxis, :]
+        better |= fk[:, np.newaxis] < fk[np.newaxis, :]
+
+    return not_worse & better
+
+
+def _non_dominated_sort_matrix(fx):
+    dominates = _dominance_matrix(fx)
+
+    ranks = np.empty(fx.shape[1], dtype=np.int64)
+    num_dominators = dominates.sum(axis=0)
+
+    rank = 0
+    front = np.flatnonzero(num_dominators == 0)
+
+    while front.size > 0:
+        ranks[front] = rank
+        num_dominators -= dominates[front].sum(axis=0)
+        num_dominators[front] = -1
+        front = np.flatnonzero(num_dominators == 0)
+        rank += 1
+
+    return ranks
+
+
+def _non_dominated_sort_sweep(fx):
+    # Individuals are visited by increasing f1 (then f2): an individual can
+    # only be dominated by the already visited ones. The last individual
+    # added to a front has the smallest f2 of this front, and these values
+    # increase with the rank, thus the front of each individual is found by
+    # binary search (efficient non-dominated sort, ENS-BS).
+    f1, f2 = fx
+    order = np.lexsort((f2, f1))
+
+    ranks = np.empty(fx.shape[1], dtype=np.int64)
+    last_f1 = []
+    last_f2 = []
+
+    for index in order.tolist():
+        x1, x2 = f1[index], f2[index]
+
+        low, high = 0, len(last_f2)
+        while low < high:
+            middle = (low + high) // 2
+            if last_f2[middle] < x2 or (last_f2[middle] == x2 and last_f1[middle] < x1):
+                low = middle + 1          # Dominated by this front
+            else:
+                high = middle
+
+        if low == len(last_f2):
+            last_f1.append(x1)
+            last_f2.append(x2)
+        else:
+            last_f1[low] = x1
+            last_f2[low] = x2
+
+        ranks[index] = low
+
+    return ranks
+
+
+def non_dominated_sort(fx, method='auto'):
+    """Rank individuals by non-domination (fast non-dominated sorting).
+
+    Parameters
+    ----------
+    fx : ndarray
+        The `(nobj, n)` array of the objective values of the `n` individuals.
+    method : str
+        `'matrix'` (dominance matrix), `'sweep'` (sort-based, two objectives
+        only) or `'auto'` (the sweep for large bi-objective populations, the
+        matrix otherwise).
+
+    Returns
+    -------
+    ndarray
+        The rank of each individual: 0 for the Pareto front (the
+        non-dominated individuals), 1 for the front dominated only by the
+        Pareto front, and so on.
+
+    Examples
+    --------
+    >>> non_dominated_sort(np.array([[1., 2., 3., 2., 3.], [3., 2., 1., 3., 3.]]))
+    array([0, 0, 0, 1, 2])
+    """
+
+    fx = np.asarray(fx, dtype=np.float64)
+
+    if fx.ndim != 2:
+        raise ValueError("fx must be a (nobj, n) array.")
+
+    if method == 'auto':
+        method = 'sweep' if (fx.shape[0] == 2 and fx.shape[1] > _SWEEP_THRESHOLD) else 'matrix'
+
+    if method == 'matrix':
+        return _non_dominated_sort_matrix(fx)
+    elif method == 'sweep':
+        if fx.shape[0] != 2:
+            raise ValueError("The sweep method only applies to two objectives.")
+        return _non_dominated_sort_sweep(fx)
+    else:
+        raise ValueError("Unknown method {}.".format(method))
+
+
+def crowding_distance(fx, ranks):
+    """The crowding distance of each individual within its front.
+
+    Parameters
+    ----------
+    fx : ndarray
+        The `(nobj, n)` array of the objective values of the `n` individuals.
+    ranks : ndarray
+        The front of each individual (as returned by `non_dominated_sort`).
+
+    Returns
+    -------
+    ndarray
+        The crowding distance of each individual (infinite for the extreme
+        individuals of each front).
+
+    Examples
+    --------
+    >>> crowding_distance(np.array([[1., 2., 4.], [4., 2., 1.]]), np.zeros(3, dtype=int))
+    array([inf,  2., inf])
+    """
+
+    fx = np.asarray(fx, dtype=np.float64)
+    ranks = np.asarray(ranks)
+
+    distances = np.zeros(fx.shape[1])
+
+    if fx.shape[1] == 0:
+        return distances
+
+    for fk in fx:
+        # Sort by front then by objective value
+        order = np.lexsort((fk, ranks))
+        sorted_fk = fk[order]
+        sorted_ranks = ranks[order]
+
+        front_change = sorted_ranks[1:] != sorted_ranks[:-1]
+        is_first = np.concatenate([[True], front_change])
+        is_last = np.concatenate([front_change, [True]])
+
+        # Objective range of the front of each individual
+        front_index = np.cumsum(is_first) - 1
+        span = (sorted_fk[is_last] - sorted_fk[is_first])[front_index]
+
+        sorted_distances = np.zeros(fx.shape[1])
+        inner = ~(is_first | is_last)
+        gap = np.zeros(fx.shape[1])
+        gap[1:-1] = sorted_fk[2:] - sorted_fk[:-2]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sorted_distances[inner] = np.where(span[inner] > 0., gap[inner] / span[inner], 0.)
+        sorted_distances[is_first | is_last] = np.inf
+
+        distances[order] += sorted_distances
+
+    return distances
+
+
+class NSGA2(Optimizer):
+    """NSGA-II multi-objective optimizer.
+
+    Offspring are made by binary tournament selection (on the rank, then on
+    the crowding distance), simulated binary crossover (SBX) and polynomial
+    mutation. Parents and offspring are then merged and the best `pop_size`
+    individuals (by rank, then by crowding distance) make the next
+    population. The offspring of a generation are evaluated with a single
+    (batched) call to the objective function.
+
+    The optimizer can also be driven step by step with the ask/tell
+    interface: `initialize` makes the initial population, `ask` returns the
+    `(ndim, pop_size)` array of individuals to evaluate (the initial
+    population first, then the offspring of each generation) and `tell`
+    gives their `(nobj, pop_size)` values back to the optimizer.
+    """
+
+    optimizer_name = "NSGA-II"
+
+    _checkpoint_attributes = ('pop', 'pop_fx', 'ranks', 'crowding')
+
+    def initialize(self,
+                   bounds,
+                   pop_size=100,
+                   crossover_probability=0.9,
+                   eta_crossover=15.,
+                   mutation_probability=None,
+                   eta_mutation=20.):
+        """Initialize the population (ask/tell interface).
+
+        Parameters
+        ----------
+        bounds : ndarray
+            The `(2, ndim)` array of lower (first row) and upper (second row)
+            bounds.
+        pop_size : int
+            The population size.
+        crossover_probability : float
+            The probability to apply the crossover to a pair of parents.
+        eta_crossover : float
+            The distribution index of the SBX crossover (large values make
+            children close to their parents).
+        mutation_probability : float
+            The probability to mutate each variable (default: `1/ndim`).
+        eta_mutation : float
+            The distribution index of the polynomial mutation.
+        """
+
+        if pop_size < 2:
+            raise ValueError("NSGA-II requires at least 2 individuals.")
+
+        self.lower = np.asarray(bounds[0], dtype=np.float64)
+        self.upper = np.asarray(bounds[1], dtype=np.float64)
+        self.ndim = self.lower.shape[0]
+
+        self.pop_size = pop_size
+        self.crossover_probability = crossover_probability
+        self.eta_crossover = eta_crossover
+        self.mutation_probability = 1. / self.ndim if mutation_probability is None else mutation_probability
+        self.eta_mutation = eta_mutation
+
+        self.pop = np.random.uniform(self.lower, self.upper, size=[pop_size, self.ndim])
+        self.pop_fx = None
+        self.ranks = None
+        self.crowding = None
+
+    @property
+    def pareto_x(self):
+        """The `(ndim, k)` array of the non-dominated individuals of the population."""
+        return self.pop[self.ranks == 0].T.copy()
+
+    @property
+    def pareto_fx(self):
+        """The `(nobj, k)` array of the values of the non-dominated individuals."""
+        return self.pop_fx[:, self.ranks == 0].copy()
+
+    def _tournament(self, num_winners):
+        candidates = np.random.randint(self.pop_size, size=[2, num_winners])
+        ranks = self.ranks[candidates]
+        crowding = self.crowding[candidates]
+        second_wins = (ranks[1] < ranks[0]) | ((ranks[1] == ranks[0]) & (crowding[1] > crowding[0]))
+        return np.where(second_wins, candidates[1], candidates[0])
+
+    def ask(self):
+        """Make the offspring of the next generation.
+
+        Returns
+        -------
+        ndarray
+            The `(ndim, pop_size)` array of individuals to evaluate (the
+            initial population on the first call).
+        """
+
+        if self.pop_fx is None:
+            return self.pop.T.copy()
+
+        num_pairs = (self.pop_size + 1) // 2
+        lower, upper = self.lower, self.upper
+
+        parents_1 = self.pop[self._tournament(num_pairs)]
+        parents_2 = self.pop[self._tournament(num_pairs)]
+
+        # Simulated binary crossover ###################
+
+        u = np.random.uniform(size=[num_pairs, self.ndim])
+        beta = np.where(u <= 0.5,
+                        (2. * u)**(1. / (self.eta_crossover + 1.)),
+                        (1. / (2. * (1. - u)))**(1. / (self.eta_crossover + 1.)))
+
+        # Each variable of the crossed pairs is exchanged with probability 0.5
+        crossed = np.random.uniform(size=[num_pairs, 1]) < self.crossover_probability
+        crossed = crossed & (np.random.uniform(size=[num_pairs, self.ndim]) < 0.5)
+        beta = np.where(crossed, beta, 1.)
+
+        children = np.concatenate([0.5 * ((1. + beta) * parents_1 + (1. - beta) * parents_2),
+                                   0.5 * ((1. - beta) * parents_1 + (1. + beta) * parents_2)])
+        children = children[:self.pop_size]
+
+        # Polynomial mutation ##########################
+
+        u = np.random.uniform(size=children.shape)
+        delta = np.where(u < 0.5,
+                         (2. * u)**(1. / (self.eta_mutation + 1.)) - 1.,
+                         1. - (2. * (1. - u))**(1. / (self.eta_mutation + 1.)))
+        mutated = np.random.uniform(size=children.shape) < self.mutation_probability
+        children = children + np.where(mutated, delta * (upper - lower), 0.)
+
+        children = np.clip(children, lower, upper)
+
+        return children.T.copy()
+
+    def tell(self, x, fx):
+        """Select the individuals of the next generation.
+
+        Parameters
+        ----------
+        x : ndarray
+            The `(ndim, pop_size)` array returned by `ask`.
+        fx : ndarray
+            The `(nobj, pop_size)` array of the objective values at `x`.
+        """
+
+        offspring = np.asarray(x, dtype=np.float64).T
+        offspring_fx = np.asarray(fx, dtype=np.float64)
+
+        if offspring.shape != (self.pop_size, self.ndim) or offspring_fx.ndim != 2 or offspring_fx.shape[1] != self.pop_size:
+            raise ValueError("The batch doesn't match the last asked individuals.")
+
+        if self.pop_fx is None:
+            self.pop = offspring.copy()
+            self.pop_fx = offspring_fx.copy()
+            self.ranks = non_dominated_sort(self.pop_fx)
+            self.crowding = crowding_distance(self.pop_fx, self.ranks)
+            return
+
+        # Elitist selection among parents and offspring
+        merged = np.concatenate([self.pop, offspring])
+        merged_fx = np.concatenate([self.pop_fx, offspring_fx], axis=1)
+        merged_ranks = non_dominated_sort(merged_fx)
+        merged_crowding = crowding_distance(merged_fx, merged_ranks)
+
+        selected = np.lexsort((-merged_crowding, merged_ranks))[:self.pop_size]
+
+        self.pop = merged[selected]
+        self.pop_fx = merged_fx[:, selected]
+        self.ranks = merged_ranks[selected]
+        self.crowding = merged_crowding[selected]
+
+    def minimize(self,
+                 objective_function,
+                 num_gen=100,
+                 pop_size=100,
+                 crossover_probability=0.9,
+                 eta_crossover=15.,
+                 mutation_probability=None,
+                 eta_mutation=20.,
+                 bounds=None,
+                 stopping_criteria=None,
+                 record_history=False,
+                 checkpoint=None,
+                 checkpoint_period=100):
+        """Minimize the objectives of `objective_function` with NSGA-II.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize: it takes a `(ndim, n)` array and
+            returns the `(nobj, n)` array of objective values.
+        num_gen : int
+            The number of generations (the number of evaluations is
+            `pop_size * (num_gen + 1)`).
+        bounds : ndarray
+            The `(2, ndim)` array of lower (first row) and upper (second row)
+            bounds (default: `objective_function.bounds`).
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`). Criteria on the objective
+            value (e.g. `TargetValue`) don't apply.
+        record_history : bool
+            Keep the population (key `'x'`) and the size of its Pareto front
+            (key `'front_size'`) at each generation in the result history.
+        checkpoint : str
+            The path of a checkpoint file (`.npz`). If set, the state of the
+            run is saved every `checkpoint_period` generations (and at the end)
+            and, if the file already exists, the run is resumed from it (see
+            `ailib.optimize.minimizers.checkpoint`).
+        checkpoint_period : int
+            The number of generations between two checkpoints.
+
+        The other parameters are described in `initialize`.
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization: `x` is the `(ndim, k)` array of
+            the non-dominated individuals of the final population and `fx`
+            the `(nobj, k)` array of their values.
+        """
+
+        if bounds is None:
+            bounds = objective_function.bounds
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        self.initialize(bounds,
+                        pop_size=pop_size,
+                        crossover_probability=crossover_probability,
+                        eta_crossover=eta_crossover,
+                        mutation_probability=mutation_probability,
+                        eta_mutation=eta_mutation)
+
+        if (checkpoint is None) or not restore_checkpoint(checkpoint, self, state):
+            # Evaluate the initial population
+            x = self.ask()
+            self.tell(x, objective_function(x))
+
+        with CheckpointWriter(checkpoint, checkpoint_period) as writer:
+            for gen in range(state.nit, num_gen):
+                x = self.ask()
+                self.tell(x, objective_function(x))
+
+                state.update(self.pop.T, front_size=np.count_nonzero(self.ranks == 0))
+
+                writer.update(self, state)
+
+                if state.stop():
+                    break
+
+            writer.update(self, state, force=True)
+
+        return state.result(x=self.pareto_x, fx=self.pareto_fx)
@@ -23,6 +23,8 @@
 import numpy as np
 import warnings
 
+from ...utils.grid import evaluate_grid
+
 class Optimizer(object):
     """
     Optimizer class.
@@ -31,9 +33,44 @@ class Optimizer(object):
 
     optimizer_name = "unknown"
 
+    # The attributes saved in checkpoints (see `get_state`)
+    _checkpoint_attributes = ()
+
     def __init__(self):
         self.log = Log()
 
+    def get_state(self):
+        """Return a copy of the internal state of the optimizer.
+
+        Only the attributes that change during the optimization (listed in
+        `_checkpoint_attributes`) are returned; the settings are given again
+        to `initialize` when the optimization is resumed.
+
+        Returns
+        -------
+        dict
+            The state of the optimizer (a dictionary of numpy arrays).
+        """
+        state = {}
+        for name in self._checkpoint_attributes:
+            value = getattr(self, name, None)
+            if value is not None:
+                state[name] = np.array(value, copy=True)
+        return state
+
+    def set_state(self, state):
+        """Restore a state returned by `get_state`.
+
+        Parameters
+        ----------
+        state : dict
+            The state of the optimizer.
+        """
+        for name in self._checkpoint_attributes:
+            if name in state:
+                value = np.asarray(state[name])
+                setattr(self, name, value.item() if value.ndim == 0 else value.copy())
+
     def plotSamples(self, x_hist_array, y_hist_array, nabla_hist_array=None, objective_function=None, save_filename=None):
         """
         Plot the objective function for x_hist_array and the evaluated points.
@@ -56,19 +93,17 @@ class Optimizer(object):
             if objective_function is not None:
                 # BUILD DATA
 
-                assert objective_function.domain_min.ndim == 1
-                assert objective_function.domain_max.ndim == 1
-                assert objective_function.domain_min.shape[0] == 1
-                assert objective_function.domain_max.shape[0] == 1
+                bounds = np.asarray(objective_function.bounds)
+                assert bounds.shape == (2, 1), bounds.shape
 
-                xmin = objective_function.domain_min[0]
-                xmax = objective_function.domain_max[0]
+                xmin = bounds[0, 0]
+                xmax = bounds[1, 0]
                 assert xmin < xmax
 
                 xstep = (xmax - xmin) / 1000.
 
                 x_vec = np.arange(xmin, xmax, xstep)
-                y_vec = objective_function(x_vec.reshape([-1, 1]))
+                y_vec = objective_function(x_vec.reshape([1, -1]))      # One point per column
                 ax.plot(x_vec, y_vec, "-", label="objective function")
 
             # PLOT VISITED POINTS
@@ -103,50 +138,32 @@ class Optimizer(object):
             # 2D case
 
             from mpl_toolkits.mplot3d import axes3d
-            if objective_function is not None:
-                from mpl_toolkits.mplot3d import axes3d
-                from matplotlib import cm
+            from matplotlib import cm
 
             fig = plt.figure()
-
-            if objective_function is not None:
-                ax = fig.gca(projection='3d')
-            else:
-                ax = axes3d.Axes3D(fig)
+            ax = fig.add_subplot(111, projection='3d')
 
             # PLOT THE OBJECTIVE FUNCTION 
 
             if objective_function is not None:
                 # BUILD DATA
 
-                assert objective_function.domain_min.ndim == 1
-                assert objective_function.domain_max.ndim == 1
-                assert objective_function.domain_min.shape[0] == 2
-                assert objective_function.domain_max.shape[0] == 2
+                bounds = np.asarray(objective_function.bounds)
+                assert bounds.shape == (2, 2), bounds.shape
 
-                x1min = objective_function.domain_min[0]
-                x1max = objective_function.domain_max[0]
+                x1min = bounds[0, 0]
+                x1max = bounds[1, 0]
                 assert x1min < x1max
 
-                x2min = objective_function.domain_min[1]
-                x2max = objective_function.domain_max[1]
+                x2min = bounds[0, 1]
+                x2max = bounds[1, 1]
                 assert x2min < x2max
 
-                x1step = (x1max - x1min) / 200.
-                x2step = (x2max - x2min) / 200.
-
-                range_x1 = np.arange(x1min, x1max, x1step)
-                range_x2 = np.arange(x2min, x2max, x2step)
-
-                mesh_x1,mesh_x2 = np.meshgrid(range_x1, range_x2)
-
-                # TODO: take advantage of meshgrid, for now, it's not optimized at
-                #       all and not very well written
-                z = np.zeros(mesh_x1.shape)         
-                for x1i in range(z.shape[0]):
-                    for x2i in range(z.shape[1]):
-                        point = np.array([mesh_x1[x1i, x2i], mesh_x2[x1i, x2i]])
-                        z[x1i, x2i] = objective_function(point)
+                mesh_x1, mesh_x2, z = evaluate_grid(objective_function,
+                                                    bounds[0],
+                                                    bounds[1],
+                                                    num_points=200,
+                                                    layout="columns")
 
                 # PLOT
                 ax.plot_surface(mesh_x1, mesh_x2, z, rstride=5, cstride=5, alpha=0.3)
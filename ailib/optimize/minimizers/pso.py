@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__all__ = ['PSO']
+
+import numpy as np
+
+from .optimizer import Optimizer
+from .stopping import OptimizationState
+from .checkpoint import CheckpointWriter, restore_checkpoint
+
+class PSO(Optimizer):
+    r"""Particle swarm optimizer.
+
+    Each particle :math:`i` has a position :math:`\boldsymbol{x}_i`, a
+    velocity :math:`\boldsymbol{v}_i` and remembers the best position it has
+    visited :math:`\boldsymbol{p}_i`. At each iteration:
+
+    .. math::
+
+        \boldsymbol{v}_i \leftarrow w \boldsymbol{v}_i
+            + c_1 \boldsymbol{r}_1 \odot (\boldsymbol{p}_i - \boldsymbol{x}_i)
+            + c_2 \boldsymbol{r}_2 \odot (\boldsymbol{g}_i - \boldsymbol{x}_i)
+
+        \boldsymbol{x}_i \leftarrow \boldsymbol{x}_i + \boldsymbol{v}_i
+
+    where :math:`\boldsymbol{g}_i` is the best position visited by the
+    neighbours of particle :math:`i` and :math:`\boldsymbol{r}_1`,
+    :math:`\boldsymbol{r}_2` are uniformly drawn in :math:`[0, 1]^d`.
+
+    Two topologies are available: `'global'` (all particles are neighbours,
+    i.e. the *gbest* PSO) and `'ring'` (each particle is connected to its
+    `num_neighbours` left and right neighbours, i.e. the *lbest* PSO, which
+    is slower but less prone to premature convergence).
+
+    Positions, velocities and personal bests are stored as
+    `(num_particles, d)` arrays: an iteration is made of a few array
+    operations and a single (batched) call to the objective function.
+
+    The optimizer can also be driven step by step with the ask/tell
+    interface (e.g. when evaluations are done by an external scheduler)::
+
+        pso = PSO()
+        pso.initialize(bounds)
+        for iteration_index in range(100):
+            x = pso.ask()               # a (ndim, num_particles) array
+            pso.tell(x, f(x))
+        x_best, fx_best = pso.best_x, pso.best_fx
+
+    The first batch returned by `ask` is the initial swarm.
+
+    See:
+    * https://en.wikipedia.org/wiki/Particle_swarm_optimization
+    * M. Clerc and J. Kennedy, "The particle swarm - explosion, stability,
+      and convergence in a multidimensional complex space", IEEE Trans.
+      Evol. Comput. 6(1), 58-73 (2002) (default coefficients).
+
+    Examples
+    --------
+    >>> from ailib.optimize.functions.unconstrained import Rosenbrock, Sphere
+    >>> np.random.seed(0)
+    >>> res = PSO().minimize(Rosenbrock(2), num_iterations=300)
+    >>> np.round(res.x, 4), bool(res.fx < 1e-8)
+    (array([1., 1.]), True)
+
+    `minimize` and the ask/tell interface follow the same trajectory:
+
+    >>> sphere = Sphere(2)
+    >>> np.random.seed(0)
+    >>> res = PSO().minimize(sphere)
+    >>> np.random.seed(0)
+    >>> pso = PSO()
+    >>> pso.initialize(sphere.bounds)
+    >>> for iteration_index in range(100):
+    ...     x = pso.ask()
+    ...     pso.tell(x, sphere(x))
+    >>> bool(pso.best_fx == res.fx), bool(res.fx < 1e-8)
+    (True, True)
+    """
+
+    optimizer_name = "particle swarm optimization"
+
+    _checkpoint_attributes = ('positions', 'velocities', 'personal_best_positions', 'personal_best_values')
+
+    def initialize(self,
+                   bounds,
+                   num_particles=40,
+                   inertia=0.7298,
+                   cognitive_coefficient=1.49618,
+                   social_coefficient=1.49618,
+                   topology='global',
+                   num_neighbours=1,
+                   max_velocity=0.5):
+        """Initialize the swarm (ask/tell interface).
+
+        Parameters
+        ----------
+        bounds : ndarray
+            The `(2, ndim)` array of lower (first row) and upper (second row)
+            bounds. Particles are initialized within the bounds and kept
+            inside.
+        num_particles : int
+            The number of particles.
+        inertia : float
+            The inertia weight :math:`w`.
+        cognitive_coefficient : float
+            The acceleration coefficient :math:`c_1` toward the personal best.
+        social_coefficient : float
+            The acceleration coefficient :math:`c_2` toward the neighbourhood
+            best.
+        topology : str
+            The swarm topology: `'global'` or `'ring'`.
+        num_neighbours : int
+            The number of neighbours on each side of a particle (`'ring'`
+            topology only).
+        max_velocity : float
+            The maximum velocity of each coordinate, relative to the width of
+            the domain (`None` for no velocity clamping).
+        """
+
+        if topology not in ('global', 'ring'):
+            raise ValueError("Unknown topology {}.".format(topology))
+
+        self.lower = np.asarray(bounds[0], dtype=np.float64)
+        self.upper = np.asarray(bounds[1], dtype=np.float64)
+        self.ndim = self.lower.shape[0]
+
+        self.num_particles = num_particles
+        self.inertia = inertia
+        self.cognitive_coefficient = cognitive_coefficient
+        self.social_coefficient = social_coefficient
+        self.topology = topology
+
+        width = self.upper - self.lower
+
+        if max_velocity is not None:
+            self.velocity_limit = max_velocity * width
+        else:
+            self.velocity_limit = None
+
+        if topology == 'ring':
+            offsets = np.arange(-num_neighbours, num_neighbours + 1)
+            self.neighbour_indices = (np.arange(num_particles)[:, np.newaxis] + offsets) % num_particles
+
+        self.positions = np.random.uniform(self.lower, self.upper, size=[num_particles, self.ndim])
+        self.velocities = np.random.uniform(-width, width, size=[num_particles, self.ndim])
+
+        if self.velocity_limit is not None:
+            np.clip(self.velocities, -self.velocity_limit, self.velocity_limit, out=self.velocities)
+
+        self.personal_best_positions = None
+        self.personal_best_values = None
+
+    @property
+    def best_x(self):
+        """The best position found so far."""
+        return self.personal_best_positions[self.personal_best_values.argmin()].copy()
+
+    @property
+    def best_fx(self):
+        """The value of the best position found so far."""
+        return self.personal_best_values.min()
+
+    def ask(self):
+        """Move the particles and return their new positions.
+
+        Returns
+        -------
+        ndarray
+            The `(ndim, num_particles)` array of positions to evaluate (the
+            initial swarm on the first call).
+        """
+
+        if self.personal_best_values is None:
+            return self.positions.T.copy()
+
+        # Neighbourhood best ###########################
+
+        if self.topology == 'global':
+            best_index = self.personal_best_values.argmin()
+            neighbour_best_positions = self.personal_best_positions[best_index]
+        else:
+            local_best = self.personal_best_values[self.neighbour_indices].argmin(axis=1)
+            best_indices = self.neighbour_indices[np.arange(self.num_particles), local_best]
+            neighbour_best_positions = self.personal_best_positions[best_indices]
+
+        # Move particles ###############################
+
+        r1 = np.random.uniform(size=[self.num_particles, self.ndim])
+        r2 = np.random.uniform(size=[self.num_particles, self.ndim])
+
+        self.velocities *= self.inertia
+        self.velocities += self.cognitive_coefficient * r1 * (self.personal_best_positions - self.positions)
+        self.velocities += self.social_coefficient * r2 * (neighbour_best_positions - self.positions)
+
+        if self.velocity_limit is not None:
+            np.clip(self.velocities, -self.velocity_limit, self.velocity_limit, out=self.velocities)
+
+        self.positions += self.velocities
+
+        # Keep particles inside the bounds (and stop them on the walls)
+        out_of_bounds = (self.positions < self.lower) | (self.positions > self.upper)
+        np.clip(self.positions, self.lower, self.upper, out=self.positions)
+        self.velocities[out_of_bounds] = 0.
+
+        return self.positions.T.copy()
+
+    def tell(self, x, fx):
+        """Update the personal bests with the values of the last asked positions.
+
+        Parameters
+        ----------
+        x : ndarray
+            The `(ndim, num_particles)` array returned by `ask`.
+        fx : ndarray
+            The values of the objective function at `x`.
+        """
+
+        x = np.asarray(x, dtype=np.float64)
+        values = np.asarray(fx, dtype=np.float64)
+
+        if x.shape != (self.ndim, self.num_particles) or values.shape != (self.num_particles,):
+            raise ValueError("The batch doesn't match the last asked positions.")
+
+        self.positions = x.T.copy()
+
+        if self.personal_best_values is None:
+            self.personal_best_positions = self.positions.copy()
+            self.personal_best_values = values.copy()
+        else:
+            improved = values < self.personal_best_values
+            self.personal_best_positions[improved] = self.positions[improved]
+            self.personal_best_values[improved] = values[improved]
+
+    def minimize(self,
+                 objective_function,
+                 num_iterations=100,
+                 num_particles=40,
+                 inertia=0.7298,
+                 cognitive_coefficient=1.49618,
+                 social_coefficient=1.49618,
+                 topology='global',
+                 num_neighbours=1,
+                 bounds=None,
+                 max_velocity=0.5,
+                 stopping_criteria=None,
+                 record_history=False,
+                 checkpoint=None,
+                 checkpoint_period=100):
+        """Minimize `objective_function` with a particle swarm.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize.
+        num_iterations : int
+            The number of iterations (the number of evaluations is
+            `num_particles * (num_iterations + 1)`).
+        bounds : ndarray
+            The `(2, ndim)` array of lower (first row) and upper (second row)
+            bounds (default: `objective_function.bounds`).
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`).
+        record_history : bool
+            Keep the best position and the best value found at each iteration
+            in the result history (keys `'x'` and `'fx'`).
+        checkpoint : str
+            The path of a checkpoint file (`.npz`). If set, the state of the
+            run is saved every `checkpoint_period` iterations (and at the end)
+            and, if the file already exists, the run is resumed from it (see
+            `ailib.optimize.minimizers.checkpoint`).
+        checkpoint_period : int
+            The number of iterations between two checkpoints.
+
+        The other parameters are described in `initialize`.
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization.
+        """
+
+        if bounds is None:
+            bounds = objective_function.bounds
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        self.initialize(bounds,
+                        num_particles=num_particles,
+                        inertia=inertia,
+                        cognitive_coefficient=cognitive_coefficient,
+                        social_coefficient=social_coefficient,
+                        topology=topology,
+                        num_neighbours=num_neighbours,
+                        max_velocity=max_velocity)
+
+        if (checkpoint is None) or not restore_checkpoint(checkpoint, self, state):
+            # Evaluate the initial swarm
+            x = self.ask()
+            self.tell(x, objective_function(x))
+
+        with CheckpointWriter(checkpoint, checkpoint_period) as writer:
+            for iteration_index in range(state.nit, num_iterations):
+                x = self.ask()
+                self.tell(x, objective_function(x))
+
+                state.update(self.best_x, self.best_fx)
+
+                writer.update(self, state)
+
+                if state.stop():
+                    break
+
+            writer.update(self, state, force=True)
+
+        return state.result(x=self.best_x, fx=self.best_fx)
@@ -25,22 +25,241 @@ __all__ = ['Random']
 import numpy as np
 
 from .optimizer import Optimizer
+from .samplers import make_sampler
+from .stopping import OptimizationState
+from .checkpoint import CheckpointWriter, restore_checkpoint
 
 class Random(Optimizer):
-    
-    def minimize(self, objective_function, num_samples=1000, ndim=None, dmin=None, dmax=None):
+    """Random search optimizer.
+
+    Points are drawn in the box `[dmin, dmax]` with a (pseudo or quasi)
+    random sampler and the best one is returned.
+
+    In *streaming* mode (i.e. when `chunk_size` is set), samples are drawn
+    and evaluated by chunks of `chunk_size` points and only the best points
+    found so far are kept: the memory used by the optimizer does not depend
+    on `num_samples`.
+
+    The optimizer can also be driven step by step with the ask/tell
+    interface: `initialize` sets the box and the sampler, `ask` returns a
+    `(ndim, n)` array of points to evaluate and `tell` gives their values
+    back to the optimizer.
+
+    Examples
+    --------
+    With a quasi-random sampler, the streaming mode draws the same points as
+    the default mode:
+
+    >>> from ailib.optimize.functions.unconstrained import Sphere
+    >>> np.random.seed(0)
+    >>> res = Random().minimize(Sphere(2), num_samples=4096, sampler='sobol')
+    >>> np.random.seed(0)
+    >>> res_streaming = Random().minimize(Sphere(2), num_samples=4096, sampler='sobol', chunk_size=256)
+    >>> bool(res_streaming.fx == res.fx), res_streaming.nfev
+    (True, 4096)
+
+    The same search with the ask/tell interface:
+
+    >>> sphere = Sphere(2)
+    >>> np.random.seed(0)
+    >>> optimizer = Random()
+    >>> optimizer.initialize(2, -10., 10., sampler='sobol', batch_size=256, top_k=3)
+    >>> for iteration_index in range(16):
+    ...     x = optimizer.ask()
+    ...     optimizer.tell(x, sphere(x))
+    >>> bool(optimizer.best_fx == res.fx), optimizer.top_k_x.shape
+    (True, (2, 3))
+    """
+
+    optimizer_name = "random search"
+
+    _checkpoint_attributes = ('best_x', 'best_fx', 'top_k_x', 'top_k_fx', 'num_told_samples')
+
+    def initialize(self, ndim, dmin, dmax, sampler='uniform', batch_size=1000, top_k=None):
+        """Initialize the search (ask/tell interface).
+
+        Parameters
+        ----------
+        ndim : int
+            The number of dimensions of the solution space.
+        dmin : ndarray
+            The lower bounds of the box.
+        dmax : ndarray
+            The upper bounds of the box.
+        sampler : str or sampler object
+            The sampler used to draw points: `'uniform'`, `'sobol'`,
+            `'halton'`, `'lhs'` (see `ailib.optimize.minimizers.samplers`) or
+            a sampler object.
+        batch_size : int
+            The default number of points returned by `ask`.
+        top_k : int
+            If set, the `top_k` best points (and their value) are kept in
+            `top_k_x` (a `(ndim, top_k)` array) and `top_k_fx`.
+        """
+
+        self.ndim = ndim
+        self.sampler = make_sampler(sampler, ndim, dmin, dmax)
+        self.batch_size = batch_size
+        self.top_k = top_k
+
+        self.best_x = None
+        self.best_fx = np.inf
+        self.num_told_samples = 0
+
+        if top_k is not None:
+            self.top_k_x = np.zeros([ndim, 0])
+            self.top_k_fx = np.zeros(0)
+
+    def ask(self, num_samples=None):
+        """Draw points.
+
+        Parameters
+        ----------
+        num_samples : int
+            The number of points to draw (default: `batch_size`).
+
+        Returns
+        -------
+        ndarray
+            The `(ndim, num_samples)` array of points to evaluate.
+        """
+        if num_samples is None:
+            num_samples = self.batch_size
+
+        return self.sampler.sample(num_samples)
+
+    def tell(self, x, fx):
+        """Update the best points found so far.
+
+        Parameters
+        ----------
+        x : ndarray
+            A `(ndim, n)` array of points (returned by `ask`).
+        fx : ndarray
+            The values of the objective function at `x`.
+        """
+
+        x = np.asarray(x, dtype=np.float64)
+        y = np.atleast_1d(np.asarray(fx, dtype=np.float64))
+
+        if x.ndim != 2 or x.shape[0] != self.ndim or y.shape != (x.shape[1],):
+            raise ValueError("The batch doesn't match the asked points.")
+
+        self.num_told_samples += y.shape[0]
+
+        # Update the running argmin
+        argmin = y.argmin()
+        if y[argmin] < self.best_fx:
+            self.best_fx = y[argmin]
+            self.best_x = x[:, argmin].copy()
+
+        # Update the running top-k
+        if self.top_k is not None:
+            candidates_x = np.concatenate([self.top_k_x, x], axis=1)
+            candidates_y = np.concatenate([self.top_k_fx, y])
+            if candidates_y.shape[0] > self.top_k:
+                selected_indices = np.argpartition(candidates_y, self.top_k - 1)[:self.top_k]
+                candidates_x = candidates_x[:, selected_indices]
+                candidates_y = candidates_y[selected_indices]
+            sorted_indices = np.argsort(candidates_y)
+            self.top_k_x, self.top_k_fx = candidates_x[:, sorted_indices], candidates_y[sorted_indices]
+
+    def get_state(self):
+        state = super().get_state()
+        for key, value in self.sampler.get_state().items():
+            state['sampler.' + key] = value
+        return state
+
+    def set_state(self, state):
+        super().set_state(state)
+        self.sampler.set_state({key[len('sampler.'):]: value for key, value in state.items() if key.startswith('sampler.')})
+
+    def minimize(self, objective_function, num_samples=1000, ndim=None, dmin=None, dmax=None, sampler='uniform', chunk_size=None, top_k=None, stopping_criteria=None, record_history=False, checkpoint=None, checkpoint_period=100):
+        """Minimize `objective_function` with a random search.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize.
+        num_samples : int
+            The number of points to draw and evaluate.
+        ndim : int
+            The number of dimensions of the solution space (default:
+            `objective_function.ndim`).
+        dmin : ndarray
+            The lower bounds of the box (default:
+            `objective_function.bounds[0]`).
+        dmax : ndarray
+            The upper bounds of the box (default:
+            `objective_function.bounds[1]`).
+        sampler : str or sampler object
+            The sampler used to draw points: `'uniform'`, `'sobol'`,
+            `'halton'`, `'lhs'` (see `ailib.optimize.minimizers.samplers`) or
+            a sampler object.
+        chunk_size : int
+            The number of points drawn and evaluated at once. If `None`, all
+            points are drawn and evaluated in a single batch.
+        top_k : int
+            If set, the `top_k` best points (and their value) are kept in
+            the result (items `'top_k_x'`, a `(ndim, top_k)` array, and
+            `'top_k_fx'`), sorted by increasing value.
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`), checked after each chunk.
+        record_history : bool
+            Keep an history of the best point found so far and its value
+            after each chunk in the result (keys `'x'` and `'fx'`).
+        checkpoint : str
+            The path of a checkpoint file (`.npz`). If set, the state of the
+            search is saved every `checkpoint_period` chunks (and at the end)
+            and, if the file already exists, the search is resumed from it
+            (see `ailib.optimize.minimizers.checkpoint`).
+        checkpoint_period : int
+            The number of chunks between two checkpoints.
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization (`nit` is the number of chunks).
+        """
 
         if dmin is None:
-            dmin = objective_function.domain_min
+            dmin = objective_function.bounds[0]
 
         if dmax is None:
-            dmax = objective_function.domain_max
+            dmax = objective_function.bounds[1]
 
         if ndim is None:
             ndim = objective_function.ndim
-        
-        x_samples = np.random.uniform(dmin, dmax, [ndim, num_samples])
-        y_samples = objective_function(x_samples)
-        x_min = x_samples[:, y_samples.argmin()]
 
-        return x_min
+        if chunk_size is None:
+            chunk_size = num_samples
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        self.initialize(ndim, dmin, dmax, sampler=sampler, batch_size=chunk_size, top_k=top_k)
+
+        if checkpoint is not None:
+            restore_checkpoint(checkpoint, self, state)
+
+        with CheckpointWriter(checkpoint, checkpoint_period) as writer:
+            while self.num_told_samples < num_samples:
+                x = self.ask(min(chunk_size, num_samples - self.num_told_samples))
+                self.tell(x, objective_function(x))
+
+                state.update(self.best_x, self.best_fx)
+
+                writer.update(self, state)
+
+                if state.stop():
+                    break
+
+            writer.update(self, state, force=True)
+
+        if self.num_told_samples >= num_samples:
+            state.terminate("max_evaluations")
+
+        if top_k is None:
+            return state.result(x=self.best_x, fx=self.best_fx)
+
+        return state.result(x=self.best_x, fx=self.best_fx, top_k_x=self.top_k_x, top_k_fx=self.top_k_fx)
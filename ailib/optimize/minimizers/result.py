@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+The result object returned by minimizers.
+"""
+
+__all__ = ['OptimizeResult']
+
+
+class OptimizeResult(dict):
+    """The result of an optimization.
+
+    This is a dictionary whose items can also be accessed as attributes
+    (e.g. `res.x` or `res['x']`), in the manner of
+    `scipy.optimize.OptimizeResult`.
+
+    Attributes
+    ----------
+    x : ndarray
+        The solution of the optimization (a 1D numpy array).
+    fx : float
+        The value of the objective function at `x` (`None` if it has not been
+        evaluated).
+    nfev : int
+        The number of evaluations of the objective function.
+    ngev : int
+        The number of evaluations of the gradient of the objective function.
+    nhev : int
+        The number of evaluations of the Hessian of the objective function.
+    nit : int
+        The number of iterations (or generations) performed.
+    wall_time : float
+        The duration of the optimization (in seconds).
+    termination_reason : str
+        The reason why the optimization stopped.
+    history : dict
+        The history of the optimization (one item per iteration for each
+        recorded quantity), or `None` if it has not been recorded.
+
+    Examples
+    --------
+    >>> res = OptimizeResult(x=[0., 1.], fx=1.0, termination_reason='gtol')
+    >>> res.fx == res['fx']
+    True
+    >>> res
+                     fx: 1.0
+     termination_reason: 'gtol'
+                      x: [0.0, 1.0]
+    """
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError as e:
+            raise AttributeError(name) from e
+
+    __setattr__ = dict.__setitem__
+    __delattr__ = dict.__delitem__
+
+    def __repr__(self):
+        if not self:
+            return self.__class__.__name__ + "()"
+        width = max(map(len, self.keys())) + 1
+        lines = []
+        for key, value in sorted(self.items()):
+            if key == 'history' and value is not None:
+                value_str = "<history of " + ", ".join(sorted(value.keys())) + ">"
+            else:
+                value_str = repr(value)
+            lines.append(key.rjust(width) + ": " + value_str)
+        return "\n".join(lines)
+
+    def __dir__(self):
+        return list(self.keys())
@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+__all__ = ['SimulatedAnnealing',
+           'ExponentialCooling',
+           'LinearCooling',
+           'LogarithmicCooling',
+           'FastCooling']
+
+import math
+import numpy as np
+
+from .optimizer import Optimizer
+from .stopping import OptimizationState
+from .checkpoint import CheckpointWriter, restore_checkpoint
+
+# COOLING SCHEDULES ###########################################################
+
+class ExponentialCooling:
+    r"""Exponential (geometric) cooling schedule: :math:`T_k = T_0 \alpha^k`."""
+
+    def __init__(self, alpha=0.99):
+        self.alpha = alpha
+
+    def __call__(self, initial_temperature, iteration):
+        return initial_temperature * self.alpha**iteration
+
+
+class LinearCooling:
+    r"""Linear cooling schedule: :math:`T_k = T_0 (1 - k / K)` (with a small positive floor)."""
+
+    def __init__(self, num_iterations, min_temperature_ratio=1e-6):
+        self.num_iterations = num_iterations
+        self.min_temperature_ratio = min_temperature_ratio
+
+    def __call__(self, initial_temperature, iteration):
+        return initial_temperature * max(1. - iteration / self.num_iterations, self.min_temperature_ratio)
+
+
+class LogarithmicCooling:
+    r"""Logarithmic cooling schedule: :math:`T_k = T_0 / \log(k + e)`.
+
+    This is the (very slow) schedule for which convergence to the global
+    minimum is guaranteed.
+    """
+
+    def __call__(self, initial_temperature, iteration):
+        return initial_temperature / math.log(iteration + math.e)
+
+
+class FastCooling:
+    r"""Fast (Cauchy) cooling schedule: :math:`T_k = T_0 / (1 + k)`."""
+
+    def __call__(self, initial_temperature, iteration):
+        return initial_temperature / (1. + iteration)
+
+
+# SIMULATED ANNEALING #########################################################
+
+class SimulatedAnnealing(Optimizer):
+    r"""Simulated annealing optimizer with parallel chains.
+
+    Many independent Markov chains are advanced together: chain states are
+    the rows of a `(num_chains, d)` array so that, at each step, proposals,
+    their (batched) evaluation and the Metropolis acceptance test are made
+    for all chains at once.
+
+    A proposal :math:`\boldsymbol{x}'` of a chain at temperature :math:`T`
+    is accepted with probability
+    :math:`\min \left( 1, e^{-(f(\boldsymbol{x}') - f(\boldsymbol{x})) / T} \right)`.
+
+    Two modes are available:
+
+    * *annealing* (default): all chains share the temperature given by the
+      cooling schedule ;
+    * *parallel tempering* (replica exchange): each chain has a fixed
+      temperature of a geometric ladder and the states of neighbouring
+      chains are swapped with probability
+      :math:`\min \left( 1, e^{(1/T_i - 1/T_{i+1}) (f(\boldsymbol{x}_i) - f(\boldsymbol{x}_{i+1}))} \right)`
+      every `exchange_period` steps.
+
+    The optimizer can also be driven step by step with the ask/tell
+    interface: `initialize` makes the initial chains, `ask` returns the
+    `(ndim, num_chains)` array of points to evaluate (the initial states
+    first, then the proposals of each step) and `tell` gives their values
+    back to the optimizer.
+
+    See:
+    * https://en.wikipedia.org/wiki/Simulated_annealing
+    * https://en.wikipedia.org/wiki/Parallel_tempering
+
+    Examples
+    --------
+    >>> from ailib.optimize.functions.unconstrained import Rastrigin, Sphere
+    >>> np.random.seed(0)
+    >>> res = SimulatedAnnealing().minimize(Sphere(2))
+    >>> bool(res.fx < 1e-3), res.nfev
+    (True, 32032)
+
+    Parallel tempering escapes the local minima of the Rastrigin function:
+
+    >>> np.random.seed(0)
+    >>> res = SimulatedAnnealing().minimize(Rastrigin(2), parallel_tempering=True)
+    >>> bool(np.all(np.abs(res.x) < 1e-2)), bool(res.fx < 1e-3)
+    (True, True)
+    """
+
+    optimizer_name = "simulated annealing"
+
+    _checkpoint_attributes = ('x', 'y', 'best_x', 'best_fx', 'iteration', 'first_pair_index')
+
+    def initialize(self,
+                   bounds,
+                   num_chains=32,
+                   initial_temperature=1.,
+                   cooling_schedule='exponential',
+                   step_size=0.1,
+                   parallel_tempering=False,
+                   min_temperature=1e-3,
+                   exchange_period=1,
+                   num_iterations=None):
+        """Initialize the chains (ask/tell interface).
+
+        Parameters
+        ----------
+        bounds : ndarray
+            The `(2, ndim)` array of lower (first row) and upper (second row)
+            bounds. Chains are initialized within the bounds and kept inside.
+        num_chains : int
+            The number of chains.
+        initial_temperature : float
+            The initial temperature of the annealing (the highest temperature
+            of the ladder in parallel tempering mode).
+        cooling_schedule : str or callable object
+            The cooling schedule: `'exponential'`, `'linear'`,
+            `'logarithmic'`, `'fast'` or a callable object
+            `schedule(initial_temperature, iteration)` returning the
+            temperature of the given iteration. Not used in parallel
+            tempering mode.
+        step_size : float
+            The standard deviation of the gaussian proposals, relative to the
+            width of the domain. In parallel tempering mode, it is scaled by
+            the square root of the relative temperature of each chain.
+        parallel_tempering : bool
+            Use the parallel tempering mode.
+        min_temperature : float
+            The lowest temperature of the ladder (parallel tempering mode
+            only).
+        exchange_period : int
+            The number of steps between two replica exchanges (parallel
+            tempering mode only).
+        num_iterations : int
+            The planned number of steps (required by the `'linear'` cooling
+            schedule only).
+        """
+
+        if isinstance(cooling_schedule, str):
+            if cooling_schedule == 'exponential':
+                cooling_schedule = ExponentialCooling()
+            elif cooling_schedule == 'linear':
+                if num_iterations is None:
+                    raise ValueError("The linear cooling schedule requires num_iterations.")
+                cooling_schedule = LinearCooling(num_iterations)
+            elif cooling_schedule == 'logarithmic':
+                cooling_schedule = LogarithmicCooling()
+            elif cooling_schedule == 'fast':
+                cooling_schedule = FastCooling()
+            else:
+                raise ValueError("Unknown cooling schedule {}.".format(cooling_schedule))
+
+        self.lower = np.asarray(bounds[0], dtype=np.float64)
+        self.upper = np.asarray(bounds[1], dtype=np.float64)
+        self.ndim = self.lower.shape[0]
+
+        self.num_chains = num_chains
+        self.initial_temperature = initial_temperature
+        self.cooling_schedule = cooling_schedule
+        self.step_size = step_size
+        self.parallel_tempering = parallel_tempering
+        self.exchange_period = exchange_period
+
+        if parallel_tempering:
+            # Chain 0 is the coldest one
+            self.temperatures = np.geomspace(min_temperature, initial_temperature, num_chains)
+            self.step_sizes = step_size * np.sqrt(self.temperatures / initial_temperature)[:, np.newaxis] * (self.upper - self.lower)
+            self.first_pair_index = 0
+
+        self.iteration = 0
+
+        self.x = np.random.uniform(self.lower, self.upper, size=[num_chains, self.ndim])
+        self.y = None
+
+        self.best_x = None
+        self.best_fx = np.inf
+
+    def ask(self):
+        """Make a proposal for each chain.
+
+        Returns
+        -------
+        ndarray
+            The `(ndim, num_chains)` array of points to evaluate (the initial
+            states on the first call).
+        """
+
+        if self.y is None:
+            return self.x.T.copy()
+
+        if not self.parallel_tempering:
+            temperature = self.cooling_schedule(self.initial_temperature, self.iteration)
+            self.temperatures = np.full(self.num_chains, temperature)
+            self.step_sizes = self.step_size * (self.upper - self.lower)
+
+        x_proposal = self.x + self.step_sizes * np.random.normal(size=[self.num_chains, self.ndim])
+        np.clip(x_proposal, self.lower, self.upper, out=x_proposal)
+
+        return x_proposal.T
+
+    def tell(self, x, fx):
+        """Accept or reject the proposals and exchange the chain states.
+
+        Parameters
+        ----------
+        x : ndarray
+            The `(ndim, num_chains)` array returned by `ask`.
+        fx : ndarray
+            The values of the objective function at `x`.
+        """
+
+        x_proposal = np.asarray(x, dtype=np.float64).T
+        y_proposal = np.asarray(fx, dtype=np.float64)
+
+        if x_proposal.shape != (self.num_chains, self.ndim) or y_proposal.shape != (self.num_chains,):
+            raise ValueError("The batch doesn't match the last asked points.")
+
+        if self.y is None:
+            self.x = x_proposal.copy()
+            self.y = y_proposal.copy()
+        else:
+            x, y, temperatures = self.x, self.y, self.temperatures
+
+            with np.errstate(over='ignore'):
+                acceptance_probability = np.exp(-(y_proposal - y) / temperatures)
+            accepted = np.random.uniform(size=self.num_chains) < acceptance_probability
+
+            x[accepted] = x_proposal[accepted]
+            y[accepted] = y_proposal[accepted]
+
+            # Replica exchange #############################
+
+            if self.parallel_tempering and (self.iteration + 1) % self.exchange_period == 0:
+                # Alternately try to swap pairs (0,1), (2,3), ... and (1,2), (3,4), ...
+                i = np.arange(self.first_pair_index, self.num_chains - 1, 2)
+                j = i + 1
+                with np.errstate(over='ignore'):
+                    exchange_probability = np.exp((1. / temperatures[i] - 1. / temperatures[j]) * (y[i] - y[j]))
+                swapped = np.random.uniform(size=i.shape[0]) < exchange_probability
+                i, j = i[swapped], j[swapped]
+                x[i], x[j] = x[j], x[i]
+                y[i], y[j] = y[j], y[i]
+                self.first_pair_index = 1 - self.first_pair_index
+
+            self.iteration += 1
+
+        # Keep the best point ##########################
+
+        best_index = self.y.argmin()
+        if self.y[best_index] < self.best_fx:
+            self.best_x = self.x[best_index].copy()
+            self.best_fx = self.y[best_index]
+
+    def minimize(self,
+                 objective_function,
+                 num_iterations=1000,
+                 num_chains=32,
+                 initial_temperature=1.,
+                 cooling_schedule='exponential',
+                 step_size=0.1,
+                 parallel_tempering=False,
+                 min_temperature=1e-3,
+                 exchange_period=1,
+                 bounds=None,
+                 stopping_criteria=None,
+                 record_history=False,
+                 checkpoint=None,
+                 checkpoint_period=100):
+        """Minimize `objective_function` with a simulated annealing.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize.
+        num_iterations : int
+            The number of steps of each chain (the number of evaluations is
+            `num_chains * (num_iterations + 1)`).
+        bounds : ndarray
+            The `(2, ndim)` array of lower (first row) and upper (second row)
+            bounds (default: `objective_function.bounds`).
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`).
+        record_history : bool
+            Keep the best point, the best value found and the (highest)
+            temperature at each step in the result history (keys `'x'`,
+            `'fx'` and `'temperature'`).
+        checkpoint : str
+            The path of a checkpoint file (`.npz`). If set, the state of the
+            run is saved every `checkpoint_period` steps (and at the end)
+            and, if the file already exists, the run is resumed from it (see
+            `ailib.optimize.minimizers.checkpoint`).
+        checkpoint_period : int
+            The number of steps between two checkpoints.
+
+        The other parameters are described in `initialize`.
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization.
+        """
+
+        if bounds is None:
+            bounds = objective_function.bounds
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+
+        self.initialize(bounds,
+                        num_chains=num_chains,
+                        initial_temperature=initial_temperature,
+                        cooling_schedule=cooling_schedule,
+                        step_size=step_size,
+                        parallel_tempering=parallel_tempering,
+                        min_temperature=min_temperature,
+                        exchange_period=exchange_period,
+                        num_iterations=num_iterations)
+
+        if (checkpoint is None) or not restore_checkpoint(checkpoint, self, state):
+            # Evaluate the initial states
+            x = self.ask()
+            self.tell(x, objective_function(x))
+
+        with CheckpointWriter(checkpoint, checkpoint_period) as writer:
+            for iteration_index in range(state.nit, num_iterations):
+                x = self.ask()
+                self.tell(x, objective_function(x))
+
+                state.update(self.best_x, self.best_fx, temperature=self.temperatures.max())
+
+                writer.update(self, state)
+
+                if state.stop():
+                    break
+
+            writer.update(self, state, force=True)
+
+        return state.result(x=self.best_x, fx=self.best_fx)
@@ -20,27 +20,30 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 # THE SOFTWARE.
 
-__all__ = ['SAES']
+__all__ = ['SAES', 'AsyncSAES']
 
+import concurrent.futures
 import math
+import os
+import time
 import numpy as np
-import pandas as pd
-
-try:
-    import matplotlib
-    import matplotlib.pyplot as plt
-    from matplotlib import cm
-    from matplotlib import colors
-except Exception as e:
-    print(e)
 
 from .optimizer import Optimizer
+from .stopping import OptimizationState
+from .surrogate import make_surrogate
+from .checkpoint import CheckpointWriter, restore_checkpoint
+
+
+def _self_adaptation_rate(ndim, tau=None):
+    """The self-adaptation learning rate of the mutation strength (default: `1/sqrt(2 ndim)`)."""
+    return 1./math.sqrt(2.*ndim) if tau is None else tau
 
 
 class SAES(Optimizer):
-    """SAES optimizer.
+    r"""SAES optimizer.
 
-    ($\mu$/1+$\lambda$)-$\sigma$-Self-Adaptation-ES
+    ($\mu$/$\rho$+$\lambda$)-$\sigma$-Self-Adaptation-ES (intermediate
+    recombination of $\rho$ parents)
 
 
     Init pop
@@ -80,8 +83,273 @@ class SAES(Optimizer):
     sigma_init : int
         The number of times the (noisy) objective functions should be called
         at each evaluation (taking the average value of these calls).
+
+    The optimizer can also be driven step by step with the ask/tell
+    interface (e.g. when evaluations are done by an external scheduler)::
+
+        saes = SAES()
+        saes.initialize(ndim, mu=3, lmb=6)
+        for gen in range(num_gen):
+            x = saes.ask()              # a (ndim, n) array
+            saes.tell(x, f(x))
+
+    The first batch returned by `ask` contains the initial parents, the
+    next ones contain the offspring of each generation.
+
+    With `num_candidates` set, offspring are pre-screened with a surrogate
+    model of the objective function (see
+    `ailib.optimize.minimizers.surrogate`) fitted on the evaluated
+    individuals: `num_candidates` children are made and only the `lmb` ones
+    with the best predicted values are returned by `ask` (and thus evaluated
+    with the true objective function).
+
+    Examples
+    --------
+    >>> from ailib.optimize.functions.unconstrained import Sphere
+    >>> from ailib.optimize.minimizers.stopping import TargetValue
+    >>> np.random.seed(0)
+    >>> res = SAES().minimize(Sphere(4), np.ones(4), np.ones(4), num_gen=1000, stopping_criteria=TargetValue(1e-8))
+    >>> res.termination_reason, bool(res.fx <= 1e-8)
+    ('target_value', True)
+
+    The surrogate pre-screening reaches the same target with fewer
+    evaluations:
+
+    >>> np.random.seed(0)
+    >>> res_screened = SAES().minimize(Sphere(4), np.ones(4), np.ones(4), num_gen=1000, num_candidates=24, stopping_criteria=TargetValue(1e-8))
+    >>> res_screened.termination_reason, bool(res_screened.nfev < res.nfev / 2)
+    ('target_value', True)
+
+    The ask/tell interface:
+
+    >>> sphere = Sphere(4)
+    >>> np.random.seed(0)
+    >>> saes = SAES()
+    >>> saes.initialize(4, mu=3, lmb=6)
+    >>> for gen in range(200):
+    ...     x = saes.ask()
+    ...     saes.tell(x, sphere(x))
+    >>> bool(saes.best_fx < 1e-8)
+    True
     """
 
+    optimizer_name = "self-adaptive evolution strategy"
+
+    _checkpoint_attributes = ('pop', 'parents_evaluated', 'gen')
+
+    def initialize(self,
+                   ndim,
+                   mu=3,
+                   lmb=6,
+                   rho=1,
+                   tau=None,
+                   selection_operator='+',
+                   isotropic_mutation=True,
+                   num_candidates=None,
+                   surrogate='quadratic'):
+        """Initialize the population (ask/tell interface).
+
+        Parameters
+        ----------
+        ndim : int
+            The number of dimensions of the solution space.
+        mu : int
+            The number of parents.
+        lmb : int
+            The number of offspring.
+        rho : int
+            The number of parents recombined to make each child (between 1
+            and `mu`). With `rho > 1`, each child is the mean (strategy and
+            value) of `rho` distinct parents drawn at random (intermediate
+            recombination).
+        tau : float
+            The self-adaptation learning rate (default: `1/sqrt(2 ndim)`).
+        selection_operator : str
+            `'+'` to select the next parents among parents and offspring,
+            `','` to select them among offspring only.
+        isotropic_mutation : bool
+            Not used yet (the mutation is isotropic).
+        num_candidates : int
+            The number of candidate children pre-screened by the surrogate at
+            each generation (default: no pre-screening). The `lmb` best
+            candidates are evaluated. Until the surrogate has enough points,
+            `lmb` candidates are taken at random.
+        surrogate : str or surrogate object
+            The surrogate model used for the pre-screening: `'quadratic'`,
+            `'rbf'` or a surrogate object (see
+            `ailib.optimize.minimizers.surrogate`).
+        """
+
+        assert selection_operator in (',', '+')
+
+        if num_candidates is not None and num_candidates < lmb:
+            raise ValueError("num_candidates must be greater than or equal to lmb.")
+
+        if not 1 <= rho <= mu:
+            raise ValueError("rho must be between 1 and mu.")
+
+        self.ndim = d = ndim
+        self.mu = mu
+        self.lmb = lmb
+        self.rho = rho
+        self.selection_operator = selection_operator
+
+        # Self-adaptation learning rate
+        self.tau = _self_adaptation_rate(d, tau)
+
+        # Init the population ##########################
+
+        # "pop" array layout:
+        # - the first mu lines contain parents
+        # - the next lambda lines contain children
+        # - the first column contains the individual's strategy (sigma)
+        # - the last column contains the individual's assess (f(x))
+        # - the other columns contain the individual value (x)
+
+        self.pop = np.full([mu+lmb, d+2], np.nan)
+
+        self.pop[:mu, 0] = 1.                                                   # init the parents strategy to 1.0
+        #self.pop[:mu, 1:-1] = np.random.normal(init_pop_mean,
+        #                                       init_pop_std,
+        #                                       size=[mu, d])                    # init the parents value
+        self.pop[:mu, 1:-1] = np.random.uniform(low=-10., high=10., size=[mu, d])    # init the parents value
+
+        self.parents_evaluated = False
+        self.gen = 0
+
+        self.num_candidates = num_candidates
+        self.surrogate = make_surrogate(surrogate, d) if num_candidates is not None else None
+
+    @property
+    def best_x(self):
+        """The best parent."""
+        return self.pop[0, 1:-1].copy()
+
+    @property
+    def best_fx(self):
+        """The value of the best parent."""
+        return self.pop[0, -1]
+
+    @property
+    def sigma(self):
+        """The largest mutation strength of the parents."""
+        return self.pop[:self.mu, 0].max()
+
+    def get_state(self):
+        state = super().get_state()
+        if self.surrogate is not None:
+            for key, value in self.surrogate.get_state().items():
+                state['surrogate.' + key] = value
+        return state
+
+    def set_state(self, state):
+        super().set_state(state)
+        if self.surrogate is not None:
+            self.surrogate.set_state({key[len('surrogate.'):]: value for key, value in state.items() if key.startswith('surrogate.')})
+
+    def ask(self):
+        """Make the offspring of the next generation.
+
+        Returns
+        -------
+        ndarray
+            The `(ndim, lmb)` array of children to evaluate (the `(ndim, mu)`
+            array of initial parents on the first call).
+        """
+
+        mu, lmb, d = self.mu, self.lmb, self.ndim
+        pop = self.pop
+
+        if not self.parents_evaluated:
+            return pop[:mu, 1:-1].T.copy()
+
+        num_children = lmb if self.num_candidates is None else self.num_candidates
+
+        # Parent selection #############################
+
+        if self.rho == 1:
+            # Each child is made from one randomly selected parent
+            selected_parent_indices = np.random.randint(mu, size=num_children)
+        else:
+            # Each child is made from rho distinct randomly selected parents
+            selected_parent_indices = np.argsort(np.random.random_sample([num_children, mu]), axis=1)[:, :self.rho]
+
+        # Recombination ################################
+
+        if self.rho == 1:
+            children = pop[selected_parent_indices]
+        else:
+            # Intermediate recombination of the strategies and of the values
+            children = pop[selected_parent_indices].mean(axis=1)
+
+        children[:, -1] = np.nan
+
+        # Mutate children's sigma ######################
+
+        children[:, 0] *= np.exp(self.tau * np.random.normal(size=num_children))
+
+        # Mutate children's value ######################
+
+        children[:, 1:-1] += children[:, 0:1] * np.random.normal(size=[num_children, d])
+
+        # Pre-screening ################################
+
+        if num_children > lmb and self.surrogate.ready:
+            predicted_y = self.surrogate.predict(children[:, 1:-1].T)
+            children = children[np.argsort(predicted_y, kind='stable')[:lmb]]
+
+        pop[mu:] = children[:lmb]
+
+        return pop[mu:, 1:-1].T.copy()
+
+    def tell(self, x, fx):
+        """Evaluate the offspring and select the next parents.
+
+        Parameters
+        ----------
+        x : ndarray
+            The array returned by `ask`.
+        fx : ndarray
+            The values of the objective function at `x`.
+        """
+
+        mu = self.mu
+        pop = self.pop
+
+        x = np.asarray(x, dtype=np.float64).T
+        y = np.asarray(fx, dtype=np.float64)
+
+        if not self.parents_evaluated:
+            if x.shape != (mu, self.ndim) or y.shape != (mu,):
+                raise ValueError("The batch doesn't match the last asked individuals.")
+            pop[:mu, 1:-1] = x
+            pop[:mu, -1] = y
+            pop[:mu] = pop[np.argsort(pop[:mu, -1], kind='stable')]
+            self.parents_evaluated = True
+            if self.surrogate is not None:
+                self.surrogate.update(x.T, y)
+            return
+
+        if x.shape != (self.lmb, self.ndim) or y.shape != (self.lmb,):
+            raise ValueError("The batch doesn't match the last asked individuals.")
+
+        pop[mu:, 1:-1] = x
+        pop[mu:, -1] = y
+
+        if self.surrogate is not None:
+            self.surrogate.update(x.T, y)
+
+        # Select the best individuals ##################
+
+        if self.selection_operator == ',':
+            pop[:mu] = np.nan
+
+        pop[:] = pop[np.argsort(pop[:, -1], kind='stable')]     # NaN are sorted last
+
+        pop[mu:] = np.nan
+
+        self.gen += 1
+
     def minimize(self,
                  objective_function,
                  init_pop_mean,
@@ -93,6 +361,12 @@ class SAES(Optimizer):
                  tau=None,
                  selection_operator='+',
                  isotropic_mutation=True,
+                 num_candidates=None,
+                 surrogate='quadratic',
+                 stopping_criteria=None,
+                 record_history=False,
+                 checkpoint=None,
+                 checkpoint_period=100,
                  plot=False):
         """TODO
 
@@ -100,158 +374,330 @@ class SAES(Optimizer):
         ----------
         x_init : ndarray
             The initial parent vector (a 1D numpy array).
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`), checked after each
+            generation. The `sigma` reported to the criteria is the largest
+            mutation strength of the parents (use `SigmaMin` to stop when
+            the population has converged).
+        record_history : bool
+            Keep the best individual, its value and the largest mutation
+            strength of the parents at each generation in the result history
+            (keys `'x'`, `'fx'` and `'sigma'`).
+        checkpoint : str
+            The path of a checkpoint file (`.npz`). If set, the state of the
+            run is saved every `checkpoint_period` generations (and at the end)
+            and, if the file already exists, the run is resumed from it (see
+            `ailib.optimize.minimizers.checkpoint`).
+        checkpoint_period : int
+            The number of generations between two checkpoints.
+
+        The other parameters are described in `initialize`.
 
         Returns
         -------
-        ndarray
-            The optimal point found (a 1D numpy array).
+        OptimizeResult
+            The result of the optimization.
         """
 
-        assert selection_operator in (',', '+')
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
 
-        # Number of dimension of the solution space
-        d = objective_function.ndim
+        self.initialize(objective_function.ndim,
+                        mu=mu,
+                        lmb=lmb,
+                        rho=rho,
+                        tau=tau,
+                        selection_operator=selection_operator,
+                        isotropic_mutation=isotropic_mutation,
+                        num_candidates=num_candidates,
+                        surrogate=surrogate)
 
-        # Self-adaptation learning rate
-        if tau is None:
-            tau = 1./math.sqrt(2.*d)
+        if (checkpoint is None) or not restore_checkpoint(checkpoint, self, state):
+            # Evaluate parents
+            x = self.ask()
+            self.tell(x, objective_function(x))
 
-        # Set indices alias ############################
+        with CheckpointWriter(checkpoint, checkpoint_period) as writer:
+            # Plot #############################################
 
-        all_indices = slice(None, None)
-        parent_indices = slice(0, mu)
-        children_indices = slice(mu, None)
+            if plot:
+                import matplotlib.pyplot as plt
+                from matplotlib import cm
+                from matplotlib import colors
 
-        sigma_col = 0
-        x_cols = slice(1, -1)
-        y_col = -1
+                cmap = cm.gnuplot2 # magma
 
-        sigma_col_label = "sigma"
-        y_col_label = "y"
+                fig, (ax1, ax2, ax3) = plt.subplots(ncols=3, figsize=(20, 6))
+                ax1.set_xlabel('x0')
+                ax1.set_ylabel('x1')
+                ax2.set_xlabel('sigma')
+                ax2.set_ylabel('y')
+                ax3.set_xlabel('gen')
+                ax3.set_ylabel('y')
 
-        # Init the population ##########################
+            for gen in range(state.nit, num_gen):
 
-        # "pop" array layout:
-        # - the first mu lines contain parents
-        # - the next lambda lines contain children
-        # - the first column contains the individual's strategy (sigma)
-        # - the last column contains the individual's assess (f(x))
-        # - the other columns contain the individual value (x)
+                x = self.ask()
+                fx = objective_function(x)
+
+                if plot:
+                    color_str = colors.rgb2hex(cmap(float(gen) / num_gen))
+                    pop = self.pop
+                    ax1.scatter(pop[:, 1], pop[:, 2], c=color_str)
+                    ax2.scatter(pop[:self.mu, 0], pop[:self.mu, -1], c=color_str)
+                    ax2.scatter(pop[self.mu:, 0], fx, c=color_str)
+                    ax2.set_xscale('log')
+                    ax2.set_yscale('log')
+                    ax3.semilogy(np.full(shape=self.mu + self.lmb, fill_value=gen), np.concatenate([pop[:self.mu, -1], fx]), '.', color=color_str)
+
+                self.tell(x, fx)
+
+                state.update(self.best_x, self.best_fx, sigma=self.sigma)
 
-        pop = pd.DataFrame(np.full([mu+lmb, d+2], np.nan),
-                           columns=[sigma_col_label] + ["x" + str(d) for d in range(d)] + [y_col_label])
+                writer.update(self, state)
 
-        pop.iloc[parent_indices, sigma_col] = 1.                                    # init the parents strategy to 1.0
-        #pop.iloc[parent_indices, x_cols] = np.random.normal(init_pop_mean,
-        #                                                    init_pop_std,
-        #                                                    size=[mu, d])          # init the parents value
-        pop.iloc[parent_indices, x_cols] = np.random.uniform(low=-10., high=10., size=[mu, d])    # init the parents value
-        pop.iloc[parent_indices, y_col] = objective_function(pop.iloc[parent_indices, x_cols].values.T)  # evaluate parents
-        #print("Initial population:\n", pop, "\n")
+                if state.stop():
+                    break
 
-        # Plot #############################################
+            writer.update(self, state, force=True)
 
         if plot:
-            cmap = cm.gnuplot2 # magma
+            plt.show()
 
-            fig, (ax1, ax2, ax3) = plt.subplots(ncols=3, figsize=(20, 6))
-            ax3.set_xlabel('gen')
-            ax3.set_ylabel('y')
+        return state.result(x=self.best_x, fx=self.best_fx)
+
+
+def _timed_call(objective_function, x):
+    """Evaluate `x` and measure the evaluation time (run in worker processes)."""
+    start_time = time.perf_counter()
+    y = objective_function(x)
+    return y, time.perf_counter() - start_time
+
+
+class AsyncSAES(Optimizer):
+    """Asynchronous steady-state SAES optimizer.
+
+    There is no generation barrier: a pool of workers continuously evaluates
+    children. As soon as a child is evaluated, it is inserted into the parent
+    pool (it replaces the worst parent if it is better, i.e. a steady-state
+    "+" selection) and a new child is made from the current parents and
+    dispatched to the idle worker. Workers are thus kept busy even when
+    evaluation times are heterogeneous.
+
+    Until the parent pool is full (i.e. `mu` individuals have been
+    evaluated), new individuals are drawn at random.
+
+    The steady-state interface is `ask_one` (make one child) and `tell_one`
+    (insert an evaluated child); `minimize` drives it with a
+    `concurrent.futures` executor. It has no generational `ask`/`tell`
+    interface and no checkpoints (unlike `SAES`).
+
+    Examples
+    --------
+    With a single worker, `minimize` inserts the children in the order they
+    are made, like a sequential `ask_one`/`tell_one` loop:
+
+    >>> import concurrent.futures
+    >>> from ailib.optimize.functions.unconstrained import Sphere
+    >>> sphere = Sphere(2)
+    >>> np.random.seed(0)
+    >>> with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+    ...     res = AsyncSAES().minimize(sphere, num_evaluations=500, num_workers=1, executor=executor)
+    >>> np.random.seed(0)
+    >>> optimizer = AsyncSAES()
+    >>> optimizer.initialize(2)
+    >>> for evaluation_index in range(500):
+    ...     x, sigma = optimizer.ask_one()
+    ...     optimizer.tell_one(x, sigma, sphere(x))
+    >>> bool(optimizer.best_fx == res.fx), bool(res.fx < 1e-8), res.nfev
+    (True, True, 500)
+    """
 
-        for gen in range(num_gen):
+    optimizer_name = "asynchronous steady-state SAES"
 
-            # Parent selection #############################
-    
-            if rho == 1:
-                
-                # Each child is made from one randomly selected parent
-                selected_parent_indices = np.random.randint(mu, size=lmb)
-            
-            elif rho == mu:
-            
-                # Recombine all parents for each child
-                raise NotImplemented() # TODO
-            
-            elif 1 < rho < mu:
-            
-                # Recombine rho randomly selected parents for each child
-                raise NotImplemented() # TODO
-            
-            else:
-            
-                raise ValueError()
-                
-            #print("Parent selection")
-            #display(selected_parent_indices)
-            
-            # Recombination ################################
-
-            if rho == 1:
-                
-                # Each child is made from one randomly selected parent
-                pop.iloc[children_indices] = pop.iloc[selected_parent_indices].values
-                
-            elif rho == mu:
-                
-                # Recombine all parents for each child
-                raise NotImplemented() # TODO
-                
-            elif 1 < rho < mu:
-                
-                # Recombine rho randomly selected parents for each child
-                raise NotImplemented() # TODO
-                
-            else:
-                
-                raise ValueError()
-            
-            pop.iloc[children_indices, y_col] = np.nan
-            
-            #print("Recombination")
-            #display(pop)
-
-            # Mutate children's sigma ######################
-    
-            pop.iloc[children_indices, sigma_col] *= np.exp(tau * np.random.normal(size=lmb))
-            
-            #print("Mutated children's sigma")
-            #display(pop)
+    def initialize(self, ndim, mu=3, tau=None):
+        """Initialize the (empty) parent pool.
 
-            # Mutate children's value ######################
-    
-            sigma_array = np.tile(pop.iloc[children_indices, sigma_col], [d,1]).T    # TODO: <- CHECK THIS !!!
-            random_array = np.random.normal(size=[lmb,d])
-            pop.iloc[children_indices, x_cols] += sigma_array * random_array
+        Parameters
+        ----------
+        ndim : int
+            The number of dimensions of the solution space.
+        mu : int
+            The number of parents.
+        tau : float
+            The self-adaptation learning rate (default: `1/sqrt(2 ndim)`).
+        """
 
-            #print("Mutated children's value")
-            #display(pop)
+        self.ndim = d = ndim
+        self.mu = mu
+        self.tau = _self_adaptation_rate(d, tau)
 
-            # Evaluate children ############################
+        # Same layout as the SAES population: sigma, x, f(x)
+        self.pop = np.full([mu, d+2], np.nan)
+        self.num_parents = 0
 
-            pop.iloc[children_indices, y_col] = objective_function(pop.iloc[children_indices, x_cols].values.T)
+    @property
+    def best_x(self):
+        """The best parent."""
+        return self.pop[np.nanargmin(self.pop[:self.num_parents, -1]), 1:-1].copy()
 
-            #print("Evaluate children")
-            #display(pop)
+    @property
+    def best_fx(self):
+        """The value of the best parent."""
+        return np.nanmin(self.pop[:self.num_parents, -1])
 
-            if plot:
-                color_str = matplotlib.colors.rgb2hex(cmap(float(gen) / num_gen))
-                pop.plot.scatter(x="x0", y="x1", c=color_str, ax=ax1)
-                pop.plot.scatter(x="sigma", y="y", c=color_str, loglog=True, ax=ax2)
-                ax3.semilogy(np.full(shape=pop.y.shape, fill_value=gen), pop.y, '.', color=color_str)
-
-            # Select the best individuals ##################
-
-            if selection_operator == ',':
-                pop.iloc[parent_indices] = np.nan
-            
-            pop = pop.sort_values(by=[y_col_label], na_position='last').reset_index(drop=True)
-            
-            pop.iloc[children_indices] = np.nan
-            
-            #print("Selected individuals for the next generation")
-            #display(pop)
+    @property
+    def sigma(self):
+        """The largest mutation strength of the parents."""
+        return self.pop[:self.num_parents, 0].max()
 
-        if plot:
-            plt.show()
+    def ask_one(self):
+        """Make one child.
+
+        Returns
+        -------
+        tuple
+            The child (a 1D numpy array) and its mutation strength sigma.
+        """
+
+        if self.num_parents < self.mu:
+            return np.random.uniform(low=-10., high=10., size=self.ndim), 1.
+
+        parent = self.pop[np.random.randint(self.mu)]
+
+        sigma = parent[0] * math.exp(self.tau * np.random.normal())
+        x = parent[1:-1] + sigma * np.random.normal(size=self.ndim)
+
+        return x, sigma
+
+    def tell_one(self, x, sigma, fx):
+        """Insert an evaluated child into the parent pool.
+
+        Parameters
+        ----------
+        x : ndarray
+            The child (returned by `ask_one`).
+        sigma : float
+            The mutation strength of the child (returned by `ask_one`).
+        fx : float
+            The value of the child.
+        """
+
+        if self.num_parents < self.mu:
+            index = self.num_parents
+            self.num_parents += 1
+        else:
+            index = self.pop[:, -1].argmax()
+            if not fx < self.pop[index, -1]:
+                return
+
+        self.pop[index, 0] = sigma
+        self.pop[index, 1:-1] = x
+        self.pop[index, -1] = fx
+
+    def minimize(self,
+                 objective_function,
+                 num_evaluations=1000,
+                 mu=3,
+                 tau=None,
+                 num_workers=None,
+                 executor=None,
+                 stopping_criteria=None,
+                 record_history=False):
+        """Minimize `objective_function` with the asynchronous steady-state SAES.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize (it should be picklable when evaluated
+            in worker processes).
+        num_evaluations : int
+            The number of evaluations.
+        mu : int
+            The number of parents.
+        tau : float
+            The self-adaptation learning rate (default: `1/sqrt(2 ndim)`).
+        num_workers : int
+            The number of evaluations run at the same time (default: the
+            number of CPUs).
+        executor : concurrent.futures.Executor
+            The executor evaluating the children. If `None`, a
+            `ProcessPoolExecutor` with `num_workers` processes is made (and
+            shut down at the end).
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`), checked after each
+            evaluation. The `sigma` reported to the criteria is the largest
+            mutation strength of the parents.
+        record_history : bool
+            Keep the best individual, its value and the largest mutation
+            strength of the parents after each evaluation in the result
+            history (keys `'x'`, `'fx'` and `'sigma'`).
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization (`nit` is the number of inserted
+            children). The `worker_utilization` item is the fraction of the
+            time the workers spent evaluating the objective function.
+        """
+
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+
+        own_executor = executor is None
+        if own_executor:
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=num_workers)
+
+        # Evaluations are made in the workers: they are counted here
+        state = OptimizationState(None, stopping_criteria, record_history)
+
+        self.initialize(objective_function.ndim, mu=mu, tau=tau)
+
+        pending_futures = {}
+        num_dispatched = 0
+        evaluation_time = 0.
+
+        def dispatch():
+            x, sigma = self.ask_one()
+            pending_futures[executor.submit(_timed_call, objective_function, x)] = (x, sigma)
+
+        try:
+            while num_dispatched < min(num_workers, num_evaluations):
+                dispatch()
+                num_dispatched += 1
+
+            stop = False
+
+            while pending_futures and not stop:
+                done_futures, _ = concurrent.futures.wait(pending_futures, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for future in done_futures:
+                    x, sigma = pending_futures.pop(future)
+                    fx, duration = future.result()
+                    evaluation_time += duration
+                    state.count_evaluations(1)
+
+                    self.tell_one(x, sigma, float(fx))
+                    state.update(self.best_x, self.best_fx, sigma=self.sigma)
+
+                    if state.stop():
+                        stop = True
+                    elif num_dispatched < num_evaluations:
+                        dispatch()
+                        num_dispatched += 1
+
+            for future in pending_futures:
+                future.cancel()
+        finally:
+            if own_executor:
+                executor.shutdown(wait=True)
+
+        wall_time = state.wall_time
+
+        if not stop:
+            state.terminate("max_evaluations")
 
-        return pop.iloc[0, x_cols].values
+        return state.result(x=self.best_x,
+                            fx=self.best_fx,
+                            worker_utilization=evaluation_time / (num_workers * wall_time))
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Samplers used to draw points in a box (e.g. by random search).
+
+Besides the uniform (pseudo-random) sampler, this module provides some
+*quasi-random* (low-discrepancy) samplers: Sobol and Halton sequences and
+Latin hypercube sampling. They cover the search space more evenly than
+uniform random samples, thus fewer samples are needed to reach a given
+coverage of the box.
+
+All samplers are stateful: successive calls to `sample` continue the
+sequence, so that a large sample can be drawn chunk by chunk.
+
+See:
+* https://en.wikipedia.org/wiki/Low-discrepancy_sequence
+* https://en.wikipedia.org/wiki/Sobol_sequence
+* https://en.wikipedia.org/wiki/Halton_sequence
+* https://en.wikipedia.org/wiki/Latin_hypercube_sampling
+"""
+
+__all__ = ['UniformSampler',
+           'SobolSampler',
+           'HaltonSampler',
+           'LatinHypercubeSampler',
+           'make_sampler']
+
+import numpy as np
+
+# Primitive polynomials (degree, coefficients) and initial direction numbers
+# of the Sobol sequence for dimensions 2 to 32 (the first dimension is the
+# van der Corput sequence in base 2).
+# Taken from S. Joe and F. Y. Kuo, "Constructing Sobol sequences with better
+# two-dimensional projections", SIAM J. Sci. Comput. 30, 2635-2654 (2008)
+# (file new-joe-kuo-6.21201, https://web.maths.unsw.edu.au/~fkuo/sobol/).
+_SOBOL_DIRECTION_NUMBERS = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49)),
+    (6, 19, (1, 1, 1, 15, 7, 5)),
+    (6, 22, (1, 3, 1, 15, 13, 25)),
+    (6, 25, (1, 1, 5, 5, 19, 61)),
+    (7, 1, (1, 3, 7, 11, 23, 15, 103)),
+    (7, 4, (1, 3, 7, 13, 13, 15, 69)),
+    (7, 7, (1, 1, 3, 13, 7, 35, 63)),
+    (7, 8, (1, 3, 5, 9, 1, 25, 53)),
+    (7, 14, (1, 3, 1, 13, 9, 35, 107)),
+    (7, 19, (1, 3, 1, 5, 27, 61, 31)),
+    (7, 21, (1, 1, 5, 11, 19, 41, 61)),
+    (7, 28, (1, 3, 5, 3, 3, 13, 69)),
+    (7, 31, (1, 1, 7, 13, 1, 19, 1)),
+    (7, 32, (1, 3, 7, 5, 13, 19, 59)),
+    (7, 37, (1, 1, 3, 9, 25, 29, 41)),
+    (7, 41, (1, 3, 5, 13, 23, 1, 55)),
+    (7, 42, (1, 3, 7, 3, 13, 59, 17)),
+)
+
+_SOBOL_NUM_BITS = 32
+
+_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61,
+           67, 71, 73, 79, 83, 89, 97, 101, 103, 107, 109, 113, 127, 131, 137,
+           139, 149, 151, 157, 163, 167, 173, 179, 181, 191, 193, 197, 199)
+
+
+class _Sampler:
+    """Generic sampler.
+
+    Parameters
+    ----------
+    ndim : int
+        The number of dimensions of the box.
+    dmin : array_like
+        The lower bounds of the box.
+    dmax : array_like
+        The upper bounds of the box.
+    """
+
+    # The attributes saved in checkpoints (see `get_state`)
+    _checkpoint_attributes = ('num_drawn_samples',)
+
+    def __init__(self, ndim, dmin, dmax):
+        self.ndim = ndim
+        self.dmin = np.broadcast_to(np.asarray(dmin, dtype=np.float64), (ndim,))
+        self.dmax = np.broadcast_to(np.asarray(dmax, dtype=np.float64), (ndim,))
+        self.num_drawn_samples = 0
+
+    def sample(self, num_samples):
+        """Draw the next `num_samples` points of the sequence.
+
+        Returns
+        -------
+        ndarray
+            A `(ndim, num_samples)` array: the coordinates of each point are
+            distributed along the first dimension (as expected by objective
+            functions).
+        """
+        unit_samples = self._sample_unit_cube(num_samples)
+        self.num_drawn_samples += num_samples
+        return self.dmin[:, np.newaxis] + unit_samples * (self.dmax - self.dmin)[:, np.newaxis]
+
+    def _sample_unit_cube(self, num_samples):
+        raise NotImplementedError
+
+    def get_state(self):
+        """Return a copy of the position in the sequence (and of the scrambling parameters)."""
+        return {name: np.array(getattr(self, name), copy=True) for name in self._checkpoint_attributes}
+
+    def set_state(self, state):
+        """Restore a state returned by `get_state`."""
+        for name in self._checkpoint_attributes:
+            value = np.asarray(state[name])
+            setattr(self, name, value.item() if value.ndim == 0 else value.copy())
+
+
+class UniformSampler(_Sampler):
+    """Uniform (pseudo-random) sampler."""
+
+    def _sample_unit_cube(self, num_samples):
+        return np.random.uniform(size=[self.ndim, num_samples])
+
+
+class SobolSampler(_Sampler):
+    """Sobol sequence sampler.
+
+    The balance properties of the Sobol sequence are best when the number of
+    drawn samples is a power of 2.
+
+    Parameters
+    ----------
+    ndim : int
+        The number of dimensions of the box (at most 32).
+    dmin : array_like
+        The lower bounds of the box.
+    dmax : array_like
+        The upper bounds of the box.
+    scramble : bool
+        Apply a random digital shift to the sequence (this keeps its
+        low-discrepancy properties and avoids drawing the lower corner of
+        the box first).
+
+    Examples
+    --------
+    >>> SobolSampler(2, 0., 1., scramble=False).sample(4)
+    array([[0.  , 0.5 , 0.75, 0.25],
+           [0.  , 0.5 , 0.25, 0.75]])
+    """
+
+    _checkpoint_attributes = ('num_drawn_samples', '_shift')
+
+    def __init__(self, ndim, dmin, dmax, scramble=True):
+        super().__init__(ndim, dmin, dmax)
+
+        if ndim > len(_SOBOL_DIRECTION_NUMBERS) + 1:
+            raise ValueError("The Sobol sampler is available for at most {} dimensions.".format(len(_SOBOL_DIRECTION_NUMBERS) + 1))
+
+        num_bits = _SOBOL_NUM_BITS
+
+        # Direction numbers: directions[j, k] is the (k+1)th direction number
+        # of the jth dimension, scaled to num_bits bits
+        directions = np.zeros([ndim, num_bits], dtype=np.uint64)
+        directions[0] = [1 << (num_bits - k - 1) for k in range(num_bits)]
+
+        for j in range(1, ndim):
+            degree, coefficients, initial_numbers = _SOBOL_DIRECTION_NUMBERS[j - 1]
+            v = [0] * num_bits
+            for k in range(num_bits):
+                if k < degree:
+                    v[k] = initial_numbers[k] << (num_bits - k - 1)
+                else:
+                    v[k] = v[k - degree] ^ (v[k - degree] >> degree)
+                    for i in range(1, degree):
+                        if (coefficients >> (degree - 1 - i)) & 1:
+                            v[k] ^= v[k - i]
+            directions[j] = v
+
+        self._directions = directions
+
+        if scramble:
+            self._shift = np.random.randint(0, 1 << num_bits, size=ndim, dtype=np.uint64)
+        else:
+            self._shift = np.zeros(ndim, dtype=np.uint64)
+
+    def _sample_unit_cube(self, num_samples):
+        indices = np.arange(self.num_drawn_samples, self.num_drawn_samples + num_samples, dtype=np.uint64)
+        gray_codes = indices ^ (indices >> np.uint64(1))
+
+        integers = np.zeros([self.ndim, num_samples], dtype=np.uint64)
+        for k in range(_SOBOL_NUM_BITS):
+            bit = ((gray_codes >> np.uint64(k)) & np.uint64(1)).astype(bool)
+            integers[:, bit] ^= self._directions[:, k:k+1]
+
+        integers ^= self._shift[:, np.newaxis]
+
+        return integers.astype(np.float64) / float(1 << _SOBOL_NUM_BITS)
+
+
+class HaltonSampler(_Sampler):
+    """Halton sequence sampler.
+
+    The jth coordinate is the radical inverse of the sample index in the jth
+    prime base. Correlations between coordinates appear in high dimension,
+    prefer the Sobol sampler (or Latin hypercube sampling) there.
+
+    Parameters
+    ----------
+    ndim : int
+        The number of dimensions of the box (at most 46).
+    dmin : array_like
+        The lower bounds of the box.
+    dmax : array_like
+        The upper bounds of the box.
+    scramble : bool
+        Apply a random shift modulo 1 (Cranley-Patterson rotation) to each
+        coordinate.
+
+    Examples
+    --------
+    >>> np.round(HaltonSampler(2, 0., 1., scramble=False).sample(4), 3)
+    array([[0.5  , 0.25 , 0.75 , 0.125],
+           [0.333, 0.667, 0.111, 0.444]])
+    """
+
+    _checkpoint_attributes = ('num_drawn_samples', '_shift')
+
+    def __init__(self, ndim, dmin, dmax, scramble=True):
+        super().__init__(ndim, dmin, dmax)
+
+        if ndim > len(_PRIMES):
+            raise ValueError("The Halton sampler is available for at most {} dimensions.".format(len(_PRIMES)))
+
+        self._bases = np.array(_PRIMES[:ndim])
+
+        if scramble:
+            self._shift = np.random.uniform(size=ndim)
+        else:
+            self._shift = np.zeros(ndim)
+
+        # Skip the first point (0, ..., 0)
+        self.num_drawn_samples = 1
+
+    def _sample_unit_cube(self, num_samples):
+        indices = np.arange(self.num_drawn_samples, self.num_drawn_samples + num_samples)
+        samples = np.zeros([self.ndim, num_samples])
+
+        for j, base in enumerate(self._bases):
+            remainder = indices.copy()
+            factor = 1. / base
+            while np.any(remainder > 0):
+                samples[j] += factor * (remainder % base)
+                remainder //= base
+                factor /= base
+
+        return (samples + self._shift[:, np.newaxis]) % 1.
+
+
+class LatinHypercubeSampler(_Sampler):
+    """Latin hypercube sampler.
+
+    Each call to `sample` draws a Latin hypercube design: the range of each
+    coordinate is divided into `num_samples` strata of equal width and each
+    stratum contains exactly one point. When the sample is drawn chunk by
+    chunk, each chunk is a Latin hypercube design on its own.
+
+    Examples
+    --------
+    >>> np.random.seed(0)
+    >>> x = LatinHypercubeSampler(2, 0., 1.).sample(5)
+    >>> np.sort(np.floor(5. * x), axis=1)
+    array([[0., 1., 2., 3., 4.],
+           [0., 1., 2., 3., 4.]])
+    """
+
+    def _sample_unit_cube(self, num_samples):
+        strata = np.argsort(np.random.uniform(size=[self.ndim, num_samples]), axis=1)
+        return (strata + np.random.uniform(size=[self.ndim, num_samples])) / num_samples
+
+
+_SAMPLERS = {'uniform': UniformSampler,
+             'sobol': SobolSampler,
+             'halton': HaltonSampler,
+             'lhs': LatinHypercubeSampler}
+
+
+def make_sampler(sampler, ndim, dmin, dmax):
+    """Make a sampler from its name.
+
+    Parameters
+    ----------
+    sampler : str or sampler object
+        The sampler name (`'uniform'`, `'sobol'`, `'halton'` or `'lhs'`). If
+        `sampler` is already a sampler object, it is returned unchanged.
+    ndim : int
+        The number of dimensions of the box.
+    dmin : array_like
+        The lower bounds of the box.
+    dmax : array_like
+        The upper bounds of the box.
+
+    Returns
+    -------
+    sampler object
+        The sampler.
+    """
+    if not isinstance(sampler, str):
+        return sampler
+
+    if sampler not in _SAMPLERS:
+        raise ValueError("Unknown sampler {}.".format(sampler))
+
+    return _SAMPLERS[sampler](ndim, dmin, dmax)
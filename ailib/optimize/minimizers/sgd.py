@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+r"""
+Mini-batch stochastic gradient descent for finite-sum objective functions.
+
+At each step, the point moves along the gradient of a mini-batch of samples
+(see `ailib.optimize.functions.finite_sum`):
+
+.. math::
+
+    \boldsymbol{x} \leftarrow \boldsymbol{x} - \eta_t \nabla f_B(\boldsymbol{x})
+
+Each epoch visits all the samples once, in the order of a random
+permutation of their indices (the dataset itself is neither copied nor
+reordered); the mini-batches are slices of this permutation. The step
+length :math:`\eta_t` follows a learning-rate schedule (see
+`learning_rate_schedule`).
+
+With `variance_reduction='svrg'`, the mini-batch gradients are corrected
+with the full gradient at a snapshot point :math:`\tilde{\boldsymbol{x}}`
+computed at the beginning of each epoch (SVRG):
+
+.. math::
+
+    \boldsymbol{g} = \nabla f_B(\boldsymbol{x}) - \nabla f_B(\tilde{\boldsymbol{x}}) + \nabla f(\tilde{\boldsymbol{x}})
+
+which allows a constant step length to converge to the minimum (the
+variance of :math:`\boldsymbol{g}` vanishes near the minimum).
+
+See:
+* https://en.wikipedia.org/wiki/Stochastic_gradient_descent
+* L. Bottou, F. E. Curtis and J. Nocedal, "Optimization methods for
+  large-scale machine learning", SIAM Review 60(2), 223-311 (2018).
+* R. Johnson and T. Zhang, "Accelerating stochastic gradient descent using
+  predictive variance reduction", NIPS (2013).
+"""
+
+__all__ = ['learning_rate_schedule',
+           'StochasticGradientDescent']
+
+import numpy as np
+
+from .optimizer import Optimizer
+from .stopping import OptimizationState
+
+
+def learning_rate_schedule(schedule, learning_rate, num_steps, decay=None):
+    """Make a learning-rate schedule.
+
+    Parameters
+    ----------
+    schedule : str or callable
+        `'constant'`; `'inverse'` (:math:`\\eta / (1 + \\text{decay} \\, t)`,
+        default decay: `10 / num_steps`); `'step'` (the learning rate is
+        multiplied by `decay`, default 0.5, at each quarter of the run);
+        `'cosine'` (:math:`\\eta (1 + \\cos(\\pi t / T)) / 2`); or a function
+        of the step index returning the learning rate.
+    learning_rate : float
+        The initial learning rate :math:`\\eta`.
+    num_steps : int
+        The total number of steps :math:`T`.
+    decay : float
+        The decay parameter of the `'inverse'` and `'step'` schedules.
+
+    Returns
+    -------
+    callable
+        The learning rate as a function of the step index.
+
+    Examples
+    --------
+    >>> schedule = learning_rate_schedule('step', 1., num_steps=8)
+    >>> [schedule(t) for t in range(8)]
+    [1.0, 1.0, 0.5, 0.5, 0.25, 0.25, 0.125, 0.125]
+    """
+    if callable(schedule):
+        return schedule
+
+    if schedule == 'constant':
+        return lambda step: learning_rate
+
+    if schedule == 'inverse':
+        if decay is None:
+            decay = 10. / num_steps
+        return lambda step: learning_rate / (1. + decay * step)
+
+    if schedule == 'step':
+        if decay is None:
+            decay = 0.5
+        step_size = max(1, num_steps // 4)
+        return lambda step: learning_rate * decay**(step // step_size)
+
+    if schedule == 'cosine':
+        return lambda step: 0.5 * learning_rate * (1. + np.cos(np.pi * min(step, num_steps) / num_steps))
+
+    raise ValueError("Unknown learning rate schedule {}.".format(schedule))
+
+
+class StochasticGradientDescent(Optimizer):
+    """Mini-batch stochastic gradient descent (with momentum and SVRG)."""
+
+    optimizer_name = "stochastic gradient descent"
+
+    def minimize(self,
+                 objective_function,
+                 num_epochs=10,
+                 batch_size=32,
+                 learning_rate=0.1,
+                 schedule='constant',
+                 decay=None,
+                 momentum=0.,
+                 variance_reduction=None,
+                 shuffle=True,
+                 x_init=None,
+                 stopping_criteria=None,
+                 record_history=False):
+        """Minimize the finite-sum `objective_function` with a mini-batch stochastic gradient descent.
+
+        Parameters
+        ----------
+        objective_function : FiniteSumObjective
+            The function to minimize: it must have a `num_samples` attribute
+            and a `batch_gradient(x, indices)` method (see
+            `ailib.optimize.functions.finite_sum`).
+        num_epochs : int
+            The number of passes over the samples.
+        batch_size : int
+            The number of samples of each mini-batch.
+        learning_rate : float
+            The initial learning rate.
+        schedule : str or callable
+            The learning-rate schedule, indexed by steps (see
+            `learning_rate_schedule`).
+        decay : float
+            The decay parameter of the schedule.
+        momentum : float
+            The (heavy ball) momentum coefficient (0 for plain SGD).
+        variance_reduction : str
+            `None` or `'svrg'` (stochastic variance reduced gradient: one
+            full gradient per epoch and two mini-batch gradients per step).
+        shuffle : bool
+            Visit the samples in a new random order at each epoch
+            (otherwise, in the order of the dataset).
+        x_init : ndarray
+            The initial point (default: the origin).
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`), checked at the end of
+            each epoch.
+        record_history : bool
+            Keep the point and its (full) value at the end of each epoch in
+            the result history (keys `'x'` and `'fx'`).
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization: `x` is the last point, `nit` the
+            number of epochs, `num_steps` the number of steps and
+            `num_sample_gradients` the number of sample gradients computed.
+        """
+
+        if variance_reduction not in (None, 'svrg'):
+            raise ValueError("Unknown variance reduction {}.".format(variance_reduction))
+
+        if not hasattr(objective_function, 'batch_gradient'):
+            raise ValueError("The objective function must be a finite-sum objective (with a batch_gradient method).")
+
+        num_samples = objective_function.num_samples
+        batch_size = min(batch_size, num_samples)
+        num_batches = -(-num_samples // batch_size)
+
+        step_learning_rate = learning_rate_schedule(schedule, learning_rate, num_epochs * num_batches, decay=decay)
+
+        state = OptimizationState(objective_function, stopping_criteria, record_history)
+        num_sample_gradients_init = getattr(objective_function, 'num_sample_gradient_eval', 0)
+
+        if x_init is None:
+            x = np.zeros(objective_function.ndim)
+        else:
+            x = np.array(x_init, dtype=np.float64)
+
+        velocity = np.zeros_like(x)
+        order = np.arange(num_samples)
+        step_index = 0
+        fx = None
+
+        for epoch_index in range(num_epochs):
+
+            if shuffle:
+                order = np.random.permutation(num_samples)
+
+            if variance_reduction == 'svrg':
+                snapshot_x = x.copy()
+                snapshot_gradient = objective_function.gradient(snapshot_x)
+
+            for batch_start in range(0, num_samples, batch_size):
+                indices = order[batch_start:batch_start + batch_size]
+
+                nabla = objective_function.batch_gradient(x, indices)
+
+                if variance_reduction == 'svrg':
+                    nabla = nabla - objective_function.batch_gradient(snapshot_x, indices) + snapshot_gradient
+
+                velocity *= momentum
+                velocity -= step_learning_rate(step_index) * nabla
+                x = x + velocity
+
+                step_index += 1
+
+            fx = objective_function(x)
+            state.update(x, fx)
+
+            if not np.isfinite(fx):
+                state.terminate("diverged")
+                break
+
+            if state.stop():
+                break
+
+        return state.result(x=x,
+                            fx=fx,
+                            num_steps=step_index,
+                            num_sample_gradients=getattr(objective_function, 'num_sample_gradient_eval', 0) - num_sample_gradients_init)
@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+r"""
+Revised simplex method for linear programming.
+
+Solve linear programs of the form
+
+.. math::
+
+    \min_{\boldsymbol{x}} \boldsymbol{c}^\top \boldsymbol{x} \quad
+    \text{subject to} \quad A_{ub} \boldsymbol{x} \leq \boldsymbol{b}_{ub}, \quad
+    A_{eq} \boldsymbol{x} = \boldsymbol{b}_{eq}, \quad
+    \boldsymbol{l} \leq \boldsymbol{x} \leq \boldsymbol{u}
+
+Each constraint gets a logical (slack) variable :math:`s_i` so that all
+constraints are equalities :math:`\boldsymbol{a}_i^\top \boldsymbol{x} + s_i
+= b_i` with :math:`s_i \geq 0` (inequalities) or :math:`s_i = 0`
+(equalities). Variable bounds are handled by the method itself (nonbasic
+variables are at one of their bounds) instead of being added as constraints.
+
+The basis matrix is kept as an LU factorization with product-form updates:
+each pivot appends an eta vector instead of refactorizing the basis, and
+adding constraints borders the factorization with the new rows (their slack
+variables are basic). The basis is refactorized every `refactor_period`
+updates.
+
+A `LinearProgram` keeps its last basis: after `add_constraints` (e.g. new
+cuts in a cutting-plane method), the previous optimal basis extended with
+the new slack variables is still dual feasible and `solve` restarts from it
+with the dual simplex method, which usually needs only a few pivots. When
+no dual feasible basis is available, a feasible basis is searched with the
+dual simplex method on a zero objective (phase 1) and the primal simplex
+method finishes the job (phase 2).
+
+See:
+* https://en.wikipedia.org/wiki/Revised_simplex_method
+* I. Maros, *Computational Techniques of the Simplex Method*, Kluwer (2003).
+* R. J. Vanderbei, *Linear Programming: Foundations and Extensions*,
+  Springer (2014).
+"""
+
+__all__ = ['LinearProgram',
+           'linprog']
+
+import numpy as np
+
+from .result import OptimizeResult
+
+# The status of the variables
+_BASIC = 0
+_AT_LOWER = 1
+_AT_UPPER = 2
+_FREE = 3           # Nonbasic free variable (at zero)
+
+_MESSAGES = {0: "Optimization terminated successfully.",
+             1: "Iteration limit reached.",
+             2: "The problem is infeasible.",
+             3: "The problem is unbounded."}
+
+
+def _parse_bounds(bounds, num_variables):
+    """Return the lower and upper bounds of the variables (default: x >= 0)."""
+    lower = np.zeros(num_variables)
+    upper = np.full(num_variables, np.inf)
+
+    if bounds is None:
+        return lower, upper
+
+    bounds = np.array(bounds, dtype=object)
+
+    if bounds.shape == (2,):
+        bounds = np.tile(bounds, (num_variables, 1))
+
+    if bounds.shape != (num_variables, 2):
+        raise ValueError("bounds must be a (min, max) pair or a sequence of num_variables pairs.")
+
+    for index, (low, high) in enumerate(bounds):
+        lower[index] = -np.inf if low is None else low
+        upper[index] = np.inf if high is None else high
+
+    if np.any(lower > upper):
+        raise ValueError("Some lower bounds are greater than their upper bounds.")
+
+    return lower, upper
+
+
+class LinearProgram:
+    """A linear program solved with the revised simplex method.
+
+    Parameters
+    ----------
+    c : array_like
+        The coefficients of the linear objective function (to minimize).
+    A_ub : array_like
+        The `(m_ub, n)` matrix of the inequality constraints.
+    b_ub : array_like
+        The upper bounds of the inequality constraints.
+    A_eq : array_like
+        The `(m_eq, n)` matrix of the equality constraints.
+    b_eq : array_like
+        The right-hand sides of the equality constraints.
+    bounds : sequence
+        The `(min, max)` bounds of the variables: one pair for all the
+        variables or one pair per variable (`None` means no bound). The
+        default is `(0, None)`.
+    refactor_period : int
+        The number of pivots (product-form updates) between two
+        refactorizations of the basis.
+    tol : float
+        The feasibility and optimality tolerance.
+
+    Examples
+    --------
+    >>> lp = LinearProgram([-1., -2.], A_ub=[[1., 1.]], b_ub=[4.], bounds=(0., 3.))
+    >>> res = lp.solve()
+    >>> res.x, res.fx
+    (array([1., 3.]), -7.0)
+
+    Add a constraint and solve again (warm start):
+
+    >>> lp.add_constraints([[0., 1.]], [2.])
+    >>> res = lp.solve()
+    >>> res.x, res.fx
+    (array([2., 2.]), -6.0)
+    """
+
+    def __init__(self, c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, bounds=None, refactor_period=50, tol=1e-9):
+        self.c = np.array(c, dtype=np.float64).ravel()
+        self.num_variables = self.c.size
+
+        self.refactor_period = refactor_period
+        self.tol = tol
+
+        lower, upper = _parse_bounds(bounds, self.num_variables)
+
+        self.A = np.zeros([0, self.num_variables])
+        self.b = np.zeros(0)
+
+        # Bounds, status and values of all the variables (structural variables, then slack variables)
+        self._lower = lower
+        self._upper = upper
+        self._status = np.where(np.isfinite(lower), _AT_LOWER, np.where(np.isfinite(upper), _AT_UPPER, _FREE))
+        self._values = np.where(np.isfinite(lower), lower, np.where(np.isfinite(upper), upper, 0.))
+
+        self._basis = np.zeros(0, dtype=np.int64)
+        self._lu = None
+        self._updates = []
+
+        self.nit = 0
+
+        if A_ub is not None:
+            self.add_constraints(A_ub, b_ub)
+        if A_eq is not None:
+            self.add_constraints(A_eq, b_eq, equality=True)
+
+    @property
+    def num_constraints(self):
+        return self.A.shape[0]
+
+    def add_constraints(self, A, b, equality=False):
+        """Add constraints `A x <= b` (or `A x = b` if `equality` is set).
+
+        The slack variables of the new constraints enter the basis: the
+        current basis stays dual feasible and the next call to `solve`
+        restarts from it.
+
+        Parameters
+        ----------
+        A : array_like
+            The `(k, n)` matrix of the new constraints.
+        b : array_like
+            The `k` right-hand sides.
+        equality : bool
+            Add equality constraints instead of inequality constraints.
+        """
+        A = np.atleast_2d(np.asarray(A, dtype=np.float64))
+        b = np.atleast_1d(np.asarray(b, dtype=np.float64)).ravel()
+
+        if A.shape[1] != self.num_variables or b.shape[0] != A.shape[0]:
+            raise ValueError("A must be a (k, {}) matrix and b a vector of k elements.".format(self.num_variables))
+
+        num_new = A.shape[0]
+        first_index = self.num_variables + self.num_constraints
+
+        self.A = np.concatenate([self.A, A])
+        self.b = np.concatenate([self.b, b])
+
+        self._lower = np.concatenate([self._lower, np.zeros(num_new)])
+        self._upper = np.concatenate([self._upper, np.zeros(num_new) if equality else np.full(num_new, np.inf)])
+        self._status = np.concatenate([self._status, np.full(num_new, _BASIC)])
+        self._values = np.concatenate([self._values, np.zeros(num_new)])
+
+        if self._lu is not None:
+            # The new basis is [[B, 0], [R, I]] where R holds the new rows at
+            # the basic columns: the factorization is extended, not recomputed
+            structural = self._basis < self.num_variables
+            border = np.zeros([num_new, self._basis.size])
+            border[:, structural] = A[:, self._basis[structural]]
+            self._updates.append(('border', border))
+
+        self._basis = np.concatenate([self._basis, np.arange(first_index, first_index + num_new)])
+
+    # LINEAR ALGEBRA ##########################################################
+
+    def _columns(self, indices):
+        """The columns of `[A, I]` for the variables `indices`."""
+        indices = np.atleast_1d(indices)
+        columns = np.zeros([self.num_constraints, indices.size])
+        structural = indices < self.num_variables
+        columns[:, structural] = self.A[:, indices[structural]]
+        slack_columns = np.flatnonzero(~structural)
+        columns[indices[slack_columns] - self.num_variables, slack_columns] = 1.
+        return columns
+
+    def _refactor(self):
+        """Compute the LU factorization of the basis (and drop the eta vectors)."""
+        import scipy.linalg
+
+        basis_matrix = self._columns(self._basis)
+        lu, piv = scipy.linalg.lu_factor(basis_matrix, check_finite=False)
+
+        if self.num_constraints > 0 and np.min(np.abs(np.diag(lu))) < 1e-11 * max(1., np.abs(lu).max()):
+            # Singular basis (lost accuracy): restart from the slack basis
+            nonbasic = self._basis[self._basis < self.num_variables]
+            self._make_nonbasic(nonbasic)
+            self._basis = np.arange(self.num_variables, self.num_variables + self.num_constraints)
+            self._status[self._basis] = _BASIC
+            lu, piv = np.eye(self.num_constraints), np.arange(self.num_constraints, dtype=np.int32)
+
+        self._lu = (lu, piv)
+        self._updates = []
+
+    def _make_nonbasic(self, indices):
+        lower, upper = self._lower[indices], self._upper[indices]
+        self._status[indices] = np.where(np.isfinite(lower), _AT_LOWER, np.where(np.isfinite(upper), _AT_UPPER, _FREE))
+        self._values[indices] = np.where(np.isfinite(lower), lower, np.where(np.isfinite(upper), upper, 0.))
+
+    # The basis matrix is B = LU followed by the updates, in order: an eta
+    # update replaces B by B E (E is the identity matrix with the column `row`
+    # replaced by `eta`) and a border update replaces B by [[B, 0], [R, I]].
+
+    def _ftran(self, column):
+        """Solve `B x = column`."""
+        import scipy.linalg
+
+        size = self._lu[0].shape[0]
+        x = scipy.linalg.lu_solve(self._lu, column[:size], check_finite=False)
+
+        for kind, *update in self._updates:
+            if kind == 'eta':
+                row, eta = update
+                pivot = x[row] / eta[row]
+                x -= pivot * eta
+                x[row] = pivot
+            else:
+                border, = update
+                x = np.concatenate([x, column[size:size + border.shape[0]] - border @ x])
+                size += border.shape[0]
+
+        return x
+
+    def _btran(self, row_vector):
+        """Solve `B^T y = row_vector`."""
+        import scipy.linalg
+
+        y = np.array(row_vector, dtype=np.float64, copy=True)
+        tails = []
+
+        for kind, *update in reversed(self._updates):
+            if kind == 'eta':
+                row, eta = update
+                y[row] = (y[row] - (eta @ y - eta[row] * y[row])) / eta[row]
+            else:
+                border, = update
+                size = border.shape[1]
+                tails.append(y[size:])
+                y = y[:size] - border.T @ y[size:]
+
+        y = scipy.linalg.lu_solve(self._lu, y, trans=1, check_finite=False)
+
+        return np.concatenate([y] + tails[::-1])
+
+    def _pivot(self, row, entering, eta):
+        """Replace the basic variable of `row` by `entering` (product-form update)."""
+        self._basis[row] = entering
+        self._status[entering] = _BASIC
+        self._updates.append(('eta', row, eta))
+
+    def _compute_basic_values(self):
+        """Compute the values of the basic variables from the nonbasic ones."""
+        values = np.where(self._status == _BASIC, 0., self._values)
+        residual = self.b - self.A @ values[:self.num_variables] - values[self.num_variables:]
+        self._values[self._basis] = self._ftran(residual)
+
+    def _reduced_costs(self, cost):
+        y = self._btran(cost[self._basis])
+        reduced_costs = np.concatenate([cost[:self.num_variables] - self.A.T @ y, cost[self.num_variables:] - y])
+        reduced_costs[self._basis] = 0.
+        return reduced_costs, y
+
+    def _check_factorization(self):
+        if self._lu is None or len(self._updates) >= self.refactor_period:
+            self._refactor()
+            self._compute_basic_values()
+
+    # DUAL FEASIBILITY ########################################################
+
+    def _make_dual_feasible(self, reduced_costs):
+        """Put the boxed nonbasic variables at the bound matching the sign of their reduced cost.
+
+        Returns `True` if the basis is dual feasible.
+        """
+        tol = self.tol
+        boxed = np.isfinite(self._lower) & np.isfinite(self._upper)
+
+        to_upper = boxed & (self._status == _AT_LOWER) & (reduced_costs < -tol)
+        to_lower = boxed & (self._status == _AT_UPPER) & (reduced_costs > tol)
+
+        if np.any(to_upper) or np.any(to_lower):
+            self._status[to_upper] = _AT_UPPER
+            self._values[to_upper] = self._upper[to_upper]
+            self._status[to_lower] = _AT_LOWER
+            self._values[to_lower] = self._lower[to_lower]
+            self._compute_basic_values()
+
+        infeasible = (((self._status == _AT_LOWER) & (reduced_costs < -tol))
+                      | ((self._status == _AT_UPPER) & (reduced_costs > tol))
+                      | ((self._status == _FREE) & (np.abs(reduced_costs) > tol)))
+
+        return not np.any(infeasible)
+
+    def _primal_infeasibilities(self):
+        basic_values = self._values[self._basis]
+        below = self._lower[self._basis] - basic_values
+        above = basic_values - self._upper[self._basis]
+        return below, above
+
+    # PRIMAL SIMPLEX ##########################################################
+
+    def _primal_simplex(self, cost, max_iterations):
+        """Primal simplex from a primal feasible basis. Returns the status code."""
+        tol = self.tol
+        num_degenerate_pivots = 0
+
+        while self.nit < max_iterations:
+            self._check_factorization()
+
+            reduced_costs, _ = self._reduced_costs(cost)
+            movable = self._upper > self._lower
+
+            eligible = movable & (((self._status == _AT_LOWER) & (reduced_costs < -tol))
+                                  | ((self._status == _AT_UPPER) & (reduced_costs > tol))
+                                  | ((self._status == _FREE) & (np.abs(reduced_costs) > tol)))
+
+            if not np.any(eligible):
+                return 0
+
+            if num_degenerate_pivots > 50:
+                entering = np.flatnonzero(eligible)[0]                        # Bland's rule (anti-cycling)
+            else:
+                entering = np.argmax(np.where(eligible, np.abs(reduced_costs), -1.))
+
+            direction = 1. if reduced_costs[entering] < 0. else -1.
+            alpha = self._ftran(self._columns(entering)[:, 0])
+            step = direction * alpha                                          # x_B(t) = x_B - t * step
+
+            basic_values = self._values[self._basis]
+            basic_lower = self._lower[self._basis]
+            basic_upper = self._upper[self._basis]
+
+            # Harris ratio test: bound the step with relaxed bounds, then
+            # choose the largest pivot among the rows reaching their bound first
+            decreasing = (step > tol) & np.isfinite(basic_lower)
+            increasing = (step < -tol) & np.isfinite(basic_upper)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ratios = np.where(decreasing, (basic_values - basic_lower) / step,
+                                  np.where(increasing, (basic_upper - basic_values) / -step, np.inf))
+                relaxed_ratios = np.where(decreasing, (basic_values - basic_lower + tol) / step,
+                                          np.where(increasing, (basic_upper - basic_values + tol) / -step, np.inf))
+
+            max_step = relaxed_ratios.min() if relaxed_ratios.size > 0 else np.inf
+            bound_range = self._upper[entering] - self._lower[entering]
+
+            if bound_range <= max_step:
+                if not np.isfinite(bound_range):
+                    return 3
+
+                # Bound flip: the entering variable goes to its other bound
+                self._values[self._basis] = basic_values - bound_range * step
+                self._values[entering] += direction * bound_range
+                self._status[entering] = _AT_UPPER if direction > 0. else _AT_LOWER
+                self.nit += 1
+                num_degenerate_pivots = 0
+                continue
+
+            candidates = np.flatnonzero(ratios <= max_step)
+            row = candidates[np.argmax(np.abs(alpha[candidates]))]
+            theta = max(ratios[row], 0.)
+
+            leaving = self._basis[row]
+            self._values[self._basis] = basic_values - theta * step
+            self._values[entering] += direction * theta
+
+            if step[row] > 0.:
+                self._status[leaving], self._values[leaving] = _AT_LOWER, basic_lower[row]
+            else:
+                self._status[leaving], self._values[leaving] = _AT_UPPER, basic_upper[row]
+
+            self._pivot(row, entering, alpha)
+            self.nit += 1
+
+            num_degenerate_pivots = num_degenerate_pivots + 1 if theta <= tol else 0
+
+        return 1
+
+    # DUAL SIMPLEX ############################################################
+
+    def _dual_simplex(self, cost, max_iterations):
+        """Dual simplex from a dual feasible basis. Returns the status code."""
+        tol = self.tol
+        num_degenerate_pivots = 0
+
+        while self.nit < max_iterations:
+            self._check_factorization()
+
+            below, above = self._primal_infeasibilities()
+            infeasibilities = np.maximum(below, above)
+
+            if infeasibilities.size == 0 or infeasibilities.max() <= tol:
+                return 0
+
+            if num_degenerate_pivots > 50:
+                row = np.flatnonzero(infeasibilities > tol)[0]               # Bland's rule (anti-cycling)
+            else:
+                row = np.argmax(infeasibilities)
+
+            leaving = self._basis[row]
+            sign = 1. if below[row] > tol else -1.                         # +1: the leaving variable must increase
+            bound = self._lower[leaving] if sign > 0. else self._upper[leaving]
+
+            unit = np.zeros(self.num_constraints)
+            unit[row] = 1.
+            rho = self._btran(unit)
+            alpha_row = np.concatenate([rho @ self.A, rho])
+
+            reduced_costs, _ = self._reduced_costs(cost)
+            movable = (self._status != _BASIC) & (self._upper > self._lower)
+
+            signed_alpha = sign * alpha_row
+            eligible = movable & (((self._status == _AT_LOWER) & (signed_alpha < -tol))
+                                  | ((self._status == _AT_UPPER) & (signed_alpha > tol))
+                                  | ((self._status == _FREE) & (np.abs(alpha_row) > tol)))
+
+            if not np.any(eligible):
+                return 2
+
+            # Harris ratio test on the reduced costs
+            candidates = np.flatnonzero(eligible)
+            abs_alpha = np.abs(alpha_row[candidates])
+            abs_reduced_costs = np.abs(reduced_costs[candidates])
+            max_step = np.min((abs_reduced_costs + tol) / abs_alpha)
+            ratios = abs_reduced_costs / abs_alpha
+            close = ratios <= max_step
+            entering = candidates[close][np.argmax(abs_alpha[close])]
+
+            alpha = self._ftran(self._columns(entering)[:, 0])
+            delta = (self._values[leaving] - bound) / alpha[row]
+
+            self._values[self._basis] -= delta * alpha
+            self._values[entering] += delta
+
+            self._status[leaving] = _AT_LOWER if sign > 0. else _AT_UPPER
+            self._values[leaving] = bound
+
+            self._pivot(row, entering, alpha)
+            self.nit += 1
+
+            num_degenerate_pivots = num_degenerate_pivots + 1 if ratios[close].min() <= tol else 0
+
+            # Keep the boxed variables dual feasible (bound flips)
+            reduced_costs, _ = self._reduced_costs(cost)
+            self._make_dual_feasible(reduced_costs)
+
+        return 1
+
+    # SOLVER ##################################################################
+
+    def solve(self, max_iterations=10000):
+        """Solve the linear program (from the last basis).
+
+        Parameters
+        ----------
+        max_iterations : int
+            The maximum number of pivots (and bound flips) of this call.
+
+        Returns
+        -------
+        OptimizeResult
+            The result: `x` (the solution), `fx` (its value), `slack` (the
+            slacks of the constraints), `duals` (the dual values of the
+            constraints), `status` (0: optimal, 1: iteration limit reached,
+            2: infeasible, 3: unbounded), `success`, `message` and `nit` (the
+            number of pivots of this call).
+        """
+        first_iteration = self.nit
+        max_iterations += self.nit
+
+        self._check_factorization()
+        self._compute_basic_values()
+
+        # The slack variables have no cost
+        cost = np.concatenate([self.c, np.zeros(self.num_constraints)])
+
+        reduced_costs, _ = self._reduced_costs(cost)
+
+        if self._make_dual_feasible(reduced_costs):
+            # Warm start (e.g. after adding constraints): dual simplex
+            status = self._dual_simplex(cost, max_iterations)
+        else:
+            below, above = self._primal_infeasibilities()
+            if below.size > 0 and max(below.max(), above.max()) > self.tol:
+                # Phase 1: any basis is dual feasible for a zero objective
+                status = self._dual_simplex(np.zeros_like(cost), max_iterations)
+            else:
+                status = 0
+
+        if status == 0:
+            # Phase 2 (or a final check after the dual simplex)
+            status = self._primal_simplex(cost, max_iterations)
+
+        self._compute_basic_values()
+        _, duals = self._reduced_costs(cost)
+
+        x = self._values[:self.num_variables].copy()
+
+        return OptimizeResult(x=x,
+                              fx=float(self.c @ x),
+                              slack=self._values[self.num_variables:].copy(),
+                              duals=duals,
+                              status=status,
+                              success=status == 0,
+                              message=_MESSAGES[status],
+                              nit=self.nit - first_iteration)
+
+
+def linprog(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, bounds=None, max_iterations=10000):
+    """Solve a linear program with the revised simplex method (see `LinearProgram`).
+
+    Examples
+    --------
+    >>> res = linprog([1., 1.], A_ub=[[-1., -2.], [-3., -1.]], b_ub=[-4., -6.])
+    >>> np.round(res.x, 6), round(res.fx, 6)
+    (array([1.6, 1.2]), 2.8)
+    """
+    return LinearProgram(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds).solve(max_iterations=max_iterations)
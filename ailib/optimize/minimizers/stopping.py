@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Stopping criteria for minimizers.
+
+A stopping criterion is a callable object that takes the state of a run
+(an `OptimizationState` object) and returns the reason why the run should
+stop (a string) or `None` to continue. Criteria are combined with the `|`
+operator, for instance::
+
+    criteria = MaxEvaluations(10000) | Deadline(60.) | TargetValue(1e-8)
+    res = SAES().minimize(objective_function, ..., stopping_criteria=criteria)
+
+Minimizers check their stopping criteria after each iteration (or
+generation), in addition to their own iteration limit and internal
+convergence tests.
+"""
+
+__all__ = ['StoppingCriterion',
+           'AnyOf',
+           'MaxIterations',
+           'MaxEvaluations',
+           'Deadline',
+           'TargetValue',
+           'Stagnation',
+           'SigmaMin',
+           'OptimizationState']
+
+import time
+import numpy as np
+
+from .result import OptimizeResult
+
+
+class StoppingCriterion:
+    """Generic stopping criterion."""
+
+    def reset(self):
+        """Reset the internal state of the criterion (called at the beginning of each run)."""
+        pass
+
+    def get_state(self):
+        """Return the internal state of the criterion (a dictionary of numbers, for checkpoints)."""
+        return {}
+
+    def set_state(self, state):
+        """Restore a state returned by `get_state`."""
+        pass
+
+    def __call__(self, state):
+        """Check the criterion.
+
+        Parameters
+        ----------
+        state : OptimizationState
+            The state of the run.
+
+        Returns
+        -------
+        str
+            The termination reason if the run should stop, `None` otherwise.
+        """
+        raise NotImplementedError
+
+    def __or__(self, other):
+        return AnyOf(self, other)
+
+
+class AnyOf(StoppingCriterion):
+    """Stop as soon as one of the given criteria is met."""
+
+    def __init__(self, *criteria):
+        self.criteria = []
+        for criterion in criteria:
+            if isinstance(criterion, AnyOf):
+                self.criteria.extend(criterion.criteria)
+            else:
+                self.criteria.append(criterion)
+
+    def reset(self):
+        for criterion in self.criteria:
+            criterion.reset()
+
+    def get_state(self):
+        state = {}
+        for index, criterion in enumerate(self.criteria):
+            for key, value in criterion.get_state().items():
+                state["{}.{}".format(index, key)] = value
+        return state
+
+    def set_state(self, state):
+        for index, criterion in enumerate(self.criteria):
+            prefix = "{}.".format(index)
+            criterion.set_state({key[len(prefix):]: value for key, value in state.items() if key.startswith(prefix)})
+
+    def __call__(self, state):
+        for criterion in self.criteria:
+            reason = criterion(state)
+            if reason is not None:
+                return reason
+        return None
+
+
+class MaxIterations(StoppingCriterion):
+    """Stop after `max_iterations` iterations (or generations)."""
+
+    def __init__(self, max_iterations):
+        self.max_iterations = max_iterations
+
+    def __call__(self, state):
+        if state.nit >= self.max_iterations:
+            return "max_iterations"
+        return None
+
+
+class MaxEvaluations(StoppingCriterion):
+    """Stop when `max_evaluations` evaluations of the objective function have been made.
+
+    If `count_derivatives` is set, the evaluations of the gradient and of the
+    Hessian are counted too.
+    """
+
+    def __init__(self, max_evaluations, count_derivatives=False):
+        self.max_evaluations = max_evaluations
+        self.count_derivatives = count_derivatives
+
+    def __call__(self, state):
+        num_evaluations = state.nfev
+        if self.count_derivatives:
+            num_evaluations += state.ngev + state.nhev
+        if num_evaluations >= self.max_evaluations:
+            return "max_evaluations"
+        return None
+
+
+class Deadline(StoppingCriterion):
+    """Stop when the run has lasted more than `max_time` seconds (wall-clock time)."""
+
+    def __init__(self, max_time):
+        self.max_time = max_time
+
+    def __call__(self, state):
+        if state.wall_time >= self.max_time:
+            return "deadline"
+        return None
+
+
+class TargetValue(StoppingCriterion):
+    """Stop when a value lower or equal to `target` has been found."""
+
+    def __init__(self, target):
+        self.target = target
+
+    def __call__(self, state):
+        if state.fx is not None and state.fx <= self.target:
+            return "target_value"
+        return None
+
+
+class Stagnation(StoppingCriterion):
+    """Stop when the best value has not improved by more than `tol` for `num_iterations` iterations."""
+
+    def __init__(self, num_iterations, tol=0.):
+        self.num_iterations = num_iterations
+        self.tol = tol
+        self.reset()
+
+    def reset(self):
+        self._reference_fx = None
+        self._reference_iteration = 0
+
+    def get_state(self):
+        if self._reference_fx is None:
+            return {}
+        return {'reference_fx': self._reference_fx, 'reference_iteration': self._reference_iteration}
+
+    def set_state(self, state):
+        if 'reference_fx' in state:
+            self._reference_fx = float(state['reference_fx'])
+            self._reference_iteration = int(state['reference_iteration'])
+
+    def __call__(self, state):
+        if state.fx is None:
+            return None
+
+        if (self._reference_fx is None) or (state.fx < self._reference_fx - self.tol):
+            self._reference_fx = state.fx
+            self._reference_iteration = state.nit
+        elif state.nit - self._reference_iteration >= self.num_iterations:
+            return "stagnation"
+
+        return None
+
+
+class SigmaMin(StoppingCriterion):
+    """Stop when the mutation strength (step size) `sigma` of the optimizer is smaller than `sigma_min`.
+
+    This only applies to optimizers reporting a `sigma` (e.g. evolution
+    strategies).
+    """
+
+    def __init__(self, sigma_min):
+        self.sigma_min = sigma_min
+
+    def __call__(self, state):
+        if state.sigma is not None and state.sigma < self.sigma_min:
+            return "sigma_min"
+        return None
+
+
+class OptimizationState:
+    """The state of a run: counters, timer, best point found and history.
+
+    Minimizers create one `OptimizationState` per run, call `update` after
+    each iteration and `stop` to check the stopping criteria, then make the
+    result object with `result`.
+
+    Parameters
+    ----------
+    objective_function : callable object
+        The function to minimize (its evaluation counters are used to compute
+        `nfev`, `ngev` and `nhev`).
+    stopping_criteria : StoppingCriterion
+        The stopping criteria of the run (or `None`).
+    record_history : bool
+        Keep an history of the values given to `update`.
+
+    Examples
+    --------
+    >>> from ailib.optimize.functions.unconstrained import Sphere
+    >>> sphere = Sphere(1)
+    >>> state = OptimizationState(sphere, TargetValue(1e-8) | MaxEvaluations(3), record_history=True)
+    >>> for x in ([2.], [1.], [3.], [0.5]):
+    ...     x = np.array(x)
+    ...     state.update(x, sphere(x))
+    ...     if state.stop():
+    ...         break
+    >>> res = state.result()
+    >>> res.x, res.fx, res.nfev, res.nit, res.termination_reason
+    (array([1.]), 1.0, 3, 3, 'max_evaluations')
+    >>> res.history['fx']
+    array([4., 1., 9.])
+
+    The stagnation criterion stops the run when the best value doesn't
+    improve:
+
+    >>> state = OptimizationState(sphere, Stagnation(2))
+    >>> for x in ([2.], [1.], [3.], [1.5], [0.5]):
+    ...     x = np.array(x)
+    ...     state.update(x, sphere(x))
+    ...     if state.stop():
+    ...         break
+    >>> state.nit, state.fx, state.termination_reason
+    (4, 1.0, 'stagnation')
+    """
+
+    def __init__(self, objective_function, stopping_criteria=None, record_history=False):
+        self.objective_function = objective_function
+        self.stopping_criteria = stopping_criteria
+        self.record_history = record_history
+
+        if self.stopping_criteria is not None:
+            self.stopping_criteria.reset()
+
+        self._num_eval_init = getattr(objective_function, 'num_eval', 0)
+        self._num_gradient_eval_init = getattr(objective_function, 'num_gradient_eval', 0)
+        self._num_hessian_eval_init = getattr(objective_function, 'num_hessian_eval', 0)
+        self._start_time = time.perf_counter()
+        self._num_external_eval = 0
+
+        self.nit = 0
+        self.x = None           # The best point found so far
+        self.fx = None          # The value of the best point found so far
+        self.sigma = None       # The current step size (if any)
+        self.termination_reason = None
+        self.history = {} if record_history else None
+
+    @property
+    def nfev(self):
+        return getattr(self.objective_function, 'num_eval', 0) - self._num_eval_init + self._num_external_eval
+
+    def count_evaluations(self, num_evaluations):
+        """Count evaluations the objective function object doesn't see (e.g. evaluations made in worker processes)."""
+        self._num_external_eval += num_evaluations
+
+    @property
+    def ngev(self):
+        return getattr(self.objective_function, 'num_gradient_eval', 0) - self._num_gradient_eval_init
+
+    @property
+    def nhev(self):
+        return getattr(self.objective_function, 'num_hessian_eval', 0) - self._num_hessian_eval_init
+
+    @property
+    def wall_time(self):
+        return time.perf_counter() - self._start_time
+
+    def get_state(self):
+        """Return a copy of the state of the run (for checkpoints).
+
+        Returns
+        -------
+        dict
+            The counters, the best point found, the history and the state of
+            the stopping criteria (a dictionary of numbers and numpy arrays).
+        """
+        state = {'nit': self.nit,
+                 'nfev': self.nfev,
+                 'ngev': self.ngev,
+                 'nhev': self.nhev,
+                 'wall_time': self.wall_time}
+
+        if self.x is not None:
+            state['x'] = np.array(self.x, copy=True)
+        if self.fx is not None:
+            state['fx'] = self.fx
+        if self.sigma is not None:
+            state['sigma'] = self.sigma
+
+        if self.history is not None:
+            for key, value in self.history.items():
+                state['history.' + key] = np.array(value)
+
+        if self.stopping_criteria is not None:
+            for key, value in self.stopping_criteria.get_state().items():
+                state['stopping_criteria.' + key] = value
+
+        return state
+
+    def set_state(self, state):
+        """Restore a state returned by `get_state` (the counters and the timer continue from the saved values)."""
+        self.nit = int(state['nit'])
+
+        # Evaluations and time spent before the checkpoint are added to the new counters
+        self._num_eval_init = getattr(self.objective_function, 'num_eval', 0) - int(state['nfev'])
+        self._num_gradient_eval_init = getattr(self.objective_function, 'num_gradient_eval', 0) - int(state['ngev'])
+        self._num_hessian_eval_init = getattr(self.objective_function, 'num_hessian_eval', 0) - int(state['nhev'])
+        self._start_time = time.perf_counter() - float(state['wall_time'])
+
+        self.x = np.array(state['x']) if 'x' in state else None
+        self.fx = float(state['fx']) if 'fx' in state else None
+        self.sigma = float(state['sigma']) if 'sigma' in state else None
+
+        if self.history is not None:
+            self.history = {key[len('history.'):]: list(value) for key, value in state.items() if key.startswith('history.')}
+
+        if self.stopping_criteria is not None:
+            prefix = 'stopping_criteria.'
+            self.stopping_criteria.set_state({key[len(prefix):]: value for key, value in state.items() if key.startswith(prefix)})
+
+    def update(self, x, fx=None, sigma=None, **extra):
+        """Record the end of an iteration.
+
+        Parameters
+        ----------
+        x : ndarray
+            The current point (or the best point of the current generation).
+        fx : float
+            The value of `x` (if known).
+        sigma : float
+            The current step size (if any).
+        extra : dict
+            Other quantities to keep in the history.
+        """
+        self.nit += 1
+
+        if fx is not None and (self.fx is None or fx < self.fx):
+            self.x = np.array(x, copy=True)
+            self.fx = fx
+        elif self.x is None:
+            self.x = np.array(x, copy=True)
+
+        if sigma is not None:
+            self.sigma = sigma
+
+        if self.record_history:
+            extra['x'] = np.array(x, copy=True)
+            extra['fx'] = fx
+            if sigma is not None:
+                extra['sigma'] = sigma
+            for key, value in extra.items():
+                self.history.setdefault(key, []).append(value)
+
+    def stop(self):
+        """Check the stopping criteria.
+
+        Returns
+        -------
+        bool
+            `True` if the run should stop (the reason is kept in
+            `termination_reason`).
+        """
+        if self.stopping_criteria is not None:
+            reason = self.stopping_criteria(self)
+            if reason is not None:
+                self.termination_reason = reason
+                return True
+        return False
+
+    def terminate(self, reason):
+        """Record a termination decided by the minimizer itself (e.g. convergence)."""
+        self.termination_reason = reason
+
+    def result(self, x=None, fx=None, **extra):
+        """Make the result object.
+
+        Parameters
+        ----------
+        x : ndarray
+            The solution (default: the best point given to `update`).
+        fx : float
+            The value of `x` (default: the best value given to `update`).
+        extra : dict
+            Other items to add to the result.
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the run.
+        """
+        if x is None:
+            x, fx = self.x, self.fx
+
+        if self.history is not None:
+            history = {key: np.array(value) for key, value in self.history.items()}
+        else:
+            history = None
+
+        result = OptimizeResult(x=x,
+                                fx=fx,
+                                nfev=self.nfev,
+                                ngev=self.ngev,
+                                nhev=self.nhev,
+                                nit=self.nit,
+                                wall_time=self.wall_time,
+                                termination_reason=self.termination_reason if self.termination_reason is not None else "max_iterations",
+                                history=history)
+        result.update(extra)
+
+        return result
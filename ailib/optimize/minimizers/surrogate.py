@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+r"""
+Surrogate models of the objective function.
+
+A surrogate is a cheap approximation of the objective function fitted on an
+archive of evaluated points. Minimizers use it to rank candidate points
+before spending true evaluations on them (pre-screening).
+
+The archive is a ring buffer of the `max_points` most recent points: as
+population-based minimizers move, the oldest points are replaced and the
+model stays local to the current search region. Points are added with
+`update` and the model is evaluated with `predict`; both take batches of
+points as `(ndim, n)` arrays, like objective functions.
+
+What is incremental: the archive (and, for the RBF model, the matrix of
+pairwise distances) is updated point by point, and the model is refitted
+lazily, at most once per batch of new points (on the next `predict`). The
+fit itself is not updated incrementally: it solves the least squares
+problem on the whole archive again. This is a deliberate choice:
+
+* the quadratic archive holds at most twice as many points as coefficients
+  (:math:`p`), so a full fit costs :math:`O(p^3)`, like solving updated
+  normal equations would, and it keeps the points re-centered and rescaled
+  around the current archive (updated normal equations would have to keep
+  a fixed origin and scale, and downdating the points leaving the ring
+  buffer would lose accuracy);
+* the RBF system (of size `max_points`, 100 by default) is a symmetric
+  indefinite saddle point system that is singular when points are
+  duplicated; it is solved by least squares in a few milliseconds, whereas
+  bordered factorization updates and downdates would not handle the
+  singular cases.
+
+Available models:
+
+* `QuadraticSurrogate`: a quadratic polynomial fitted by least squares
+  (diagonal quadratic until the archive is large enough for the full one);
+* `RBFSurrogate`: a cubic radial basis function interpolant with a linear
+  tail (the distances between archived points are cached, so adding a point
+  only computes its distances to the archive).
+
+See:
+* Y. Jin, "Surrogate-assisted evolutionary computation: recent advances
+  and future challenges", Swarm and Evolutionary Computation 1(2), 61-70
+  (2011).
+* R. G. Regis and C. A. Shoemaker, "A stochastic radial basis function
+  method for the global optimization of expensive functions", INFORMS
+  Journal on Computing 19(4), 497-509 (2007).
+"""
+
+__all__ = ['QuadraticSurrogate',
+           'RBFSurrogate',
+           'make_surrogate']
+
+import numpy as np
+
+
+class _Surrogate:
+    """Generic surrogate model (ring buffer archive).
+
+    Parameters
+    ----------
+    ndim : int
+        The number of dimensions of the solution space.
+    max_points : int
+        The size of the archive.
+    """
+
+    def __init__(self, ndim, max_points):
+        self.ndim = ndim
+        self.max_points = max_points
+
+        self.archive_x = np.zeros([max_points, ndim])
+        self.archive_y = np.zeros(max_points)
+        self.num_points = 0         # The number of points added so far
+
+        self._fitted = False
+
+    @property
+    def size(self):
+        """The number of points in the archive."""
+        return min(self.num_points, self.max_points)
+
+    @property
+    def ready(self):
+        """`True` when the archive contains enough points to fit the model."""
+        return self.size >= self.min_points
+
+    def update(self, x, y):
+        """Add evaluated points to the archive.
+
+        Non-finite values are ignored.
+
+        Parameters
+        ----------
+        x : ndarray
+            The `(ndim, n)` array of points.
+        y : ndarray
+            The `n` values of the objective function at `x`.
+        """
+        x = np.asarray(x, dtype=np.float64).reshape([self.ndim, -1]).T
+        y = np.asarray(y, dtype=np.float64).ravel()
+
+        finite = np.isfinite(y)
+
+        for xi, yi in zip(x[finite], y[finite]):
+            slot = self.num_points % self.max_points
+            self.archive_x[slot] = xi
+            self.archive_y[slot] = yi
+            self._add_point(slot)
+            self.num_points += 1
+
+        self._fitted = False
+
+    def predict(self, x):
+        """Predict the values of the objective function.
+
+        Parameters
+        ----------
+        x : ndarray
+            The `(ndim, n)` array of points.
+
+        Returns
+        -------
+        ndarray
+            The `n` predicted values.
+        """
+        if not self.ready:
+            raise ValueError("The surrogate needs at least {} points (it has {}).".format(self.min_points, self.size))
+
+        if not self._fitted:
+            self._fit()
+            self._fitted = True
+
+        x = np.asarray(x, dtype=np.float64).reshape([self.ndim, -1]).T
+        return self._predict(x)
+
+    def get_state(self):
+        """Return the archive (a dict of arrays, see `Optimizer.get_state`)."""
+        return {'archive_x': self.archive_x.copy(),
+                'archive_y': self.archive_y.copy(),
+                'num_points': self.num_points}
+
+    def set_state(self, state):
+        """Restore an archive returned by `get_state`."""
+        self.archive_x = np.array(state['archive_x'], dtype=np.float64)
+        self.archive_y = np.array(state['archive_y'], dtype=np.float64)
+        self.num_points = int(state['num_points'])
+        for slot in range(self.size):
+            self._add_point(slot)
+        self._fitted = False
+
+    def _add_point(self, slot):
+        pass
+
+
+class QuadraticSurrogate(_Surrogate):
+    """Quadratic polynomial surrogate fitted by least squares.
+
+    The full quadratic model (`1 + ndim + ndim (ndim + 1) / 2` coefficients)
+    is used when the archive holds at least as many points, the diagonal one
+    (`1 + 2 ndim` coefficients, without cross terms) otherwise.
+
+    Parameters
+    ----------
+    ndim : int
+        The number of dimensions of the solution space.
+    max_points : int
+        The size of the archive (default: twice the number of coefficients of
+        the full model).
+
+    Examples
+    --------
+    The model is exact on quadratic functions:
+
+    >>> quadratic = lambda x: (x[0] - 1.)**2 + 3. * x[0] * x[1] + 2. * x[1]**2
+    >>> np.random.seed(0)
+    >>> x = np.random.uniform(-1., 1., size=[2, 20])
+    >>> surrogate = QuadraticSurrogate(2)
+    >>> surrogate.update(x, quadratic(x))
+    >>> surrogate.size, surrogate.max_points
+    (12, 12)
+    >>> x_test = np.array([[2., 3.], [0., -1.]])
+    >>> np.round(surrogate.predict(x_test), 6), quadratic(x_test)
+    (array([ 1., -3.]), array([ 1., -3.]))
+    """
+
+    def __init__(self, ndim, max_points=None):
+        self._upper_indices = np.triu_indices(ndim)
+        self.num_full_coefficients = 1 + ndim + self._upper_indices[0].shape[0]
+        self.min_points = 1 + 2 * ndim
+
+        if max_points is None:
+            max_points = 2 * self.num_full_coefficients
+
+        super().__init__(ndim, max_points)
+
+    def _features(self, x, full):
+        columns = [np.ones([x.shape[0], 1]), x]
+        if full:
+            columns.append(x[:, self._upper_indices[0]] * x[:, self._upper_indices[1]])
+        else:
+            columns.append(x**2)
+        return np.concatenate(columns, axis=1)
+
+    def _fit(self):
+        # Fitted from scratch on the whole archive (see the module docstring)
+        size = self.size
+        x = self.archive_x[:size]
+
+        self._full = size >= self.num_full_coefficients
+
+        # Center and scale the points for a better conditioning
+        self._center = x.mean(axis=0)
+        self._scale = np.maximum(x.std(axis=0), 1e-12)
+
+        features = self._features((x - self._center) / self._scale, self._full)
+        self._coefficients = np.linalg.lstsq(features, self.archive_y[:size], rcond=None)[0]
+
+    def _predict(self, x):
+        return self._features((x - self._center) / self._scale, self._full) @ self._coefficients
+
+
+class RBFSurrogate(_Surrogate):
+    r"""Cubic radial basis function interpolant.
+
+    .. math::
+
+        s(\boldsymbol{x}) = \sum_{i} \lambda_i \|\boldsymbol{x} - \boldsymbol{x}_i\|^3 + \boldsymbol{c}^\top \boldsymbol{x} + c_0
+
+    Parameters
+    ----------
+    ndim : int
+        The number of dimensions of the solution space.
+    max_points : int
+        The size of the archive.
+
+    Examples
+    --------
+    The model interpolates the archived points:
+
+    >>> quadratic = lambda x: (x[0] - 1.)**2 + 3. * x[0] * x[1] + 2. * x[1]**2
+    >>> np.random.seed(0)
+    >>> x = np.random.uniform(-1., 1., size=[2, 20])
+    >>> surrogate = RBFSurrogate(2)
+    >>> surrogate.update(x, quadratic(x))
+    >>> np.allclose(surrogate.predict(x), quadratic(x))
+    True
+    """
+
+    def __init__(self, ndim, max_points=100):
+        self.min_points = ndim + 2
+        super().__init__(ndim, max_points)
+        self._distances = np.zeros([max_points, max_points])
+
+    def _add_point(self, slot):
+        # Only the distances to the new point are computed
+        distances = np.sqrt(np.sum((self.archive_x - self.archive_x[slot])**2, axis=1))
+        self._distances[slot, :] = distances
+        self._distances[:, slot] = distances
+
+    def _fit(self):
+        # Solved from scratch with the cached distances (see the module docstring)
+        size = self.size
+        x = self.archive_x[:size]
+
+        tail = np.concatenate([np.ones([size, 1]), x], axis=1)
+        num_tail = tail.shape[1]
+
+        system = np.zeros([size + num_tail, size + num_tail])
+        system[:size, :size] = self._distances[:size, :size]**3
+        system[:size, size:] = tail
+        system[size:, :size] = tail.T
+
+        rhs = np.concatenate([self.archive_y[:size], np.zeros(num_tail)])
+
+        # Least squares: the system is singular when points are duplicated
+        solution = np.linalg.lstsq(system, rhs, rcond=None)[0]
+        self._weights = solution[:size]
+        self._tail_coefficients = solution[size:]
+
+    def _predict(self, x):
+        size = self.size
+        distances = np.sqrt(np.maximum(np.sum(x**2, axis=1)[:, np.newaxis]
+                                       - 2. * x @ self.archive_x[:size].T
+                                       + np.sum(self.archive_x[:size]**2, axis=1)[np.newaxis, :], 0.))
+        tail = np.concatenate([np.ones([x.shape[0], 1]), x], axis=1)
+        return distances**3 @ self._weights + tail @ self._tail_coefficients
+
+
+def make_surrogate(surrogate, ndim):
+    """Make a surrogate model from its name (`'quadratic'` or `'rbf'`).
+
+    Surrogate objects are returned unchanged.
+    """
+    if surrogate == 'quadratic':
+        return QuadraticSurrogate(ndim)
+    elif surrogate == 'rbf':
+        return RBFSurrogate(ndim)
+    elif isinstance(surrogate, _Surrogate):
+        return surrogate
+    else:
+        raise ValueError("Unknown surrogate {}.".format(surrogate))
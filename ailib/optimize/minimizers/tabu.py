@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+r"""
+Tabu search for discrete neighbourhoods.
+
+At each iteration, tabu search moves to the best neighbour of the current
+solution that is not tabu (even if it is worse than the current solution);
+the attributes of the last moves are tabu for `tenure` iterations, which
+keeps the search from cycling back. A tabu move is still allowed if it
+leads to a solution better than the best one found so far (aspiration).
+
+Problems define their neighbourhood with the `TabuProblem` interface. The
+values of all the neighbours (as deltas to the current value) are computed
+at once with `TabuProblem.deltas`; problems can keep auxiliary data up to
+date in `TabuProblem.apply` to compute these deltas incrementally instead
+of evaluating each neighbour from scratch (see `QUBOProblem`).
+
+The tabu memory (`TabuMemory`) is a hash table of the tabu move attributes
+with a ring buffer of the last `tenure` attributes for expiry: adding an
+attribute and checking an attribute are :math:`O(1)`.
+
+See:
+* https://en.wikipedia.org/wiki/Tabu_search
+* F. Glover, "Tabu search - part I", ORSA Journal on Computing 1(3),
+  190-206 (1989).
+* F. Glover, G. Kochenberger and Y. Du, "A tutorial on formulating and
+  using QUBO models", 4OR 17, 335-371 (2019).
+"""
+
+__all__ = ['TabuMemory',
+           'TabuProblem',
+           'BitFlipProblem',
+           'QUBOProblem',
+           'TabuSearch']
+
+import numpy as np
+
+from .optimizer import Optimizer
+from .stopping import OptimizationState
+
+
+class TabuMemory:
+    """The attributes of the last `tenure` moves.
+
+    The attributes are kept in a hash table (mapping each attribute to its
+    number of occurrences in the memory) and in a ring buffer of size
+    `tenure`: when the buffer is full, adding an attribute expires the
+    oldest one.
+
+    If the attributes are integers in `range(key_space)`, a dense array
+    replaces the hash table (a direct-address table) and `contains` is fully
+    vectorized.
+
+    Parameters
+    ----------
+    tenure : int
+        The number of moves an attribute stays tabu.
+    key_space : int
+        The number of possible (integer) attributes, if known.
+
+    Examples
+    --------
+    >>> memory = TabuMemory(tenure=2)
+    >>> memory.add(3); memory.add(5); memory.add(7)
+    >>> memory.contains([3, 5, 7])
+    array([False,  True,  True])
+    """
+
+    def __init__(self, tenure, key_space=None):
+        self.tenure = tenure
+        self.key_space = key_space
+        self.clear()
+
+    def clear(self):
+        """Remove all attributes."""
+        self._ring = [None] * self.tenure
+        self._position = 0
+        if self.key_space is None:
+            self._counts = {}
+        else:
+            self._counts = np.zeros(self.key_space, dtype=np.int64)
+
+    def add(self, key):
+        """Make `key` tabu (and expire the oldest attribute if the memory is full)."""
+        if self.tenure == 0:
+            return
+
+        expired_key = self._ring[self._position]
+
+        if expired_key is not None:
+            if self.key_space is None:
+                count = self._counts[expired_key] - 1
+                if count == 0:
+                    del self._counts[expired_key]
+                else:
+                    self._counts[expired_key] = count
+            else:
+                self._counts[expired_key] -= 1
+
+        if self.key_space is None:
+            self._counts[key] = self._counts.get(key, 0) + 1
+        else:
+            self._counts[key] += 1
+
+        self._ring[self._position] = key
+        self._position = (self._position + 1) % self.tenure
+
+    def __contains__(self, key):
+        if self.key_space is None:
+            return key in self._counts
+        return self._counts[key] > 0
+
+    def contains(self, keys):
+        """Check a batch of attributes.
+
+        Parameters
+        ----------
+        keys : array_like
+            The attributes.
+
+        Returns
+        -------
+        ndarray
+            A boolean array: `True` for tabu attributes.
+        """
+        if self.key_space is None:
+            counts = self._counts
+            return np.array([key in counts for key in np.asarray(keys).tolist()], dtype=bool)
+        return self._counts[np.asarray(keys)] > 0
+
+
+class TabuProblem:
+    """A discrete optimization problem for `TabuSearch` (to minimize).
+
+    A move is identified by an integer in `range(num_moves)`. Subclasses
+    implement `evaluate`, `initial_solution`, `apply` and either `deltas`
+    (vectorized, possibly incremental) or `neighbours` (used by the default
+    `deltas`, which evaluates all the neighbours with one batched call of
+    `evaluate`).
+    """
+
+    num_moves = None
+
+    def initial_solution(self):
+        """Return a (random) initial solution."""
+        raise NotImplementedError
+
+    def evaluate(self, solutions):
+        """Evaluate a solution or a batch of solutions (the last axis indexes solutions)."""
+        raise NotImplementedError
+
+    def reset(self, solution):
+        """Set the current solution (and compute the auxiliary data of incremental evaluations)."""
+        self.solution = solution.copy()
+
+    def neighbours(self):
+        """Return all the neighbours of the current solution (the last axis indexes moves)."""
+        raise NotImplementedError
+
+    def deltas(self, fx):
+        """The value changes of all the moves from the current solution.
+
+        Parameters
+        ----------
+        fx : float
+            The value of the current solution.
+
+        Returns
+        -------
+        ndarray
+            The `num_moves` value changes.
+        """
+        return self.evaluate(self.neighbours()) - fx
+
+    def apply(self, move):
+        """Apply a move to the current solution (and update the auxiliary data)."""
+        raise NotImplementedError
+
+    def move_attributes(self, moves):
+        """The tabu attributes of the moves (by default, the moves themselves)."""
+        return moves
+
+
+class BitFlipProblem(TabuProblem):
+    """Binary problem with the single bit flip neighbourhood.
+
+    The neighbours of a solution are evaluated with one batched call of the
+    objective function (a `(ndim, ndim)` boolean array). The tabu attribute
+    of a move is the flipped bit.
+
+    Parameters
+    ----------
+    objective_function : callable object
+        The function to minimize (it takes a `(ndim,)` or `(ndim, n)`
+        boolean array).
+    ndim : int
+        The number of bits (default: `objective_function.ndim`).
+    """
+
+    def __init__(self, objective_function, ndim=None):
+        self.objective_function = objective_function
+        self.ndim = objective_function.ndim if ndim is None else ndim
+        self.num_moves = self.ndim
+
+    @property
+    def num_eval(self):
+        return getattr(self.objective_function, 'num_eval', 0)
+
+    def initial_solution(self):
+        return np.random.uniform(size=self.ndim) < 0.5
+
+    def evaluate(self, solutions):
+        return self.objective_function(solutions)
+
+    def neighbours(self):
+        flips = np.eye(self.ndim, dtype=bool)
+        return self.solution[:, np.newaxis] ^ flips
+
+    def apply(self, move):
+        self.solution[move] = not self.solution[move]
+
+
+class QUBOProblem(TabuProblem):
+    r"""Quadratic unconstrained binary optimization.
+
+    .. math::
+
+        f(\boldsymbol{x}) = \boldsymbol{x}^\top Q \boldsymbol{x}, \quad \boldsymbol{x} \in \{0, 1\}^n
+
+    The deltas of all single bit flips are computed incrementally from the
+    local fields :math:`\boldsymbol{h} = (Q + Q^\top) \boldsymbol{x}`:
+
+    .. math::
+
+        \Delta_i = (1 - 2 x_i) (Q_{ii} + h_i - 2 Q_{ii} x_i)
+
+    Flipping bit :math:`j` updates the local fields in :math:`O(n)`
+    (:math:`\boldsymbol{h} \leftarrow \boldsymbol{h} \pm (Q + Q^\top)_{:, j}`)
+    instead of the :math:`O(n^3)` of evaluating the :math:`n` neighbours
+    from scratch.
+
+    Parameters
+    ----------
+    Q : array_like
+        The `(n, n)` matrix.
+    """
+
+    def __init__(self, Q):
+        self.Q = np.asarray(Q, dtype=np.float64)
+        self.ndim = self.num_moves = self.Q.shape[0]
+        self._symmetric_Q = self.Q + self.Q.T
+        self._diagonal = np.diag(self.Q).copy()
+        self.num_eval = 0
+
+    def initial_solution(self):
+        return np.random.uniform(size=self.ndim) < 0.5
+
+    def evaluate(self, solutions):
+        x = np.asarray(solutions, dtype=np.float64)
+        self.num_eval += 1 if x.ndim == 1 else x.shape[1]
+        return np.sum(x * (self.Q @ x), axis=0)
+
+    def reset(self, solution):
+        super().reset(solution)
+        self._fields = self._symmetric_Q @ self.solution.astype(np.float64)
+
+    def neighbours(self):
+        return self.solution[:, np.newaxis] ^ np.eye(self.ndim, dtype=bool)
+
+    def deltas(self, fx):
+        x = self.solution
+        return np.where(x, -1., 1.) * (self._diagonal + self._fields - 2. * self._diagonal * x)
+
+    def apply(self, move):
+        sign = -1. if self.solution[move] else 1.
+        self.solution[move] = not self.solution[move]
+        self._fields += sign * self._symmetric_Q[:, move]
+
+
+class TabuSearch(Optimizer):
+    """Tabu search.
+
+    Each iteration evaluates the deltas of all the moves at once, then
+    applies the best admissible move: a move whose attribute is not tabu, or
+    any move reaching a new best value (aspiration). If all the moves are
+    tabu, the best one is applied.
+    """
+
+    optimizer_name = "tabu search"
+
+    def minimize(self,
+                 problem,
+                 num_iterations=1000,
+                 tenure=None,
+                 aspiration=True,
+                 x_init=None,
+                 key_space=None,
+                 stopping_criteria=None,
+                 record_history=False):
+        """Minimize `problem` with a tabu search.
+
+        Parameters
+        ----------
+        problem : TabuProblem
+            The problem (see `BitFlipProblem` and `QUBOProblem`).
+        num_iterations : int
+            The number of moves.
+        tenure : int
+            The number of iterations a move attribute stays tabu (default:
+            `num_moves // 10`, at least 1).
+        aspiration : bool
+            Allow tabu moves reaching a new best value.
+        x_init : ndarray
+            The initial solution (default: `problem.initial_solution()`).
+        key_space : int
+            The number of possible (integer) move attributes, if known (see
+            `TabuMemory`). By default, it is `problem.num_moves` when the
+            attributes are the moves themselves.
+        stopping_criteria : StoppingCriterion
+            Additional stopping criteria (see
+            `ailib.optimize.minimizers.stopping`).
+        record_history : bool
+            Keep the current solution and its value at each iteration in the
+            result history (keys `'x'` and `'fx'`).
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization: the best solution found.
+        """
+
+        if tenure is None:
+            tenure = max(1, problem.num_moves // 10)
+
+        if key_space is None and type(problem).move_attributes is TabuProblem.move_attributes:
+            key_space = problem.num_moves
+
+        memory = TabuMemory(tenure, key_space=key_space)
+        state = OptimizationState(problem, stopping_criteria, record_history)
+
+        x = problem.initial_solution() if x_init is None else np.array(x_init, copy=True)
+        problem.reset(x)
+        fx = problem.evaluate(problem.solution)
+
+        best_x, best_fx = problem.solution.copy(), fx
+
+        moves = np.arange(problem.num_moves)
+        attributes = problem.move_attributes(moves)
+
+        for iteration_index in range(num_iterations):
+            deltas = problem.deltas(fx)
+
+            admissible = ~memory.contains(attributes)
+            if aspiration:
+                admissible |= fx + deltas < best_fx
+
+            if np.any(admissible):
+                candidate_deltas = np.where(admissible, deltas, np.inf)
+            else:
+                candidate_deltas = deltas
+
+            move = int(np.argmin(candidate_deltas))
+
+            problem.apply(move)
+            memory.add(attributes[move].item() if isinstance(attributes, np.ndarray) else attributes[move])
+            fx = fx + deltas[move]
+
+            if fx < best_fx:
+                best_x, best_fx = problem.solution.copy(), fx
+
+            state.update(problem.solution, fx)
+
+            if state.stop():
+                break
+
+        # The value of the best solution is computed again (deltas accumulate rounding errors)
+        return state.result(x=best_x, fx=problem.evaluate(best_x))
@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Algorithm portfolio.
+
+Several minimizers are run concurrently (each one in its own worker process)
+on the same problem with a shared evaluation budget. The budget is given to
+the minimizers round by round: after each round, the minimizers are ranked
+according to the best value they have found, the next round budget is
+shared among them with a softmax (Boltzmann) bandit rule on their mean rank
+reward, and the worst ones are stopped.
+"""
+
+__all__ = ['Portfolio']
+
+import math
+import multiprocessing
+import multiprocessing.connection
+import os
+import time
+import traceback
+import numpy as np
+
+from .minimizers.optimizer import Optimizer
+from .minimizers.result import OptimizeResult
+
+
+class _StopRun(Exception):
+    """Raised in a worker process to abort the minimizer."""
+    pass
+
+
+class _BudgetedObjectiveFunction:
+    """Wrap an objective function so that it pauses when its budget is spent.
+
+    When the evaluations granted by the parent process have been used, the
+    wrapper reports the best point found so far and waits for a new grant
+    (or for a stop order, in which case `_StopRun` is raised within the
+    minimizer). The evaluations of the gradient and of the Hessian are
+    counted as evaluations (one per point of a batch).
+
+    Minimizers that only evaluate the gradient (e.g. the fixed step gradient
+    descent) would never report any progress: the last point where the
+    gradient has been evaluated is evaluated (and counted) before each
+    report, unless the minimizer has evaluated it itself.
+    """
+
+    def __init__(self, objective_function, connection):
+        self._objective_function = objective_function
+        self._connection = connection
+        self._budget = 0
+        self.num_spent_evaluations = 0
+        self._initial_counters = self._counters()
+        self.best_x = None
+        self.best_fx = np.inf
+        self._last_gradient_x = None     # The last gradient point not evaluated yet
+
+    def __getattr__(self, name):
+        # ndim, bounds, evaluation counters, ...
+        return getattr(self._objective_function, name)
+
+    def _counters(self):
+        return np.array([getattr(self._objective_function, 'num_eval', 0),
+                         getattr(self._objective_function, 'num_gradient_eval', 0),
+                         getattr(self._objective_function, 'num_hessian_eval', 0)])
+
+    def report(self, status, x=None, fx=None):
+        """The message sent to the parent process: the status, the best point (default: the best evaluated one), the budget spent and the evaluation counters."""
+        if x is None:
+            x, fx = self.best_x, self.best_fx
+        nfev, ngev, nhev = self._counters() - self._initial_counters
+        return (status, x, fx, self.num_spent_evaluations, int(nfev), int(ngev), int(nhev))
+
+    def _update_best(self, x, y):
+        y_array = np.atleast_1d(y)
+        best_index = y_array.argmin()
+        if y_array[best_index] < self.best_fx:
+            self.best_fx = float(y_array[best_index])
+            self.best_x = np.array(x if x.ndim < 2 else x[:, best_index], dtype=np.float64)
+
+    def evaluate_last_gradient_point(self):
+        """Evaluate the last point where only the gradient has been evaluated (to report its value)."""
+        if self._last_gradient_x is not None:
+            x, self._last_gradient_x = self._last_gradient_x, None
+            self._spend(1 if x.ndim < 2 else x.shape[1])
+            self._update_best(x, self._objective_function(x))
+
+    def _wait_for_budget(self):
+        while self._budget <= 0:
+            self.evaluate_last_gradient_point()
+            self._connection.send(self.report('progress'))
+            command = self._connection.recv()
+            if command[0] == 'stop':
+                raise _StopRun()
+            self._budget += command[1]
+
+    def _spend(self, num_evaluations):
+        self._budget -= num_evaluations
+        self.num_spent_evaluations += num_evaluations
+
+    def __call__(self, x):
+        self._wait_for_budget()
+
+        x = np.asarray(x)
+        y = self._objective_function(x)
+
+        self._spend(1 if x.ndim < 2 else x.shape[1])
+        self._update_best(x, y)
+
+        if self._last_gradient_x is not None and np.array_equal(x, self._last_gradient_x):
+            self._last_gradient_x = None
+
+        return y
+
+    def gradient(self, x):
+        self._wait_for_budget()
+        x = np.asarray(x)
+        self._spend(1 if x.ndim < 2 else x.shape[1])
+        self._last_gradient_x = np.array(x, dtype=np.float64)
+        return self._objective_function.gradient(x)
+
+    def hessian(self, x):
+        self._wait_for_budget()
+        x = np.asarray(x)
+        self._spend(1 if x.ndim < 2 else x.shape[1])
+        return self._objective_function.hessian(x)
+
+
+def _worker(connection, minimizer, minimize_kwargs, objective_function, seed):
+    """The main function of worker processes: run a minimizer with a budgeted objective function."""
+    np.random.seed(seed)
+    budgeted_objective_function = _BudgetedObjectiveFunction(objective_function, connection)
+
+    try:
+        result = minimizer.minimize(budgeted_objective_function, **minimize_kwargs)
+        x = np.asarray(result['x'], dtype=np.float64) if isinstance(result, dict) else np.asarray(result, dtype=np.float64)
+        fx = result.get('fx') if isinstance(result, dict) else None
+        if fx is None or (budgeted_objective_function.best_fx < fx):
+            x, fx = budgeted_objective_function.best_x, budgeted_objective_function.best_fx
+        connection.send(budgeted_objective_function.report('done', x, fx))
+    except _StopRun:
+        budgeted_objective_function.evaluate_last_gradient_point()
+        connection.send(budgeted_objective_function.report('stopped'))
+    except Exception:
+        connection.send(('error', traceback.format_exc()))
+    finally:
+        connection.close()
+
+
+class _Arm:
+    """The parent-side state of a minimizer of the portfolio."""
+
+    def __init__(self, name, connection, process):
+        self.name = name
+        self.connection = connection
+        self.process = process
+        self.status = 'running'       # 'running', 'done', 'stopped', 'killed' or 'error'
+        self.best_x = None
+        self.best_fx = np.inf
+        self.num_evaluations = 0        # The budget spent
+        self.nfev = 0
+        self.ngev = 0
+        self.nhev = 0
+        self.rewards = []
+
+    @property
+    def alive(self):
+        return self.status == 'running'
+
+    def receive(self):
+        message = self.connection.recv()
+
+        if message[0] == 'error':
+            # The worker has closed its end of the pipe
+            self.status = 'error'
+            raise RuntimeError("The minimizer {} failed:\n{}".format(self.name, message[1]))
+
+        status, best_x, best_fx, self.num_evaluations, self.nfev, self.ngev, self.nhev = message
+        if status != 'progress':
+            self.status = status
+
+        if best_x is not None and best_fx <= self.best_fx:
+            self.best_x, self.best_fx = best_x, best_fx
+
+
+class Portfolio(Optimizer):
+    r"""Algorithm portfolio with a shared evaluation budget.
+
+    Each minimizer of the portfolio runs in its own worker process on a
+    wrapped objective function which pauses the minimizer when the budget it
+    has been granted is spent. The parent process grants the budget round by
+    round:
+
+    1. each running minimizer :math:`i` is granted
+       :math:`B_r \, p_i` evaluations, where :math:`B_r` is the round budget
+       and :math:`p_i \propto e^{\bar{r}_i / T}` (softmax of the mean reward
+       :math:`\bar{r}_i`) ;
+    2. minimizers run concurrently (at most `max_workers` at a time) until
+       they have spent their grant ;
+    3. running minimizers are ranked according to the best value they have
+       found and get the reward :math:`1 - \text{rank} / (n - 1)` (1 for
+       the best one, 0 for the worst one) ;
+    4. the `kill_fraction` worst minimizers (according to their mean reward,
+       rounded up: at least one per round unless all the mean rewards are
+       equal) are stopped, their remaining budget goes to the others.
+
+    Minimizers that terminate by themselves (e.g. on convergence) give their
+    remaining budget back too. The result is the best point found across the
+    portfolio. Minimizers are compared on the points they have evaluated;
+    for a minimizer that only evaluates the gradient (such as the fixed step
+    gradient descent), its last gradient point is evaluated at the end of
+    each of its grants.
+
+    Parameters
+    ----------
+    minimizers : list of tuple
+        The minimizers of the portfolio: a list of `(minimizer, kwargs)`
+        tuples where `minimizer` is an optimizer object and `kwargs` is the
+        dictionary of arguments given to its `minimize` method (besides the
+        objective function). The iteration limits given in `kwargs` should
+        be large enough for the portfolio budget to be the actual limit.
+
+    Example
+    -------
+    ::
+
+        portfolio = Portfolio([(SAES(), {'init_pop_mean': None, 'init_pop_std': None, 'num_gen': 10**6}),
+                               (Random(), {'num_samples': 10**9, 'chunk_size': 100}),
+                               (GradientDescent(), {'num_iterations': 10**6})])
+        res = portfolio.minimize(objective_function, max_evaluations=100000)
+    """
+
+    optimizer_name = "portfolio"
+
+    def __init__(self, minimizers):
+        super().__init__()
+        self.minimizers = minimizers
+
+    def minimize(self,
+                 objective_function,
+                 max_evaluations=10000,
+                 num_rounds=10,
+                 temperature=0.25,
+                 kill_fraction=0.25,
+                 max_workers=None):
+        """Minimize `objective_function` with the portfolio.
+
+        Parameters
+        ----------
+        objective_function : callable object
+            The function to minimize (it should be picklable when the
+            `'spawn'` start method of `multiprocessing` is used).
+        max_evaluations : int
+            The evaluation budget shared by the minimizers (evaluations of
+            the gradient and of the Hessian are counted as evaluations).
+            Minimizers evaluating points by batches may slightly exceed it.
+        num_rounds : int
+            The number of rounds the budget is split into.
+        temperature : float
+            The temperature :math:`T` of the softmax budget allocation (the
+            lower, the greedier).
+        kill_fraction : float
+            The fraction of the running minimizers stopped after each round
+            (rounded up; at least one minimizer is kept).
+        max_workers : int
+            The maximum number of minimizers running at the same time
+            (default: the number of CPUs). Each minimizer has its own worker
+            process for the whole run (a paused minimizer keeps its state in
+            its call stack, so it can't be moved to another process), but
+            only `max_workers` of them hold a grant at a time: the others
+            wait on their pipe without using any CPU.
+
+        Returns
+        -------
+        OptimizeResult
+            The result of the optimization; `nfev`, `ngev` and `nhev` are the
+            evaluations of the function, of its gradient and of its Hessian
+            made by all the minimizers. The `arms` item contains the status,
+            the best value, the evaluation counters and the budget spent of
+            each minimizer. A minimizer that fails raises a `RuntimeError`
+            with the traceback of its worker process.
+        """
+
+        start_time = time.perf_counter()
+
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+
+        round_budget = max(1, max_evaluations // num_rounds)
+
+        # Start the worker processes ###################
+
+        arms = []
+        for minimizer, minimize_kwargs in self.minimizers:
+            parent_connection, child_connection = multiprocessing.Pipe()
+            seed = np.random.randint(2**31)
+            process = multiprocessing.Process(target=_worker,
+                                              args=(child_connection, minimizer, minimize_kwargs, objective_function, seed),
+                                              daemon=True)
+            process.start()
+            child_connection.close()
+            arms.append(_Arm(minimizer.optimizer_name, parent_connection, process))
+
+        num_rounds_done = 0
+
+        try:
+            # Each worker reports once before evaluating anything
+            for arm in arms:
+                arm.receive()
+
+            while any(arm.alive for arm in arms) and sum(arm.num_evaluations for arm in arms) < max_evaluations:
+
+                alive_arms = [arm for arm in arms if arm.alive]
+
+                # Share the round budget #######################
+
+                remaining_budget = max_evaluations - sum(arm.num_evaluations for arm in arms)
+                current_round_budget = min(round_budget, remaining_budget)
+
+                mean_rewards = np.array([np.mean(arm.rewards) if arm.rewards else 1. for arm in alive_arms])
+                shares = np.exp((mean_rewards - mean_rewards.max()) / temperature)
+                shares /= shares.sum()
+                grants = np.maximum(1, np.round(shares * current_round_budget)).astype(int)
+
+                # Run the round ################################
+
+                pending = list(zip(alive_arms, grants))
+                running = []
+                while pending or running:
+                    while pending and len(running) < max_workers:
+                        arm, grant = pending.pop(0)
+                        arm.connection.send(('run', int(grant)))
+                        running.append(arm)
+
+                    ready_connections = multiprocessing.connection.wait([arm.connection for arm in running])
+                    for arm in [arm for arm in running if arm.connection in ready_connections]:
+                        arm.receive()
+                        running.remove(arm)
+
+                num_rounds_done += 1
+
+                # Rewards and kills ############################
+
+                alive_arms = [arm for arm in alive_arms if arm.alive]
+
+                if len(alive_arms) > 1:
+                    ranks = np.argsort(np.argsort([arm.best_fx for arm in alive_arms], kind='stable'), kind='stable')
+                    for arm, rank in zip(alive_arms, ranks):
+                        arm.rewards.append(1. - rank / (len(alive_arms) - 1))
+
+                    # At least one minimizer is killed per round (if kill_fraction > 0), unless they are all tied
+                    mean_rewards = [np.mean(arm.rewards) for arm in alive_arms]
+                    num_kills = min(int(math.ceil(kill_fraction * len(alive_arms))), len(alive_arms) - 1)
+                    if num_kills > 0 and max(mean_rewards) > min(mean_rewards):
+                        for index in np.argsort(mean_rewards, kind='stable')[:num_kills]:
+                            self._stop(alive_arms[index], 'killed')
+        finally:
+            for arm in arms:
+                if arm.alive:
+                    self._stop(arm, 'stopped')
+                arm.process.join()
+
+        # Make the result ##############################
+
+        best_arm = min(arms, key=lambda arm: arm.best_fx)
+
+        if all(not arm.alive for arm in arms) and all(arm.status == 'done' for arm in arms):
+            termination_reason = "all_done"
+        else:
+            termination_reason = "max_evaluations"
+
+        return OptimizeResult(x=best_arm.best_x,
+                              fx=best_arm.best_fx,
+                              nfev=sum(arm.nfev for arm in arms),
+                              ngev=sum(arm.ngev for arm in arms),
+                              nhev=sum(arm.nhev for arm in arms),
+                              nit=num_rounds_done,
+                              wall_time=time.perf_counter() - start_time,
+                              termination_reason=termination_reason,
+                              history=None,
+                              best_minimizer=best_arm.name,
+                              arms=[{'name': arm.name,
+                                     'status': arm.status,
+                                     'fx': arm.best_fx,
+                                     'nfev': arm.nfev,
+                                     'ngev': arm.ngev,
+                                     'nhev': arm.nhev,
+                                     'budget_spent': arm.num_evaluations} for arm in arms])
+
+    @staticmethod
+    def _stop(arm, status):
+        try:
+            arm.connection.send(('stop',))
+            arm.receive()
+        except (BrokenPipeError, ConnectionResetError, EOFError):
+            # The worker has already exited
+            pass
+        arm.status = status
@@ -46,9 +46,9 @@ __all__ = ['array_list_to_array',
            'plot_err_wt_num_feval']
 
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.colors as colors
-from mpl_toolkits.mplot3d import axes3d
+
+from ..utils.grid import evaluate_grid
+
 
 def array_list_to_array(y_array_list):
     """Convert a sequence of 1D arrays (with possibly different sizes) to a 2D array.
@@ -127,6 +127,8 @@ def plot_1d(y,
     **kwargs
         Any arbitrary keyword arguments accepted by `matplotlib.pyplot.plot()`.
     """
+    import matplotlib.pyplot as plt
+
     if y.ndim == 2:
         # Aggregate data
         if plot_option == 'mean':
@@ -236,6 +238,9 @@ def plot_contour_2d_solution_space(func,
 
     TODO
     """
+    import matplotlib.pyplot as plt
+    import matplotlib.colors as colors
+
     if (fig is None) or (ax is None):                # TODO
         fig, ax = plt.subplots(figsize=figsize)
 
@@ -243,12 +248,7 @@ def plot_contour_2d_solution_space(func,
         xmin = np.amin(np.hstack([xmin.reshape([-1, 1]), xvisited]), axis=1)
         xmax = np.amax(np.hstack([xmax.reshape([-1, 1]), xvisited]), axis=1)
 
-    x1_space = np.linspace(xmin[0], xmax[0], x1_grid_size)
-    x2_space = np.linspace(xmin[1], xmax[1], x2_grid_size)
-
-    x1_mesh, x2_mesh = np.meshgrid(x1_space, x2_space)
-
-    zz = func(np.array([x1_mesh.ravel(), x2_mesh.ravel()])).reshape(x1_mesh.shape)
+    x1_mesh, x2_mesh, zz = evaluate_grid(func, xmin, xmax, (x1_grid_size, x2_grid_size))
 
     ############################
 
@@ -334,6 +334,10 @@ def plot_2d_solution_space(func,
 
     TODO
     """
+    import matplotlib.pyplot as plt
+    import matplotlib.colors as colors
+    from mpl_toolkits.mplot3d import axes3d
+
     if fig is None or ax is None:                # TODO
         fig = plt.figure(figsize=figsize)
         ax = axes3d.Axes3D(fig)
@@ -341,12 +345,7 @@ def plot_2d_solution_space(func,
     if angle_view is not None:
         ax.view_init(angle_view[0], angle_view[1])
 
-    x1_space = np.linspace(xmin[0], xmax[0], x1_grid_size)
-    x2_space = np.linspace(xmin[1], xmax[1], x2_grid_size)
-
-    x1_mesh, x2_mesh = np.meshgrid(x1_space, x2_space)
-
-    zz = func(np.array([x1_mesh.ravel(), x2_mesh.ravel()])).reshape(x1_mesh.shape)   # TODO
+    x1_mesh, x2_mesh, zz = evaluate_grid(func, xmin, xmax, (x1_grid_size, x2_grid_size))
 
     ############################
 
@@ -23,6 +23,8 @@
 import numpy as np
 import numbers
 
+from ...utils.grid import evaluate_grid
+
 __all__ = ['SignalFunction']  # TODO
 
 class SignalFunction(object):
@@ -271,21 +273,11 @@ class SignalFunction(object):
             x2max = self.domain_max[1]
             assert x2min < x2max
 
-            x1step = (x1max - x1min) / 200.
-            x2step = (x2max - x2min) / 200.
-
-            range_x1 = np.arange(x1min, x1max, x1step)
-            range_x2 = np.arange(x2min, x2max, x2step)
-
-            mesh_x1, mesh_x2 = np.meshgrid(range_x1, range_x2)
-
-            # TODO: take advantage of meshgrid, for now, it's not optimized at
-            #       all and it's not very well written
-            z = np.zeros(mesh_x1.shape)         
-            for x1i in range(z.shape[0]):
-                for x2i in range(z.shape[1]):
-                    point = np.array([mesh_x1[x1i, x2i], mesh_x2[x1i, x2i]])
-                    z[x1i, x2i] = self(point)
+            mesh_x1, mesh_x2, z = evaluate_grid(self,
+                                                self.domain_min,
+                                                self.domain_max,
+                                                num_points=200,
+                                                layout="rows")
 
             # PLOT DATA #################
 
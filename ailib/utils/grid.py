@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Grid evaluation.
+
+This module evaluates a function of two variables on a regular grid (a
+mesh), as needed to draw surface, contour or heat map plots. The whole mesh
+is evaluated with one batched call of the function (or a few calls if
+`chunk_size` is given) instead of one call per point.
+
+Evaluated grids can be cached (``cache=True``), keyed by the function, the
+bounds and the resolution of the grid, so that plotting the same function
+several times (e.g. the frames of an animation) only evaluates it once.
+Caching is opt-in: the key doesn't see changes of the function object
+itself (e.g. a new translation vector or noise setting of an objective
+function), and cache hits don't update the evaluation counters of the
+function. Cached arrays are read-only.
+
+Two batch layouts are supported:
+
+- ``"columns"``: the function takes an array of shape ``(2, n)`` (one point
+  per column) as the functions of ``ailib.optimize.functions``;
+- ``"rows"``: the function takes an array of shape ``(n, 2)`` (one point
+  per row) as ``ailib.signal.signal.SignalFunction``.
+
+Examples
+--------
+>>> import numpy as np
+>>> x1_mesh, x2_mesh, z = evaluate_grid(lambda x: np.sum(x**2, axis=0),
+...                                     xmin=[-1., -1.], xmax=[1., 1.],
+...                                     num_points=3)
+>>> z
+array([[2., 1., 2.],
+       [1., 0., 1.],
+       [2., 1., 2.]])
+"""
+
+__all__ = ['GridCache',
+           'evaluate_grid',
+           'clear_grid_cache']
+
+import collections
+import numpy as np
+
+
+class GridCache:
+    """A least recently used cache of evaluated grids.
+
+    Parameters
+    ----------
+    max_size : int
+        The maximum number of grids kept in the cache.
+    """
+
+    def __init__(self, max_size=16):
+        self.max_size = max_size
+        self._grids = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._grids)
+
+    def get(self, key):
+        """Return the grid cached for `key` (or `None`)."""
+        grid = self._grids.get(key)
+        if grid is not None:
+            self._grids.move_to_end(key)
+        return grid
+
+    def put(self, key, grid):
+        """Cache `grid` for `key` (the least recently used grid is removed if the cache is full)."""
+        self._grids[key] = grid
+        self._grids.move_to_end(key)
+        while len(self._grids) > self.max_size:
+            self._grids.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached grids."""
+        self._grids.clear()
+
+
+_default_cache = GridCache()
+
+
+def clear_grid_cache():
+    """Remove all the grids cached by `evaluate_grid`."""
+    _default_cache.clear()
+
+
+def evaluate_grid(func,
+                  xmin,
+                  xmax,
+                  num_points=200,
+                  layout="columns",
+                  chunk_size=None,
+                  cache=False):
+    """Evaluate a function of two variables on a regular grid.
+
+    Parameters
+    ----------
+    func : callable object
+        The function to evaluate (it must accept a batch of points, see
+        `layout`).
+    xmin : array_like
+        The lower bounds of the grid (2 values).
+    xmax : array_like
+        The upper bounds of the grid (2 values).
+    num_points : int or tuple of int
+        The number of points of the grid along each axis.
+    layout : str
+        How `func` takes a batch of points: ``"columns"`` for an array of
+        shape ``(2, n)`` or ``"rows"`` for an array of shape ``(n, 2)``.
+    chunk_size : int
+        The maximum number of points given to `func` at once (default: the
+        whole grid in one call). This bounds the memory used by the
+        function.
+    cache : bool or GridCache
+        The cache to use (`True` for the default cache, `False` to always
+        evaluate the grid). Only use a cache when `func` doesn't change
+        between the calls (e.g. to draw the frames of an animation).
+
+    Returns
+    -------
+    tuple
+        The meshes `x1_mesh` and `x2_mesh` (as returned by `numpy.meshgrid`)
+        and the values `z` of `func` on the grid, three arrays of shape
+        ``(num_points[1], num_points[0])``.
+    """
+    xmin = np.asarray(xmin, dtype=np.float64).ravel()
+    xmax = np.asarray(xmax, dtype=np.float64).ravel()
+
+    if xmin.shape != (2,) or xmax.shape != (2,):
+        raise ValueError("Grids are only defined for functions of two variables.")
+
+    if np.isscalar(num_points):
+        num_points = (num_points, num_points)
+    num_points = tuple(int(n) for n in num_points)
+
+    if layout not in ("columns", "rows"):
+        raise ValueError("Unknown layout: {}.".format(layout))
+
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be positive.")
+
+    if cache is True:
+        cache = _default_cache
+    elif cache is False:
+        cache = None
+
+    key = (func, tuple(xmin), tuple(xmax), num_points, layout)
+
+    try:
+        hash(key)
+    except TypeError:
+        cache = None                # Unhashable functions are not cached
+
+    if cache is not None:
+        grid = cache.get(key)
+        if grid is not None:
+            return grid
+
+    x1_space = np.linspace(xmin[0], xmax[0], num_points[0])
+    x2_space = np.linspace(xmin[1], xmax[1], num_points[1])
+
+    x1_mesh, x2_mesh = np.meshgrid(x1_space, x2_space)
+
+    points = np.array([x1_mesh.ravel(), x2_mesh.ravel()])     # Shape (2, n)
+    if layout == "rows":
+        points = points.T
+
+    if chunk_size is None:
+        z = np.asarray(func(points), dtype=np.float64)
+    else:
+        z = np.empty(x1_mesh.size)
+        for start in range(0, x1_mesh.size, chunk_size):
+            if layout == "rows":
+                z[start:start+chunk_size] = func(points[start:start+chunk_size])
+            else:
+                z[start:start+chunk_size] = func(points[:, start:start+chunk_size])
+
+    z = z.reshape(x1_mesh.shape)
+
+    grid = (x1_mesh, x2_mesh, z)
+
+    if cache is not None:
+        for array in grid:
+            array.flags.writeable = False
+        cache.put(key, grid)
+
+    return grid
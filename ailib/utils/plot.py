@@ -12,6 +12,8 @@ import matplotlib.pyplot as plt
 import matplotlib.colors as colors
 from mpl_toolkits.mplot3d import axes3d
 
+from .grid import evaluate_grid
+
 ###############################################################################
 
 def plot_2d_contour_solution_space(func,
@@ -27,12 +29,7 @@ def plot_2d_contour_solution_space(func,
     """
     fig, ax = plt.subplots(figsize=(12, 8))
 
-    x1_space = np.linspace(xmin[0], xmax[0], 200)
-    x2_space = np.linspace(xmin[1], xmax[1], 200)
-    
-    x1_mesh, x2_mesh = np.meshgrid(x1_space, x2_space)
-
-    zz = func(np.array([x1_mesh.ravel(), x2_mesh.ravel()])).reshape(x1_mesh.shape)
+    x1_mesh, x2_mesh, zz = evaluate_grid(func, xmin, xmax, 200)
     
     ############################
     
@@ -112,12 +109,7 @@ def plot_2d_solution_space(func,
     if angle_view is not None:
         ax.view_init(angle_view[0], angle_view[1])
 
-    x1_space = np.linspace(xmin[0], xmax[0], 100)
-    x2_space = np.linspace(xmin[1], xmax[1], 100)
-    
-    x1_mesh, x2_mesh = np.meshgrid(x1_space, x2_space)
-
-    zz = func(np.array([x1_mesh.ravel(), x2_mesh.ravel()])).reshape(x1_mesh.shape)   # TODO
+    x1_mesh, x2_mesh, zz = evaluate_grid(func, xmin, xmax, 100)
 
     ############################
     
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Ant colony optimization on TSP instances of increasing size.
+
+For each grid instance (whose optimal tour length is known), print the
+relative gap of the best tour found to the optimum and the wall-clock time
+per iteration. The number of ants is fixed so that the time per iteration
+reflects the size of the instance only (about :math:`O(n^2)` per iteration:
+`n` lockstep construction steps over the candidate lists plus the dense
+pheromone updates).
+"""
+
+import time
+import numpy as np
+
+from ailib.optimize.functions import grid_tsp
+from ailib.optimize.minimizers import AntColonyOptimization
+
+# MAIN ########################################################################
+
+def main():
+    np.random.seed(0)
+
+    num_iterations = 50
+    num_ants = 25
+
+    print("{:>8} {:>10} {:>10} {:>8} {:>14}".format("cities", "best", "optimum", "gap", "ms/iteration"))
+
+    for side in (5, 8, 10, 14, 20, 28):
+        objective_function = grid_tsp(side)
+
+        start_time = time.perf_counter()
+        res = AntColonyOptimization().minimize(objective_function,
+                                               num_iterations=num_iterations,
+                                               num_ants=num_ants,
+                                               elitist_weight=float(num_ants))
+        wall_time = time.perf_counter() - start_time
+
+        gap = res.fx / objective_function.optimal_length - 1.
+
+        print("{:>8} {:>10.2f} {:>10.2f} {:>7.1%} {:>14.2f}".format(objective_function.ndim,
+                                                                   res.fx,
+                                                                   objective_function.optimal_length,
+                                                                   gap,
+                                                                   1000. * wall_time / res.nit))
+
+if __name__ == '__main__':
+    main()
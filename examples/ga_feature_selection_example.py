@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Feature selection over the digits dataset with a bit-packed genetic
+algorithm.
+
+Each genome selects a subset of the 64 pixels; its value is the validation
+error of a nearest centroid classifier using only these pixels plus a small
+penalty on the number of selected pixels.
+"""
+
+import time
+import numpy as np
+
+from ailib.optimize.functions import digits_feature_selection
+from ailib.optimize.minimizers import GeneticAlgorithm
+
+# MAIN ########################################################################
+
+def main():
+    np.random.seed(0)
+
+    objective_function = digits_feature_selection(penalty=0.01)
+
+    print("All features:", objective_function(np.ones(objective_function.ndim, dtype=bool)))
+
+    start_time = time.perf_counter()
+    res = GeneticAlgorithm().minimize(objective_function, num_gen=200, pop_size=100, crossover='uniform')
+    wall_time = time.perf_counter() - start_time
+
+    print("Best value:", res.fx)
+    print("Selected pixels ({}):".format(np.count_nonzero(res.x)))
+    print(res.x.reshape([8, 8]).astype(int))
+    print("{} evaluations in {:.2f}s".format(res.nfev, wall_time))
+
+if __name__ == '__main__':
+    main()
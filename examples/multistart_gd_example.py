@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Multi-start gradient descent on the Himmelblau's function.
+
+The Himmelblau's function has four global minima. Many starts are run in
+lockstep; the starts that collapse into the basin of another one are merged
+(stopped early). Print the distinct minima found, the reason why each start
+stopped and the number of gradient evaluations compared with independent
+descents from the same starting points.
+"""
+
+import collections
+import numpy as np
+
+from ailib.optimize.functions import Himmelblau
+from ailib.optimize.minimizers import GradientDescent
+
+# MAIN ########################################################################
+
+def main():
+    np.random.seed(0)
+
+    num_starts = 200
+    objective_function = Himmelblau(2)
+    x_init = np.random.uniform(-5., 5., [2, num_starts])
+
+    res = GradientDescent().minimize_multistart(objective_function,
+                                                num_starts=num_starts,
+                                                x_init=x_init,
+                                                line_search='armijo',
+                                                gtol=1e-6,
+                                                merge_tol=1e-2)
+
+    print("Reasons why the starts stopped:")
+    for status, count in sorted(collections.Counter(res.starts_status).items()):
+        print("    {:<20} {:>4}".format(status, count))
+
+    print("Distinct minima found:")
+    for start_index in np.flatnonzero(res.starts_status != 'merged'):
+        x = res.starts_x[:, start_index]
+        print("    x = ({:>7.3f}, {:>7.3f})    f(x) = {:.2e}".format(x[0], x[1], res.starts_fx[start_index]))
+
+    # The same starting points, one independent descent each
+    objective_function = Himmelblau(2)
+    for start_index in range(num_starts):
+        GradientDescent().minimize(objective_function,
+                                   x_init=x_init[:, start_index],
+                                   line_search='armijo',
+                                   gtol=1e-6)
+
+    print("Gradient evaluations: {} with merging, {} with independent descents".format(res.ngev,
+                                                                                         objective_function.num_gradient_eval))
+
+if __name__ == '__main__':
+    main()
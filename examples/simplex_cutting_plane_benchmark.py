@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Benchmark of the revised simplex method on the linear programs of Kelley's
+cutting-plane method, against `scipy.optimize.linprog` (HiGHS).
+
+At each iteration, the cut (tangent plane) of the objective function at the
+current point is added to the linear program
+
+    min t  subject to  f(x_i) + grad f(x_i)^T (x - x_i) <= t  for all cuts i,
+                       bounds[0] <= x <= bounds[1]
+
+whose solution is the next point. The in-house solver keeps its basis
+between iterations (warm start with the dual simplex method) while
+`scipy.optimize.linprog` solves each linear program from scratch. The table
+gives the mean time per linear program (and the mean number of pivots of
+the in-house solver) for growing cut sets.
+"""
+
+import time
+import numpy as np
+import scipy.optimize
+
+from ailib.optimize.functions import Sphere
+from ailib.optimize.minimizers import LinearProgram
+
+# MAIN ########################################################################
+
+def main():
+    np.random.seed(0)
+
+    objective_function = Sphere(ndim=10)
+    ndim = objective_function.ndim
+
+    c = np.zeros(ndim + 1)
+    c[-1] = 1.
+    bounds = [(low, high) for (low, high) in objective_function.bounds.T] + [(None, None)]
+
+    lp = LinearProgram(c, bounds=bounds)
+    cuts_A, cuts_b = [], []
+
+    x = np.random.uniform(objective_function.bounds[0], objective_function.bounds[1])
+
+    report_sizes = (25, 50, 100, 200, 400, 800)
+    simplex_time = scipy_time = 0.
+    num_pivots = 0
+    previous_size = 0
+
+    print("{:>6} {:>16} {:>16} {:>8} {:>14}".format("cuts", "simplex (ms/LP)", "linprog (ms/LP)", "pivots", "f(x)"))
+
+    for num_cuts in range(1, report_sizes[-1] + 1):
+        gradient = objective_function.gradient(x)
+        cuts_A.append(np.append(gradient, -1.))
+        cuts_b.append(gradient @ x - objective_function(x))
+
+        start_time = time.perf_counter()
+        lp.add_constraints(cuts_A[-1][np.newaxis, :], cuts_b[-1:])
+        res = lp.solve()
+        simplex_time += time.perf_counter() - start_time
+        num_pivots += res.nit
+
+        start_time = time.perf_counter()
+        ref = scipy.optimize.linprog(c, A_ub=np.array(cuts_A), b_ub=np.array(cuts_b), bounds=bounds, method='highs')
+        scipy_time += time.perf_counter() - start_time
+
+        if not np.isclose(res.fx, ref.fun, rtol=1e-6, atol=1e-9):
+            raise RuntimeError("The solvers disagree: {} != {}".format(res.fx, ref.fun))
+
+        x = res.x[:-1]
+
+        if num_cuts in report_sizes:
+            num_lp = num_cuts - previous_size
+            print("{:>6} {:>16.3f} {:>16.3f} {:>8.1f} {:>14.3e}".format(num_cuts,
+                                                                        1000. * simplex_time / num_lp,
+                                                                        1000. * scipy_time / num_lp,
+                                                                        num_pivots / num_lp,
+                                                                        objective_function(x)))
+            simplex_time = scipy_time = 0.
+            num_pivots = 0
+            previous_size = num_cuts
+
+if __name__ == '__main__':
+    main()
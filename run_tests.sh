@@ -1,14 +1,34 @@
 #!/bin/sh
 
+# IMPORT TIME #################################################################
+
+# Importing ailib.optimize (e.g. in worker processes) must not load the
+# plotting or data analysis libraries and must stay fast.
+python3 -c '
+import sys, time
+start_time = time.perf_counter()
+import ailib.optimize
+import_time = time.perf_counter() - start_time
+heavy_modules = [name for name in ("matplotlib", "pandas", "scipy") if name in sys.modules]
+print("import ailib.optimize: {:.3f}s".format(import_time))
+if heavy_modules:
+    sys.exit("ailib.optimize imports {}".format(", ".join(heavy_modules)))
+if import_time > 0.5:
+    sys.exit("ailib.optimize takes more than 0.5s to import")
+'
+if [ $? -ne 0 ]; then
+    exit 1
+fi
+
 # DOCTESTS ####################################################################
 
 echo
 echo
-python3 -m doctest ./ailib/optimize/functions/unconstrained.py
+python3 -m pytest --doctest-modules ailib
 if [ $? -ne 0 ]; then
     exit 1
 fi
 
 # UNITTESTS ###################################################################
 
-pytest
+python3 -m pytest tests
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Tests of the Bayesian optimization minimizer.
+"""
+
+import os
+import numpy as np
+import pytest
+
+from ailib.optimize.functions.unconstrained import Himmelblau
+from ailib.optimize.minimizers.bayesian import BayesianOptimization
+from ailib.optimize.minimizers.stopping import MaxEvaluations
+
+pytest.importorskip("scipy")
+
+
+def random_search(objective_function, num_evaluations):
+    x = np.random.uniform(objective_function.bounds[0], objective_function.bounds[1], [num_evaluations, objective_function.ndim]).T
+    return np.min(objective_function(x))
+
+
+def test_batch_proposals_are_distinct():
+    np.random.seed(0)
+
+    objective_function = Himmelblau(2)
+
+    optimizer = BayesianOptimization()
+    optimizer.initialize(objective_function.bounds, batch_size=4)
+
+    for round_index in range(4):
+        x = optimizer.ask()
+        if round_index > 0:
+            assert x.shape == (2, 4)
+            distances = np.linalg.norm(x[:, :, np.newaxis] - x[:, np.newaxis, :], axis=0)
+            assert np.all(distances[np.triu_indices(4, k=1)] > 1e-3), x
+        optimizer.tell(x, objective_function(x))
+
+
+def test_batches_beat_random_search():
+    bayesian_fx, random_fx = [], []
+
+    for seed in range(5):
+        np.random.seed(seed)
+        res = BayesianOptimization().minimize(Himmelblau(2), num_evaluations=40, batch_size=4)
+        bayesian_fx.append(res.fx)
+
+        np.random.seed(seed)
+        random_fx.append(random_search(Himmelblau(2), 40))
+
+    assert np.median(bayesian_fx) < np.median(random_fx), (bayesian_fx, random_fx)
+
+
+def test_resumed_run_is_identical(tmpdir):
+    checkpoint = os.path.join(str(tmpdir), "checkpoint.npz")
+
+    np.random.seed(3)
+    uninterrupted = BayesianOptimization().minimize(Himmelblau(2), num_evaluations=30, refit_period=3)
+
+    # Interrupted between two fits of the hyperparameters, then resumed
+    np.random.seed(3)
+    BayesianOptimization().minimize(Himmelblau(2), num_evaluations=30, refit_period=3,
+                                    checkpoint=checkpoint, stopping_criteria=MaxEvaluations(17))
+
+    np.random.seed(42)
+    resumed = BayesianOptimization().minimize(Himmelblau(2), num_evaluations=30, refit_period=3,
+                                              checkpoint=checkpoint)
+
+    assert resumed.nfev == uninterrupted.nfev
+    assert np.array_equal(resumed.x, uninterrupted.x)
+    assert resumed.fx == uninterrupted.fx
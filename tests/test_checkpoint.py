@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Tests of the checkpoints: a resumed run should be identical to an
+uninterrupted one.
+"""
+
+import os
+import numpy as np
+import pytest
+
+from ailib.optimize.functions.unconstrained import Rosenbrock, Sphere
+from ailib.optimize.minimizers.cem import CrossEntropyMethod
+from ailib.optimize.minimizers.checkpoint import load_checkpoint, save_checkpoint
+from ailib.optimize.minimizers.de import DifferentialEvolution
+from ailib.optimize.minimizers.pso import PSO
+from ailib.optimize.minimizers.random import Random
+from ailib.optimize.minimizers.sa import SimulatedAnnealing
+from ailib.optimize.minimizers.saes import SAES
+from ailib.optimize.minimizers.stopping import MaxIterations, Stagnation
+
+
+# (optimizer class, minimize positional arguments, minimize keyword arguments)
+RUNS = {
+    'random': (Random, (), {'num_samples': 2000, 'sampler': 'sobol', 'chunk_size': 100, 'top_k': 5}),
+    'random_lhs': (Random, (), {'num_samples': 2000, 'sampler': 'lhs', 'chunk_size': 100}),
+    'pso': (PSO, (), {'num_iterations': 40}),
+    'pso_ring': (PSO, (), {'num_iterations': 40, 'topology': 'ring'}),
+    'de': (DifferentialEvolution, (), {'num_gen': 40}),
+    'de_pbest': (DifferentialEvolution, (), {'num_gen': 40, 'strategy': 'current-to-pbest/1/bin'}),
+    'sa': (SimulatedAnnealing, (), {'num_iterations': 40}),
+    'sa_tempering': (SimulatedAnnealing, (), {'num_iterations': 40, 'parallel_tempering': True}),
+    'cem': (CrossEntropyMethod, (), {'num_iterations': 40, 'full_covariance': True, 'reuse_samples': True}),
+    'saes': (SAES, (np.ones(2), np.ones(2)), {'num_gen': 40}),
+    'saes_surrogate': (SAES, (np.ones(2), np.ones(2)), {'num_gen': 40, 'num_candidates': 24, 'rho': 2}),
+}
+
+
+def test_save_and_load(tmpdir):
+    filename = os.path.join(str(tmpdir), "checkpoint.npz")
+    checkpoint = {'x': np.arange(3.), 'nit': 7}
+
+    save_checkpoint(filename, checkpoint)
+    save_checkpoint(filename, checkpoint)       # replace the previous checkpoint
+
+    loaded = load_checkpoint(filename)
+    assert sorted(loaded) == ['nit', 'x']
+    assert np.array_equal(loaded['x'], checkpoint['x'])
+    assert loaded['nit'] == 7
+    assert os.listdir(str(tmpdir)) == ["checkpoint.npz"]
+
+
+@pytest.mark.parametrize('name', sorted(RUNS))
+def test_resumed_run_is_identical(tmpdir, name):
+    optimizer_class, args, kwargs = RUNS[name]
+    checkpoint = os.path.join(str(tmpdir), "checkpoint.npz")
+
+    np.random.seed(0)
+    uninterrupted = optimizer_class().minimize(Rosenbrock(2), *args, record_history=True, **kwargs)
+
+    np.random.seed(0)
+    interrupted = optimizer_class().minimize(Rosenbrock(2), *args, record_history=True,
+                                             stopping_criteria=MaxIterations(uninterrupted.nit // 2),
+                                             checkpoint=checkpoint, checkpoint_period=3, **kwargs)
+    assert interrupted.nit < uninterrupted.nit
+
+    # The random state is restored from the checkpoint
+    np.random.seed(42)
+    resumed = optimizer_class().minimize(Rosenbrock(2), *args, record_history=True,
+                                         checkpoint=checkpoint, checkpoint_period=3, **kwargs)
+
+    assert resumed.nit == uninterrupted.nit
+    assert resumed.nfev == uninterrupted.nfev
+    assert np.array_equal(resumed.x, uninterrupted.x)
+    assert resumed.fx == uninterrupted.fx
+    assert np.array_equal(resumed.history['fx'], uninterrupted.history['fx'])
+
+
+def test_stopping_criteria_are_resumed(tmpdir):
+    checkpoint = os.path.join(str(tmpdir), "checkpoint.npz")
+
+    np.random.seed(0)
+    uninterrupted = SAES().minimize(Sphere(2), np.ones(2), np.ones(2), num_gen=500,
+                                    stopping_criteria=Stagnation(5, tol=1e-3) | MaxIterations(500))
+    assert uninterrupted.termination_reason == "stagnation"
+
+    # The state of the stagnation criterion is saved in the checkpoint
+    np.random.seed(0)
+    SAES().minimize(Sphere(2), np.ones(2), np.ones(2), num_gen=500,
+                    stopping_criteria=Stagnation(5, tol=1e-3) | MaxIterations(uninterrupted.nit - 2),
+                    checkpoint=checkpoint)
+
+    np.random.seed(42)
+    resumed = SAES().minimize(Sphere(2), np.ones(2), np.ones(2), num_gen=500,
+                              stopping_criteria=Stagnation(5, tol=1e-3) | MaxIterations(500),
+                              checkpoint=checkpoint)
+
+    assert resumed.termination_reason == "stagnation"
+    assert resumed.nit == uninterrupted.nit
+    assert resumed.fx == uninterrupted.fx
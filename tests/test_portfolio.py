@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Tests of the algorithm portfolio.
+"""
+
+import numpy as np
+import pytest
+
+from ailib.optimize.functions.unconstrained import Rosenbrock
+from ailib.optimize.minimizers.gd import GradientDescent
+from ailib.optimize.minimizers.random import Random
+from ailib.optimize.minimizers.saes import SAES
+from ailib.optimize.portfolio import Portfolio
+
+
+class FailingMinimizer(Random):
+
+    optimizer_name = "failing minimizer"
+
+    def minimize(self, objective_function, **kwargs):
+        objective_function(np.zeros(objective_function.ndim))
+        raise ValueError("failing minimizer")
+
+
+def make_portfolio(*minimizers):
+    return Portfolio(list(minimizers) + [(SAES(), {'init_pop_mean': None, 'init_pop_std': None, 'num_gen': 10**6}),
+                                         (Random(), {'num_samples': 10**9, 'chunk_size': 100}),
+                                         (GradientDescent(), {'num_iterations': 10**6, 'learning_rate': 1e-3})])
+
+
+def test_budget_is_shared():
+    np.random.seed(0)
+    res = make_portfolio().minimize(Rosenbrock(4), max_evaluations=5000, num_rounds=5, max_workers=2)
+
+    budget_spent = [arm['budget_spent'] for arm in res.arms]
+    assert sum(budget_spent) == res.nfev + res.ngev + res.nhev
+    assert sum(budget_spent) <= 5000 + 100      # Random evaluates chunks of 100 points
+
+    # The evaluations of the gradient are reported
+    gd_arm = res.arms[2]
+    assert gd_arm['ngev'] > 0
+    assert gd_arm['budget_spent'] == gd_arm['nfev'] + gd_arm['ngev'] + gd_arm['nhev']
+
+    # The result is the best point found by the portfolio
+    assert res.fx == min(arm['fx'] for arm in res.arms)
+    assert res.fx == Rosenbrock(4)(res.x)
+
+
+def test_worst_minimizers_are_killed():
+    np.random.seed(0)
+    res = make_portfolio().minimize(Rosenbrock(4), max_evaluations=5000, num_rounds=5, max_workers=2)
+
+    statuses = [arm['status'] for arm in res.arms]
+    assert statuses.count('killed') == 2, res.arms
+
+    # The best minimizer gets the largest part of the budget
+    best_arm = min(res.arms, key=lambda arm: arm['fx'])
+    assert best_arm['status'] != 'killed'
+    assert best_arm['budget_spent'] == max(arm['budget_spent'] for arm in res.arms)
+
+
+def test_failing_minimizer_error_is_reported():
+    portfolio = make_portfolio((FailingMinimizer(), {}))
+
+    with pytest.raises(RuntimeError) as error_info:
+        portfolio.minimize(Rosenbrock(4), max_evaluations=2000, max_workers=2)
+
+    assert "failing minimizer" in str(error_info.value)
+    assert "ValueError" in str(error_info.value)
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright (c) 2017 Jeremie DECOCK (http://www.jdhp.org)
+
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+# THE SOFTWARE.
+
+"""
+Compare the revised simplex method with `scipy.optimize.linprog`.
+
+Random bounded, free and equality-constrained linear programs are solved
+by both implementations, and a sequence of cuts is added to a warm-started
+`LinearProgram` (which exercises the dual simplex restarts and the bound
+flips of boxed variables).
+"""
+
+import numpy as np
+import pytest
+
+from ailib.optimize.minimizers.simplex import LinearProgram, linprog
+
+optimize = pytest.importorskip("scipy.optimize")
+
+RTOL = 1e-6
+
+
+def reference_linprog(c, A_ub=None, b_ub=None, A_eq=None, b_eq=None, bounds=None):
+    """Solve the linear program with scipy (HiGHS when available)."""
+    if bounds is None:
+        bounds = (0, None)
+    try:
+        return optimize.linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method='highs')
+    except ValueError:
+        # scipy < 1.6 (no HiGHS solver)
+        return optimize.linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds)
+
+
+def check_same_solution(res, ref, c, A_ub=None, b_ub=None, A_eq=None, b_eq=None):
+    # HiGHS may report an unbounded problem as infeasible (its presolve
+    # doesn't tell them apart)
+    if (ref.status, res.status) == (2, 3):
+        return
+
+    assert res.status == ref.status, (res.status, ref.status)
+
+    if res.status == 0:
+        assert abs(res.fx - ref.fun) <= RTOL * max(1., abs(ref.fun)), (res.fx, ref.fun)
+        assert abs(np.dot(c, res.x) - res.fx) <= RTOL * max(1., abs(res.fx))
+        if A_ub is not None:
+            assert np.all(np.dot(A_ub, res.x) <= b_ub + 1e-7)
+        if A_eq is not None:
+            assert np.allclose(np.dot(A_eq, res.x), b_eq, atol=1e-7)
+
+
+@pytest.mark.parametrize("bounds_kind", ["nonnegative", "boxed", "mixed", "lower"])
+def test_random_linear_programs(bounds_kind):
+    rng = np.random.RandomState(0)
+
+    for trial_index in range(150):
+        n = rng.randint(1, 12)
+        m_ub = rng.randint(0, 12)
+        m_eq = rng.randint(0, 4) if n > 1 else 0
+
+        c = rng.randn(n)
+        A_ub = rng.randn(m_ub, n) if m_ub > 0 else None
+        b_ub = rng.randn(m_ub) + trial_index % 2 if m_ub > 0 else None
+        A_eq = rng.randn(m_eq, n) if m_eq > 0 else None
+        b_eq = rng.randn(m_eq) if m_eq > 0 else None
+
+        if bounds_kind == "nonnegative":
+            bounds = None
+        elif bounds_kind == "boxed":
+            bounds = (-5, 5)
+        elif bounds_kind == "mixed":
+            # Free, lower bounded, upper bounded and boxed variables
+            bounds = [(rng.choice([None, -2]), rng.choice([None, 3])) for _ in range(n)]
+        else:
+            bounds = [(-1, None)] * n
+
+        res = linprog(c, A_ub, b_ub, A_eq, b_eq, bounds)
+        ref = reference_linprog(c, A_ub, b_ub, A_eq, b_eq, bounds)
+
+        check_same_solution(res, ref, c, A_ub, b_ub, A_eq, b_eq)
+
+
+@pytest.mark.parametrize("refactor_period", [5, 50])
+def test_larger_degenerate_linear_programs(refactor_period):
+    rng = np.random.RandomState(1)
+
+    for trial_index in range(10):
+        n = rng.randint(20, 60)
+        m = rng.randint(20, 150)
+
+        A = rng.randn(m, n)
+        if trial_index % 3 == 0:
+            A = np.round(A)     # Degenerate vertices
+        b = np.abs(rng.randn(m)) if trial_index % 2 else np.round(rng.randn(m))
+        c = rng.randn(n)
+
+        res = LinearProgram(c, A, b, bounds=(-3, 4), refactor_period=refactor_period).solve()
+        ref = reference_linprog(c, A, b, bounds=(-3, 4))
+
+        check_same_solution(res, ref, c, A, b)
+
+
+def test_warm_started_cuts():
+    rng = np.random.RandomState(2)
+
+    # Kelley's cutting-plane method on a convex quadratic over a box:
+    # min t s.t. f(x_k) + g_k (x - x_k) <= t for all the cuts k
+    n = 10
+    c = np.append(np.zeros(n), 1.)
+    bounds = [(-2, 3)] * n + [(None, None)]
+
+    def f(x):
+        return np.sum((x - 0.5)**2)
+
+    lp = LinearProgram(c, bounds=bounds)
+    A, b = [], []
+
+    x = rng.uniform(-2, 3, n)
+    lower_bound = -np.inf
+
+    for cut_index in range(100):
+        g = 2. * (x - 0.5)
+        A.append(np.append(g, -1.))
+        b.append(np.dot(g, x) - f(x))
+
+        lp.add_constraints([A[-1]], [b[-1]])
+        res = lp.solve()
+        ref = reference_linprog(c, np.array(A), np.array(b), bounds=bounds)
+
+        check_same_solution(res, ref, c, np.array(A), np.array(b))
+        assert res.status == 0
+
+        # Adding cuts can only raise the lower bound of the minimum of f
+        assert res.fx >= lower_bound - 1e-9
+        lower_bound = res.fx
+
+        x = res.x[:n]
+
+    assert lower_bound <= 1e-9